@@ -9,6 +9,9 @@ from app.models.employer_profile import EmployerProfile
 from app.models.job_seeker_profile import JobSeekerProfile
 from app.models.job import Job
 from app.models.application import Application
+from app.models.employer_stats import EmployerStats
+from app.models.outbox import OutboxEvent
+from app.models.notification_tombstone import NotificationTombstone
 import uuid
 
 config = context.config
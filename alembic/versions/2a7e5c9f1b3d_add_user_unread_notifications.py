@@ -0,0 +1,41 @@
+"""add unread_notifications counter to users
+
+Revision ID: 2a7e5c9f1b3d
+Revises: 8f3b2a6d4c1e
+Create Date: 2026-10-17 14:02:37.105284
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2a7e5c9f1b3d'
+down_revision: Union[str, Sequence[str], None] = '8f3b2a6d4c1e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('unread_notifications', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill from the notifications table
+    op.execute("""
+        UPDATE users u
+        SET unread_notifications = c.unread
+        FROM (
+            SELECT user_id, count(*) AS unread
+            FROM notifications
+            WHERE is_read = false
+            GROUP BY user_id
+        ) c
+        WHERE c.user_id = u.id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'unread_notifications')
@@ -0,0 +1,28 @@
+"""add token_version to users for JWT revocation
+
+Revision ID: 3e8a1f5c7b2d
+Revises: 9b4d6e2f8c1a
+Create Date: 2026-10-17 11:20:54.640932
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e8a1f5c7b2d'
+down_revision: Union[str, Sequence[str], None] = '9b4d6e2f8c1a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'token_version')
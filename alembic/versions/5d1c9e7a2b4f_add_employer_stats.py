@@ -0,0 +1,69 @@
+"""add employer_stats counters table
+
+Revision ID: 5d1c9e7a2b4f
+Revises: 3e8a1f5c7b2d
+Create Date: 2026-10-17 12:05:18.377215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d1c9e7a2b4f'
+down_revision: Union[str, Sequence[str], None] = '3e8a1f5c7b2d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COUNTERS = [
+    'total_jobs',
+    'active_jobs',
+    'total_applications',
+    'pending_applications',
+    'reviewed_applications',
+    'accepted_applications',
+    'rejected_applications',
+    'withdrawn_applications',
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'employer_stats',
+        sa.Column('employer_id', sa.Integer(), nullable=False),
+        *[sa.Column(name, sa.Integer(), server_default='0', nullable=False) for name in COUNTERS],
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['employer_id'], ['employer_profiles.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('employer_id')
+    )
+
+    # Backfill exact counters for every existing employer
+    op.execute("""
+        INSERT INTO employer_stats (employer_id, total_jobs, active_jobs, total_applications,
+            pending_applications, reviewed_applications, accepted_applications,
+            rejected_applications, withdrawn_applications, updated_at)
+        SELECT
+            ep.id,
+            count(DISTINCT j.id),
+            count(DISTINCT j.id) FILTER (WHERE j.is_active),
+            count(a.id),
+            count(a.id) FILTER (WHERE a.status = 'pending'),
+            count(a.id) FILTER (WHERE a.status = 'reviewed'),
+            count(a.id) FILTER (WHERE a.status = 'accepted'),
+            count(a.id) FILTER (WHERE a.status = 'rejected'),
+            count(a.id) FILTER (WHERE a.status = 'withdrawn'),
+            now()
+        FROM employer_profiles ep
+        LEFT JOIN jobs j ON j.employer_id = ep.id
+        LEFT JOIN applications a ON a.job_id = j.id
+        GROUP BY ep.id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('employer_stats')
@@ -0,0 +1,48 @@
+"""add weighted full-text search vector to jobs
+
+Revision ID: 7c2e4b9d1a3f
+Revises: 319a59817f19
+Create Date: 2026-10-17 09:12:41.503118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2e4b9d1a3f'
+down_revision: Union[str, Sequence[str], None] = '319a59817f19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(requirements, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The old expression index from database_indexes.py may exist on some databases
+    op.execute("DROP INDEX IF EXISTS idx_jobs_fulltext")
+    op.add_column(
+        'jobs',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR_SQL, persisted=True),
+            nullable=True
+        )
+    )
+    op.create_index('idx_jobs_fulltext', 'jobs', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_jobs_fulltext', table_name='jobs', postgresql_using='gin')
+    op.drop_column('jobs', 'search_vector')
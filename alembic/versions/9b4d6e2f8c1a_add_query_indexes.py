@@ -0,0 +1,62 @@
+"""add composite and partial indexes for list and lookup queries
+
+Revision ID: 9b4d6e2f8c1a
+Revises: 7c2e4b9d1a3f
+Create Date: 2026-10-17 10:03:27.118460
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b4d6e2f8c1a'
+down_revision: Union[str, Sequence[str], None] = '7c2e4b9d1a3f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, columns, partial WHERE clause) - mirrors the models' __table_args__
+INDEXES = [
+    ('idx_jobs_active_created', 'jobs', ['created_at DESC', 'id DESC'], 'is_active = true'),
+    ('idx_jobs_employer_created', 'jobs', ['employer_id', 'created_at DESC', 'id DESC'], None),
+    ('idx_applications_user_applied', 'applications', ['user_id', 'applied_at DESC', 'id DESC'], None),
+    ('idx_applications_job_status', 'applications', ['job_id', 'status'], None),
+    ('idx_applications_job_applied', 'applications', ['job_id', 'applied_at DESC'], None),
+    ('idx_notifications_user_created', 'notifications', ['user_id', 'created_at DESC', 'id DESC'], None),
+    ('idx_notifications_user_unread', 'notifications', ['user_id', 'is_read'], 'is_read = false'),
+    ('idx_bookmarks_user_created', 'bookmarks', ['user_id', 'created_at DESC', 'id DESC'], None),
+    ('idx_application_documents_application', 'application_documents', ['application_id', 'uploaded_at DESC'], None),
+    ('ix_employer_profiles_user_id', 'employer_profiles', ['user_id'], None),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction, and doesn't
+    # block writes while the index builds
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                [sa.text(column) for column in columns],
+                unique=False,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
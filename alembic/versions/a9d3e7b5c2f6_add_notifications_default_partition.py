@@ -0,0 +1,33 @@
+"""add a DEFAULT partition to notifications
+
+Revision ID: a9d3e7b5c2f6
+Revises: f2c6a8e4b1d9
+Create Date: 2026-10-17 18:40:21.377052
+
+Without it, an insert whose created_at has no monthly partition yet (the
+maintenance task fell behind, or a skewed clock) fails. Rows that land here
+are reported by maintain_notification_partitions_task, which moves them
+into their month's partition once it creates it.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9d3e7b5c2f6'
+down_revision: Union[str, Sequence[str], None] = 'f2c6a8e4b1d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE TABLE notifications_default PARTITION OF notifications DEFAULT")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Rows still in it have no other partition to go to and are dropped with it
+    op.execute("DROP TABLE notifications_default")
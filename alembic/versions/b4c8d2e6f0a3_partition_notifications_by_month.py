@@ -0,0 +1,132 @@
+"""partition notifications by month on created_at
+
+Revision ID: b4c8d2e6f0a3
+Revises: 2a7e5c9f1b3d
+Create Date: 2026-10-17 15:11:09.442871
+
+Rebuilds notifications as a RANGE-partitioned table (one partition per
+month) and copies the existing rows across. The copy holds an exclusive
+lock on notifications, so run it in a maintenance window on large tables.
+Partitions ahead of time and retention are managed afterwards by
+app.tasks.maintenance_tasks.maintain_notification_partitions_task.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4c8d2e6f0a3'
+down_revision: Union[str, Sequence[str], None] = '2a7e5c9f1b3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PARTITIONS_AHEAD = 3
+
+COLUMNS = "id, user_id, title, message, notification_type, related_id, is_read, created_at"
+
+
+def create_indexes(table: str) -> None:
+    """Indexes on the (partitioned) parent; Postgres cascades them to every partition"""
+    op.execute(f"CREATE INDEX ix_notifications_id ON {table} (id)")
+    op.execute(f"CREATE INDEX idx_notifications_user_created ON {table} (user_id, created_at DESC, id DESC)")
+    op.execute(f"CREATE INDEX idx_notifications_user_unread ON {table} (user_id, is_read) WHERE is_read = false")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("LOCK TABLE notifications IN ACCESS EXCLUSIVE MODE")
+
+    op.execute("""
+        CREATE TABLE notifications_partitioned (
+            id integer NOT NULL,
+            user_id integer NOT NULL REFERENCES users (id),
+            title varchar NOT NULL,
+            message text NOT NULL,
+            notification_type varchar,
+            related_id integer,
+            is_read boolean DEFAULT false,
+            created_at timestamp without time zone NOT NULL DEFAULT (now() AT TIME ZONE 'utc'),
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+
+    # One partition per month from the oldest row to a few months ahead
+    op.execute(f"""
+        DO $$
+        DECLARE
+            month_start timestamp := date_trunc('month', COALESCE((SELECT min(created_at) FROM notifications), now()));
+            last_month timestamp := date_trunc('month', now()) + interval '{PARTITIONS_AHEAD} months';
+        BEGIN
+            WHILE month_start <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF notifications_partitioned FOR VALUES FROM (%L) TO (%L)',
+                    'notifications_p' || to_char(month_start, 'YYYY_MM'),
+                    month_start,
+                    month_start + interval '1 month'
+                );
+                month_start := month_start + interval '1 month';
+            END LOOP;
+        END $$
+    """)
+
+    op.execute(f"""
+        INSERT INTO notifications_partitioned ({COLUMNS})
+        SELECT id, user_id, title, message, notification_type, related_id, is_read,
+               COALESCE(created_at, now() AT TIME ZONE 'utc')
+        FROM notifications
+    """)
+
+    # Keep the id sequence: detach it from the old table before dropping it
+    op.execute("""
+        DO $$
+        DECLARE
+            seq text := pg_get_serial_sequence('notifications', 'id');
+        BEGIN
+            EXECUTE format('ALTER SEQUENCE %s OWNED BY NONE', seq);
+            DROP TABLE notifications;
+            ALTER TABLE notifications_partitioned RENAME TO notifications;
+            ALTER TABLE notifications RENAME CONSTRAINT notifications_partitioned_pkey TO notifications_pkey;
+            EXECUTE format('ALTER TABLE notifications ALTER COLUMN id SET DEFAULT nextval(%L)', seq);
+            EXECUTE format('ALTER SEQUENCE %s OWNED BY notifications.id', seq);
+        END $$
+    """)
+
+    create_indexes('notifications')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("LOCK TABLE notifications IN ACCESS EXCLUSIVE MODE")
+
+    op.execute("""
+        CREATE TABLE notifications_unpartitioned (
+            id integer NOT NULL PRIMARY KEY,
+            user_id integer NOT NULL REFERENCES users (id),
+            title varchar NOT NULL,
+            message text NOT NULL,
+            notification_type varchar,
+            related_id integer,
+            is_read boolean,
+            created_at timestamp without time zone
+        )
+    """)
+    op.execute(f"INSERT INTO notifications_unpartitioned ({COLUMNS}) SELECT {COLUMNS} FROM notifications")
+
+    op.execute("""
+        DO $$
+        DECLARE
+            seq text := pg_get_serial_sequence('notifications', 'id');
+        BEGIN
+            EXECUTE format('ALTER SEQUENCE %s OWNED BY NONE', seq);
+            DROP TABLE notifications;
+            ALTER TABLE notifications_unpartitioned RENAME TO notifications;
+            ALTER TABLE notifications RENAME CONSTRAINT notifications_unpartitioned_pkey TO notifications_pkey;
+            EXECUTE format('ALTER TABLE notifications ALTER COLUMN id SET DEFAULT nextval(%L)', seq);
+            EXECUTE format('ALTER SEQUENCE %s OWNED BY notifications.id', seq);
+        END $$
+    """)
+
+    create_indexes('notifications')
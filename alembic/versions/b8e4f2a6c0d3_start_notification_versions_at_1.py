@@ -0,0 +1,44 @@
+"""start notification versions at 1
+
+Revision ID: b8e4f2a6c0d3
+Revises: a9d3e7b5c2f6
+Create Date: 2026-10-17 21:05:48.602114
+
+Users and notifications that predate delta sync were left at version 0.
+since=0 means "the client has nothing", so a migrated user at version 0
+either looked up to date with an empty list or never left resync. Moving
+everything to at least 1 makes since=0 always answer resync_required, and
+the reload that follows brings the existing notifications down.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e4f2a6c0d3'
+down_revision: Union[str, Sequence[str], None] = 'a9d3e7b5c2f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("UPDATE notifications SET version = 1 WHERE version = 0")
+    # unread_checked_version moves with it: nothing changed, so no reconcile is due
+    op.execute("""
+        UPDATE users
+        SET notification_version = 1,
+            unread_checked_version = GREATEST(unread_checked_version, 1)
+        WHERE notification_version = 0
+    """)
+    op.alter_column('users', 'notification_version', server_default='1')
+    op.alter_column('users', 'unread_checked_version', server_default='1')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Versions stay where they are: 1 is as valid a starting point as 0
+    op.alter_column('users', 'unread_checked_version', server_default='0')
+    op.alter_column('users', 'notification_version', server_default='0')
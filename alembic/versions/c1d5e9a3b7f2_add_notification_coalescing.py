@@ -0,0 +1,42 @@
+"""add coalescing columns to notifications
+
+Revision ID: c1d5e9a3b7f2
+Revises: b4c8d2e6f0a3
+Create Date: 2026-10-17 15:48:52.903117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c1d5e9a3b7f2'
+down_revision: Union[str, Sequence[str], None] = 'b4c8d2e6f0a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('notifications', sa.Column('group_key', sa.String(), nullable=True))
+    op.add_column('notifications', sa.Column('event_count', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('notifications', sa.Column('updated_at', sa.DateTime(), nullable=True))
+    # Partitioned parents can't build indexes CONCURRENTLY; every existing
+    # row has a NULL group_key, so the partial index builds almost instantly
+    op.create_index(
+        'idx_notifications_user_group',
+        'notifications',
+        ['user_id', 'group_key', sa.text('created_at DESC')],
+        unique=False,
+        postgresql_where=sa.text('group_key IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_notifications_user_group', table_name='notifications')
+    op.drop_column('notifications', 'updated_at')
+    op.drop_column('notifications', 'event_count')
+    op.drop_column('notifications', 'group_key')
@@ -0,0 +1,54 @@
+"""add notification versions and tombstones for delta sync
+
+Revision ID: d7a3f1c5e9b2
+Revises: c1d5e9a3b7f2
+Create Date: 2026-10-17 16:24:37.118406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7a3f1c5e9b2'
+down_revision: Union[str, Sequence[str], None] = 'c1d5e9a3b7f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing rows start at version 0; b8e4f2a6c0d3 moves them to 1
+    op.add_column('users', sa.Column('notification_version', sa.BigInteger(), server_default='0', nullable=False))
+    op.add_column('users', sa.Column('notification_sync_floor', sa.BigInteger(), server_default='0', nullable=False))
+    op.add_column('notifications', sa.Column('version', sa.BigInteger(), server_default='0', nullable=False))
+    op.create_index('idx_notifications_user_version', 'notifications', ['user_id', 'version'], unique=False)
+
+    op.create_table(
+        'notification_tombstones',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('notification_id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'idx_notification_tombstones_user_version',
+        'notification_tombstones',
+        ['user_id', 'version'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_notification_tombstones_user_version', table_name='notification_tombstones')
+    op.drop_table('notification_tombstones')
+    op.drop_index('idx_notifications_user_version', table_name='notifications')
+    op.drop_column('notifications', 'version')
+    op.drop_column('users', 'notification_sync_floor')
+    op.drop_column('users', 'notification_version')
@@ -0,0 +1,51 @@
+"""make keyset sort keys not null
+
+Revision ID: e3b9c7d1f5a4
+Revises: d7a3f1c5e9b2
+Create Date: 2026-10-17 17:05:12.604219
+
+Keyset pagination orders by (created_at, id) / (applied_at, id) DESC, where
+NULLs sort first and never compare below a cursor. Rows that somehow have
+no timestamp are backfilled with the epoch so they page last.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b9c7d1f5a4'
+down_revision: Union[str, Sequence[str], None] = 'd7a3f1c5e9b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SORT_KEYS = [
+    ('jobs', 'created_at'),
+    ('bookmarks', 'created_at'),
+    ('applications', 'applied_at'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, column in SORT_KEYS:
+        op.execute(f"UPDATE {table} SET {column} = 'epoch' WHERE {column} IS NULL")
+        op.alter_column(
+            table, column,
+            existing_type=sa.DateTime(),
+            nullable=False,
+            server_default=sa.text("(now() AT TIME ZONE 'utc')"),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, column in SORT_KEYS:
+        op.alter_column(
+            table, column,
+            existing_type=sa.DateTime(),
+            nullable=True,
+            server_default=None,
+        )
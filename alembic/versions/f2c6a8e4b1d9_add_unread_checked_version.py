@@ -0,0 +1,31 @@
+"""add users.unread_checked_version for incremental unread reconciliation
+
+Revision ID: f2c6a8e4b1d9
+Revises: e3b9c7d1f5a4
+Create Date: 2026-10-17 18:12:44.905317
+
+The reconciler only recounts users whose notification_version moved past
+this column, so each run touches the users who changed since the last one.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c6a8e4b1d9'
+down_revision: Union[str, Sequence[str], None] = 'e3b9c7d1f5a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 0 everywhere: the first run checks every user with a notification change
+    op.add_column('users', sa.Column('unread_checked_version', sa.BigInteger(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'unread_checked_version')
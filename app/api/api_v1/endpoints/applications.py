@@ -1,10 +1,11 @@
 # app/api/api_v1/endpoints/applications.py
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Response, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from app.db.database import get_db
-from app.core.deps import get_current_user
+from app.core.deps import check_token_state, get_current_user, get_token_payload
+from app.core.pagination import page_cursor, set_next_cursor
 from app.models.user import User
 from app.schemas.application import (
     ApplicationCreate,
@@ -23,118 +24,60 @@ router = APIRouter()
 @router.post("/", response_model=ApplicationWithDocuments, status_code=status.HTTP_201_CREATED)
 async def apply_to_job(
     application_data: ApplicationCreate,
-    current_user: User = Depends(get_current_user),
+    token: Tuple[dict, int] = Depends(get_token_payload),
     db: AsyncSession = Depends(get_db)
 ):
     """Apply to a job"""
-    # Check if job exists and is active
-    job = await job_service.get_job_by_id(db, application_data.job_id)
-    if not job:
+    payload, user_id = token
+    # Applicant auth state, job, employer and duplicate check in one query
+    context = await application_service.get_apply_context(
+        db, user_id, application_data.job_id
+    )
+    if not context:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found"
+        )
+    check_token_state(payload, context.applicant_token_version or 0, bool(context.applicant_is_active))
+    
+    if context.Job is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Job not found"
         )
     
+    job = context.Job
     if not job.is_active:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="This job is no longer accepting applications"
         )
     
-    # Check if user has already applied
-    existing = await application_service.get_application_by_user_and_job(
-        db, current_user.id, application_data.job_id
-    )
-    if existing:
+    if context.existing_application_id:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="You have already applied to this job"
         )
     
-    # Create application
-    application = await application_service.create_application(
-        db=db,
-        user_id=current_user.id,
-        application_data=application_data
-    )
-    
-    # Create notification for job seeker
-    await notification_service.create_application_notification(
+    # Application, notifications, emails and employer counters in one statement
+    application = await application_service.submit_application(
         db=db,
-        user_id=current_user.id,
-        job_title=job.title,
-        application_id=application.id
-    )
-    
-    # Send email confirmation to job seeker (via Celery)
-    from app.services import email_service
-    from app.services.job_seeker_service import get_job_seeker_profile_by_user_id
-    from app.services.employer_service import get_employer_profile_by_id
-    
-    job_seeker_profile = await get_job_seeker_profile_by_user_id(db, current_user.id)
-    applicant_name = job_seeker_profile.full_name if job_seeker_profile else current_user.email
-    
-    # Get company name from employer profile
-    employer_profile = await get_employer_profile_by_id(db, job.employer_id)
-    company_name = employer_profile.company_name if employer_profile else "Company"
-    
-    # Send confirmation email to applicant
-    email_service.send_application_confirmation_email(
-        email=current_user.email,
-        applicant_name=applicant_name,
-        job_title=job.title,
-        company_name=company_name,
-        application_id=application.id
+        user_id=user_id,
+        application_data=application_data,
+        context=context
     )
     
-    # Notify employer about new application
-    from app.services.notification_helpers import notify_employer_new_application
-    from app.services.job_seeker_service import get_job_seeker_profile_by_user_id
-    
-    # Get applicant name
-    job_seeker_profile = await get_job_seeker_profile_by_user_id(db, current_user.id)
-    applicant_name = job_seeker_profile.full_name if job_seeker_profile else current_user.email
-    
-    # Get employer user_id from job
-    from app.services.employer_service import get_employer_profile_by_id
-    employer_profile = await get_employer_profile_by_id(db, job.employer_id)
-    if employer_profile:
-        # Send WebSocket notification
-        await notify_employer_new_application(
-            db=db,
-            employer_user_id=employer_profile.user_id,
-            job_title=job.title,
-            applicant_name=applicant_name,
-            application_id=application.id
-        )
-        
-        # Send email notification to employer (via Celery)
-        from app.services import email_service
-        from app.models.user import User
-        from sqlalchemy import select
-        
-        # Get employer user email
-        employer_user_stmt = select(User).where(User.id == employer_profile.user_id)
-        employer_user_result = await db.execute(employer_user_stmt)
-        employer_user = employer_user_result.scalar_one_or_none()
-        
-        if employer_user:
-            email_service.send_new_application_email(
-                email=employer_user.email,
-                employer_name=employer_profile.company_name,
-                applicant_name=applicant_name,
-                job_title=job.title,
-                application_id=application.id
-            )
-    
     return application
 
 
 @router.get("/", response_model=List[ApplicationWithJob])
 async def get_my_applications(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     status: Optional[str] = Query(None),
+    cursor: Optional[str] = Depends(page_cursor),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
@@ -144,8 +87,10 @@ async def get_my_applications(
         user_id=current_user.id,
         skip=skip,
         limit=limit,
-        status=status
+        status=status,
+        cursor=cursor
     )
+    set_next_cursor(request, response, applications, limit, sort_attr="applied_at")
     return applications
 
 
@@ -254,8 +199,6 @@ async def withdraw_application(
             detail="Application is already withdrawn"
         )
     
-    withdrawn_application = await application_service.withdraw_application(db, application)
-    
     # Notify employer about withdrawal
     from app.services.notification_helpers import notify_employer_application_withdrawn
     from app.services.job_seeker_service import get_job_seeker_profile_by_user_id
@@ -265,7 +208,7 @@ async def withdraw_application(
     job_seeker_profile = await get_job_seeker_profile_by_user_id(db, current_user.id)
     applicant_name = job_seeker_profile.full_name if job_seeker_profile else current_user.email
     
-    # Get employer
+    # Get employer; the notification is committed together with the withdrawal
     job = await job_service.get_job_by_id(db, application.job_id)
     if job:
         employer_profile = await get_employer_profile_by_id(db, job.employer_id)
@@ -278,6 +221,8 @@ async def withdraw_application(
                 application_id=application.id
             )
     
+    withdrawn_application = await application_service.withdraw_application(db, application)
+    
     return withdrawn_application
 
 
@@ -5,7 +5,9 @@ from fastapi.security import OAuth2PasswordRequestForm
 
 from app.schemas.auth import UserCreate, UserRead, Token
 from app.db.database import get_db
-from app.services.auth_service import create_user, authenticate_user, create_token_for_user, get_user_by_email
+from app.services.auth_service import create_user, authenticate_user, create_token_for_user, get_user_by_email, revoke_user_tokens
+from app.core.deps import get_current_user
+from app.models.user import User
 from app.core.rate_limiter import limiter
 from app.core.validators import validate_email_format, validate_password_strength
 
@@ -59,7 +61,7 @@ async def login(
             detail="Incorrect email or password"
         )
     
-    token_data = await create_token_for_user(user)
+    token_data = await create_token_for_user(db, user)
     return {
         "access_token": token_data["access_token"],
         "refresh_token": token_data["refresh_token"],
@@ -87,12 +89,29 @@ async def refresh_token(
     if not payload:
         raise HTTPException(status_code=401, detail="Invalid or expired refresh token")
 
-    from app.services.auth_service import get_user_by_email
-    user = await get_user_by_email(db, payload["sub"])
+    from app.services.auth_service import get_user_by_id, get_profile_id_for_user, build_access_token
+    user = await get_user_by_id(db, int(payload["sub"]))
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
+    # Refresh tokens issued before a revocation (or without "tv", which can't be revoked) are rejected too
+    if payload.get("tv") is None or payload["tv"] != (user.token_version or 0):
+        raise HTTPException(status_code=401, detail="Refresh token has been revoked")
+
     # issue new access token
-    from app.core.security import create_access_token
-    access_token = create_access_token(str(user.id))
-    return {"access_token": access_token, "refresh_token": token, "token_type": "bearer"}
\ No newline at end of file
+    profile_id = await get_profile_id_for_user(db, user)
+    access_token = build_access_token(user, profile_id)
+    return {"access_token": access_token, "refresh_token": token, "token_type": "bearer"}
+
+
+@router.post("/logout-all", status_code=status.HTTP_204_NO_CONTENT)
+async def logout_all_sessions(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Revoke every access and refresh token issued to the current user.
+    Other workers stop accepting old tokens within AUTH_USER_CACHE_TTL seconds.
+    """
+    await revoke_user_tokens(db, current_user.id)
+    return None
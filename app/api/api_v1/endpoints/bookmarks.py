@@ -1,10 +1,11 @@
 # app/api/api_v1/endpoints/bookmarks.py
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional
 
 from app.db.database import get_db
 from app.core.deps import get_current_user
+from app.core.pagination import page_cursor, set_next_cursor
 from app.models.user import User
 from app.schemas.bookmark import BookmarkCreate, BookmarkRead, BookmarkWithJob
 from app.services import bookmark_service, job_service
@@ -48,8 +49,11 @@ async def create_bookmark(
 
 @router.get("/", response_model=List[BookmarkWithJob])
 async def get_my_bookmarks(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Depends(page_cursor),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
@@ -58,8 +62,10 @@ async def get_my_bookmarks(
         db=db,
         user_id=current_user.id,
         skip=skip,
-        limit=limit
+        limit=limit,
+        cursor=cursor
     )
+    set_next_cursor(request, response, bookmarks, limit)
     return bookmarks
 
 
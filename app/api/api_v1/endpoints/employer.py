@@ -1,10 +1,12 @@
 # app/api/api_v1/endpoints/employer.py
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional
 
 from app.db.database import get_db
-from app.core.employer_deps import get_current_employer, get_current_employer_profile
+from app.db.replica import get_read_db
+from app.core.employer_deps import get_current_employer, get_current_employer_profile, get_current_employer_profile_id
+from app.core.pagination import page_cursor, set_next_cursor
 from app.models.user import User
 from app.models.employer_profile import EmployerProfile
 from app.schemas.employer_profile import (
@@ -55,7 +57,7 @@ async def get_my_employer_profile(
 @router.get("/profile/{profile_id}", response_model=EmployerProfileRead)
 async def get_employer_profile_by_id(
     profile_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get employer profile by profile ID"""
     profile = await employer_service.get_employer_profile_by_id(db, profile_id)
@@ -84,7 +86,7 @@ async def update_my_employer_profile(
 @router.get("/profile/stats", response_model=EmployerProfileWithStats)
 async def get_employer_profile_with_stats(
     profile: EmployerProfile = Depends(get_current_employer_profile),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get employer profile with statistics"""
     stats = await employer_service.get_employer_statistics(db, profile.id)
@@ -103,30 +105,35 @@ async def get_employer_profile_with_stats(
 
 @router.get("/dashboard/statistics")
 async def get_dashboard_statistics(
-    profile: EmployerProfile = Depends(get_current_employer_profile),
-    db: AsyncSession = Depends(get_db)
+    employer_id: int = Depends(get_current_employer_profile_id),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get statistics for employer dashboard"""
-    stats = await employer_service.get_employer_statistics(db, profile.id)
+    stats = await employer_service.get_employer_statistics(db, employer_id)
     return stats
 
 
 @router.get("/jobs")
 async def get_my_jobs(
+    request: Request,
+    response: Response,
     active_only: bool = Query(False, description="Filter for active jobs only"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
-    profile: EmployerProfile = Depends(get_current_employer_profile),
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = Depends(page_cursor),
+    employer_id: int = Depends(get_current_employer_profile_id),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all jobs posted by current employer"""
     jobs = await employer_service.get_employer_jobs(
         db=db,
-        employer_id=profile.id,
+        employer_id=employer_id,
         skip=skip,
         limit=limit,
-        active_only=active_only
-    )    
+        active_only=active_only,
+        cursor=cursor
+    )
+    set_next_cursor(request, response, jobs, limit)
     return jobs
 
 
@@ -135,14 +142,14 @@ async def get_job_applicants(
     job_id: int,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
-    profile: EmployerProfile = Depends(get_current_employer_profile),
-    db: AsyncSession = Depends(get_db)
+    employer_id: int = Depends(get_current_employer_profile_id),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all applicants for a specific job"""
     applications = await employer_service.get_job_applicants(
         db=db,
         job_id=job_id,
-        employer_id=profile.id,
+        employer_id=employer_id,
         skip=skip,
         limit=limit
     )
@@ -215,14 +222,6 @@ async def update_application_status(
             detail="You don't have permission to update this application"
         )
     
-    # Update status
-    from app.schemas.application import ApplicationUpdate
-    updated_application = await application_service.update_application(
-        db=db,
-        application=application,
-        update_data=ApplicationUpdate(status=status)
-    )
-    
     # Notify applicant about status change
     await notify_applicant_status_change(
         db=db,
@@ -232,7 +231,7 @@ async def update_application_status(
         application_id=application.id
     )
     
-    # Send email notification (via Celery)
+    # Send email notification (via Celery, through the outbox)
     from app.services import email_service
     from app.models.user import User
     from app.services.job_seeker_service import get_job_seeker_profile_by_user_id
@@ -248,6 +247,7 @@ async def update_application_status(
         applicant_name = job_seeker_profile.full_name if job_seeker_profile else applicant.email
         
         email_service.send_application_status_email(
+            db,
             email=applicant.email,
             applicant_name=applicant_name,
             job_title=job.title,
@@ -256,6 +256,14 @@ async def update_application_status(
             application_id=application.id
         )
     
+    # Update status; commits the notification and email with it
+    from app.schemas.application import ApplicationUpdate
+    updated_application = await application_service.update_application(
+        db=db,
+        application=application,
+        update_data=ApplicationUpdate(status=status)
+    )
+    
     return {
         "message": "Application status updated successfully",
         "application_id": application_id,
@@ -1,14 +1,14 @@
 # app/api/api_v1/endpoints/jobs.py
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
 from app.db.database import get_db
-from app.core.employer_deps import get_current_employer_profile
+from app.core.employer_deps import get_current_employer_profile_id
 from app.core.deps import get_current_user
-from app.models.employer_profile import EmployerProfile
+from app.core.pagination import NEXT_CURSOR_HEADER, page_cursor, request_scope
 from app.models.user import User
-from app.schemas.job import JobCreate, JobRead, JobUpdate
+from app.schemas.job import JobCreate, JobRead, JobUpdate, JobFacets
 from app.services import job_service
 
 router = APIRouter()
@@ -17,13 +17,13 @@ router = APIRouter()
 @router.post("/", response_model=JobRead, status_code=status.HTTP_201_CREATED)
 async def create_job(
     job_data: JobCreate,
-    profile: EmployerProfile = Depends(get_current_employer_profile),
+    employer_id: int = Depends(get_current_employer_profile_id),
     db: AsyncSession = Depends(get_db)
 ):
     """Create a new job posting (Employer only)"""
     job = await job_service.create_job(
         db=db,
-        employer_id=profile.id,
+        employer_id=employer_id,
         job_data=job_data
     )
     return job
@@ -31,24 +31,33 @@ async def create_job(
 
 @router.get("/", response_model=List[JobRead])
 async def list_jobs(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Depends(page_cursor),
     location: Optional[str] = Query(None),
     job_type: Optional[str] = Query(None),
     min_salary: Optional[float] = Query(None),
-    search: Optional[str] = Query(None),
+    search: Optional[str] = Query(None, description="Web-search syntax, e.g. python -java \"remote\""),
+    sort: str = Query("newest", pattern="^(newest|relevance)$"),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get all active jobs with optional filters (Public endpoint)"""
-    jobs = await job_service.get_jobs(
+    """Get all active jobs with optional filters (Public endpoint, cached)"""
+    jobs, next_cursor = await job_service.get_jobs_cached(
         db=db,
         skip=skip,
         limit=limit,
         location=location,
         job_type=job_type,
         min_salary=min_salary,
-        search=search
+        search=search,
+        cursor=cursor,
+        sort=sort,
+        cursor_scope=request_scope(request)
     )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     # Return the jobs with the profile of the employer included
     # This can be done in the job_service.get_jobs method if needed
     # for job in jobs:
@@ -58,13 +67,32 @@ async def list_jobs(
 
 
 
+@router.get("/facets", response_model=JobFacets)
+async def get_job_facets(
+    location: Optional[str] = Query(None),
+    job_type: Optional[str] = Query(None),
+    min_salary: Optional[float] = Query(None),
+    search: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get job counts per location, job type and salary bucket for the current filters (Public endpoint)"""
+    facets = await job_service.get_job_facets(
+        db=db,
+        location=location,
+        job_type=job_type,
+        min_salary=min_salary,
+        search=search
+    )
+    return facets
+
+
 @router.get("/{job_id}", response_model=JobRead)
 async def get_job(
     job_id: int,
     db: AsyncSession = Depends(get_db)
 ):
-    """Get a single job by ID (Public endpoint)"""
-    job = await job_service.get_job_by_id(db, job_id)
+    """Get a single job by ID (Public endpoint, cached)"""
+    job = await job_service.get_job_cached(db, job_id)
     if not job:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -77,7 +105,7 @@ async def get_job(
 async def update_job(
     job_id: int,
     job_update: JobUpdate,
-    profile: EmployerProfile = Depends(get_current_employer_profile),
+    employer_id: int = Depends(get_current_employer_profile_id),
     db: AsyncSession = Depends(get_db)
 ):
     """Update a job posting (Employer only - can only update own jobs)"""
@@ -90,7 +118,7 @@ async def update_job(
         )
     
     # Verify the job belongs to this employer
-    if job.employer_id != profile.id:
+    if job.employer_id != employer_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You don't have permission to update this job"
@@ -103,7 +131,7 @@ async def update_job(
 @router.delete("/{job_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_job(
     job_id: int,
-    profile: EmployerProfile = Depends(get_current_employer_profile),
+    employer_id: int = Depends(get_current_employer_profile_id),
     db: AsyncSession = Depends(get_db)
 ):
     """Delete/deactivate a job posting (Employer only - can only delete own jobs)"""
@@ -116,7 +144,7 @@ async def delete_job(
         )
     
     # Verify the job belongs to this employer
-    if job.employer_id != profile.id:
+    if job.employer_id != employer_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You don't have permission to delete this job"
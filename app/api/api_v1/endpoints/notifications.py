@@ -1,12 +1,28 @@
 # app/api/api_v1/endpoints/notifications.py
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response, Request, Header
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional
+from datetime import datetime
+import asyncio
+import json
 
-from app.db.database import get_db
-from app.core.deps import get_current_user
+import anyio
+
+from app.db.database import get_db, AsyncSessionLocal
+from app.db.replica import get_read_db
+from app.core.config import settings
+from app.core.deps import authenticate_token, get_current_user
+from app.core.pagination import page_cursor, set_next_cursor
+from app.core.websocket_manager import manager, sse_frame
 from app.models.user import User
-from app.schemas.notification import NotificationRead, NotificationUpdate
+from app.schemas.notification import (
+    NotificationRead,
+    NotificationUpdate,
+    NotificationBulkAction,
+    NotificationBulkResult,
+    NotificationChanges
+)
 from app.services import notification_service
 
 router = APIRouter()
@@ -14,11 +30,15 @@ router = APIRouter()
 
 @router.get("/", response_model=List[NotificationRead])
 async def get_my_notifications(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     unread_only: bool = Query(False),
+    cursor: Optional[str] = Depends(page_cursor),
+    since: Optional[datetime] = Query(None, description="Oldest notification to include; defaults to the last NOTIFICATION_READ_WINDOW_DAYS days"),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all notifications for current user"""
     notifications = await notification_service.get_user_notifications(
@@ -26,8 +46,11 @@ async def get_my_notifications(
         user_id=current_user.id,
         skip=skip,
         limit=limit,
-        unread_only=unread_only
+        unread_only=unread_only,
+        cursor=cursor,
+        since=since
     )
+    set_next_cursor(request, response, notifications, limit)
     return notifications
 
 
@@ -37,10 +60,123 @@ async def get_unread_notification_count(
     db: AsyncSession = Depends(get_db)
 ):
     """Get count of unread notifications"""
+    # Primary, uncached: a pushed notification must show up in the count at once
     count = await notification_service.get_unread_count(db, current_user.id)
     return {"unread_count": count}
 
 
+@router.get("/changes", response_model=NotificationChanges)
+async def get_notification_changes(
+    since: int = Query(..., ge=0, description="Version from the previous sync; 0 on first use"),
+    limit: int = Query(500, ge=1, le=1000),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Delta sync: notifications created, updated or read after `since`, and
+    the ids deleted after it. Store the returned version for the next call.
+    """
+    return await notification_service.get_notification_changes(
+        db, current_user.id, since, limit=limit
+    )
+
+
+@router.get("/stream")
+async def stream_notifications(
+    token: Optional[str] = Query(None, description="Access token, for EventSource clients that cannot set headers"),
+    last_event_id: Optional[int] = Query(None, description="Notification version to resume from when the Last-Event-ID header cannot be sent"),
+    authorization: Optional[str] = Header(None),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID")
+):
+    """
+    Server-Sent Events stream of notifications, on the same delivery path as
+    the WebSocket. Each event's id is the user's notification version, so a
+    reconnecting EventSource resumes from Last-Event-ID with a delta sync:
+    notifications created, updated or read since, and the ones deleted.
+    
+    Connect with: new EventSource("/api/v1/notifications/stream?token=<your_access_token>")
+    
+    No database session is held for the life of the stream.
+    """
+    if token is None and authorization and authorization.lower().startswith("bearer "):
+        token = authorization[7:]
+    # Same revocation and is_active checks as every other endpoint
+    async with AsyncSessionLocal() as db:
+        _, user_id = await authenticate_token(db, token)
+    
+    # The browser sends Last-Event-ID on its own when it reconnects
+    if last_event_id_header and last_event_id_header.isdigit():
+        last_event_id = int(last_event_id_header)
+    
+    async def event_stream():
+        # Register before the catch-up so nothing published in between is missed;
+        # a notification may then arrive twice, and clients replace it by id
+        connection = await manager.connect_stream(user_id)
+        try:
+            yield f"retry: {settings.SSE_RETRY_MS}\n\n"
+            
+            if last_event_id is not None:
+                async with AsyncSessionLocal() as db:
+                    changes = await notification_service.get_notification_changes(
+                        db, user_id, last_event_id, limit=settings.SSE_CATCHUP_LIMIT
+                    )
+                for event_id, event_type, message in _catch_up_events(changes):
+                    yield sse_frame(json.dumps(message), event_id, event_type)
+            
+            while not connection.closing:
+                try:
+                    frame = await asyncio.wait_for(
+                        connection.queue.get(), timeout=settings.SSE_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    # Comment line: ignored by EventSource, keeps proxies from timing out
+                    frame = ": ping\n\n"
+                yield frame
+        finally:
+            # Runs while the response is being cancelled on client disconnect
+            with anyio.CancelScope(shield=True):
+                await manager.disconnect(connection.key, user_id)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            # Stop nginx from buffering the stream
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
+def _catch_up_events(changes: dict):
+    """
+    (event_id, event_type, message) replaying a delta-sync answer on the stream:
+    changed notifications in version order, then the deletions, or a single
+    resync_required event when the client is too far behind to catch up
+    """
+    timestamp = datetime.utcnow().isoformat()
+    version = changes["version"]
+    if changes.get("resync_required") or changes.get("has_more"):
+        yield version, "resync_required", {"type": "resync_required", "version": version, "timestamp": timestamp}
+        return
+    for notification in changes.get("notifications", []):
+        message = {
+            "type": "notification",
+            "data": notification_service.notification_payload(notification),
+            "timestamp": timestamp
+        }
+        yield notification.version, "notification", message
+    if changes.get("deleted_ids"):
+        message = {
+            "type": "notifications_deleted",
+            "notification_ids": changes["deleted_ids"],
+            "version": version,
+            "timestamp": timestamp
+        }
+        yield version, "notifications_deleted", message
+
+
 @router.put("/{notification_id}/read", response_model=NotificationRead)
 async def mark_notification_as_read(
     notification_id: int,
@@ -48,7 +184,7 @@ async def mark_notification_as_read(
     db: AsyncSession = Depends(get_db)
 ):
     """Mark a notification as read"""
-    notification = await notification_service.get_notification_by_id(db, notification_id)
+    notification = await notification_service.get_notification_by_id(db, notification_id, current_user.id)
     
     if not notification:
         raise HTTPException(
@@ -56,13 +192,6 @@ async def mark_notification_as_read(
             detail="Notification not found"
         )
     
-    # Verify ownership
-    if notification.user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to access this notification"
-        )
-    
     updated_notification = await notification_service.mark_notification_as_read(db, notification)
     return updated_notification
 
@@ -80,6 +209,32 @@ async def mark_all_notifications_as_read(
     }
 
 
+@router.post("/bulk/read", response_model=NotificationBulkResult)
+async def mark_notifications_as_read_bulk(
+    action: NotificationBulkAction,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Mark a list of notifications, or everything before a timestamp, as read"""
+    marked_ids = await notification_service.mark_notifications_as_read(
+        db, current_user.id, ids=action.ids, before=action.before
+    )
+    return {"count": len(marked_ids), "notification_ids": marked_ids}
+
+
+@router.post("/bulk/delete", response_model=NotificationBulkResult)
+async def delete_notifications_bulk(
+    action: NotificationBulkAction,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Delete a list of notifications, or everything before a timestamp"""
+    deleted_ids = await notification_service.delete_notifications(
+        db, current_user.id, ids=action.ids, before=action.before
+    )
+    return {"count": len(deleted_ids), "notification_ids": deleted_ids}
+
+
 @router.delete("/{notification_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_notification(
     notification_id: int,
@@ -87,7 +242,7 @@ async def delete_notification(
     db: AsyncSession = Depends(get_db)
 ):
     """Delete a notification"""
-    notification = await notification_service.get_notification_by_id(db, notification_id)
+    notification = await notification_service.get_notification_by_id(db, notification_id, current_user.id)
     
     if not notification:
         raise HTTPException(
@@ -95,12 +250,5 @@ async def delete_notification(
             detail="Notification not found"
         )
     
-    # Verify ownership
-    if notification.user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to delete this notification"
-        )
-    
     await notification_service.delete_notification(db, notification)
     return None
\ No newline at end of file
@@ -1,12 +1,20 @@
 # app/api/api_v1/endpoints/websocket.py
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, Query, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, Query, status
+from pydantic import ValidationError
 from typing import Optional
 
 from app.core.websocket_manager import manager
-from app.core.security import decode_access_token
-from app.db.database import get_db
-from app.services.notification_service import get_user_notifications
+from app.core.deps import authenticate_token
+from app.db.database import AsyncSessionLocal
+from app.schemas.notification import NotificationBulkAction, NotificationChanges
+from app.services.notification_service import (
+    delete_notifications,
+    get_notification_by_id,
+    get_notification_changes,
+    get_unread_count,
+    mark_notification_as_read,
+    mark_notifications_as_read
+)
 
 router = APIRouter()
 
@@ -14,29 +22,35 @@ router = APIRouter()
 @router.websocket("/notifications")
 async def websocket_notifications(
     websocket: WebSocket,
-    token: str = Query(...),
-    db: AsyncSession = Depends(get_db)
+    token: str = Query(...)
 ):
     """
     WebSocket endpoint for real-time notifications
     
     Connect with: ws://localhost:8000/api/v1/ws/notifications?token=<your_access_token>
+    
+    Client messages: ping, mark_read {notification_id}, get_unread_count,
+    mark_all_read, mark_read_bulk / delete_bulk {ids | before},
+    get_changes {since, limit}
+    
+    No database session is held for the life of the socket; each message
+    that needs the database opens a short-lived one.
     """
     
-    # Authenticate user from token
+    # Authenticate user from token, revocation and is_active included
     try:
-        payload = decode_access_token(token)
-        user_id = int(payload.get("sub"))
-    except Exception as e:
+        async with AsyncSessionLocal() as db:
+            _, user_id = await authenticate_token(db, token)
+    except HTTPException:
         await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
         return
     
     # Connect user
-    await manager.connect(websocket, user_id)
+    connection = await manager.connect(websocket, user_id)
     
     try:
         # Send connection success message
-        await websocket.send_json({
+        await connection.send_json({
             "type": "connection",
             "status": "connected",
             "message": "Successfully connected to notification stream",
@@ -44,11 +58,9 @@ async def websocket_notifications(
         })
         
         # Send count of unread notifications on connection
-        from app.services.notification_service import get_unread_count
-        unread_count = await get_unread_count(db, user_id)
-        await websocket.send_json({
+        await connection.send_json({
             "type": "unread_count",
-            "count": unread_count
+            "count": await _unread_count(user_id)
         })
         
         # Keep connection alive and handle incoming messages
@@ -58,7 +70,7 @@ async def websocket_notifications(
             
             # Handle different message types
             if data.get("type") == "ping":
-                await websocket.send_json({
+                await connection.send_json({
                     "type": "pong",
                     "timestamp": data.get("timestamp")
                 })
@@ -67,31 +79,83 @@ async def websocket_notifications(
                 # Client can request to mark notification as read
                 notification_id = data.get("notification_id")
                 if notification_id:
-                    from app.services.notification_service import get_notification_by_id, mark_notification_as_read
-                    notification = await get_notification_by_id(db, notification_id)
-                    if notification and notification.user_id == user_id:
-                        await mark_notification_as_read(db, notification)
-                        await websocket.send_json({
+                    async with AsyncSessionLocal() as db:
+                        notification = await get_notification_by_id(db, notification_id, user_id)
+                        if notification:
+                            await mark_notification_as_read(db, notification)
+                    if notification:
+                        await connection.send_json({
                             "type": "notification_read",
                             "notification_id": notification_id
                         })
             
+            elif data.get("type") in ("mark_read_bulk", "delete_bulk", "mark_all_read"):
+                # One statement for a list of ids, everything before a timestamp, or all
+                await connection.send_json(await _handle_bulk(data, user_id))
+            
+            elif data.get("type") == "get_changes":
+                # Delta sync, same reply as GET /notifications/changes
+                await connection.send_json(await _changes(data, user_id))
+            
             elif data.get("type") == "get_unread_count":
                 # Send current unread count
-                from app.services.notification_service import get_unread_count
-                unread_count = await get_unread_count(db, user_id)
-                await websocket.send_json({
+                await connection.send_json({
                     "type": "unread_count",
-                    "count": unread_count
+                    "count": await _unread_count(user_id)
                 })
     
     except WebSocketDisconnect:
-        manager.disconnect(websocket, user_id)
+        await manager.disconnect(websocket, user_id)
         print(f"User {user_id} disconnected from notifications")
     
     except Exception as e:
         print(f"Error in WebSocket for user {user_id}: {e}")
-        manager.disconnect(websocket, user_id)
+        await manager.disconnect(websocket, user_id)
+
+
+async def _handle_bulk(data: dict, user_id: int) -> dict:
+    """Run a bulk read/delete message and build the reply"""
+    ids, before = None, None
+    if data["type"] != "mark_all_read":
+        try:
+            action = NotificationBulkAction.model_validate(data)
+        except ValidationError as e:
+            return {"type": "error", "request": data["type"], "detail": e.errors(include_url=False, include_context=False)}
+        ids, before = action.ids, action.before
+    
+    async with AsyncSessionLocal() as db:
+        if data["type"] == "delete_bulk":
+            notification_ids = await delete_notifications(db, user_id, ids=ids, before=before)
+            reply_type = "notifications_deleted"
+        else:
+            notification_ids = await mark_notifications_as_read(db, user_id, ids=ids, before=before)
+            reply_type = "notifications_read"
+    
+    return {
+        "type": reply_type,
+        "count": len(notification_ids),
+        "notification_ids": notification_ids
+    }
+
+
+async def _changes(data: dict, user_id: int) -> dict:
+    """Run a get_changes message and build the reply"""
+    try:
+        since = int(data.get("since", 0))
+        limit = min(max(int(data.get("limit", 500)), 1), 1000)
+    except (TypeError, ValueError):
+        return {"type": "error", "request": "get_changes", "detail": "since and limit must be integers"}
+    
+    async with AsyncSessionLocal() as db:
+        changes = await get_notification_changes(db, user_id, since, limit=limit)
+    
+    return {"type": "changes", **NotificationChanges.model_validate(changes).model_dump(mode="json")}
+
+
+async def _unread_count(user_id: int) -> int:
+    """Unread count from the primary, in a short-lived session"""
+    async with AsyncSessionLocal() as db:
+        return await get_unread_count(db, user_id)
 
 
 @router.get("/online-status")
@@ -99,5 +163,7 @@ async def get_online_status():
     """Get current WebSocket connection statistics"""
     return {
         "online_users": manager.get_online_user_count(),
-        "total_connections": sum(len(conns) for conns in manager.active_connections.values())
+        "total_connections": sum(len(conns) for conns in manager.active_connections.values()),
+        "pubsub": manager.backend.stats(),
+        "delivery": manager.stats()
     }
\ No newline at end of file
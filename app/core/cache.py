@@ -0,0 +1,221 @@
+# app/core/cache.py
+"""
+Read-through result cache with tag-based invalidation
+
+Entries are JSON values stored under a key with a TTL and any number of
+tags. Invalidating a tag evicts every entry that was stored with it, e.g.
+"job:42" evicts the job detail and every cached list page containing job 42.
+
+CACHE_BACKEND selects the store:
+    "redis"  - shared across workers (CACHE_REDIS_URL, falls back to REDIS_URL)
+    "memory" - per-process stand-in for single-worker local runs
+    "none"   - caching disabled
+"""
+import json
+import time
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+
+KEY_PREFIX = "jobden:cache:"
+TAG_PREFIX = "jobden:tag:"
+
+
+class InMemoryCacheBackend:
+    """Process-local backend with the same semantics as RedisCacheBackend"""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        # {key: (expires_at, value)}
+        self.entries: Dict[str, Tuple[float, str]] = {}
+        # {tag: {keys}}
+        self.tags: Dict[str, Set[str]] = {}
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            self.entries.pop(key, None)
+            return None
+        return entry[1]
+
+    async def set(self, key: str, value: str, ttl: int, tags: Iterable[str] = ()):
+        if len(self.entries) >= self.max_entries:
+            self._evict_expired()
+        if len(self.entries) >= self.max_entries:
+            # Still full: drop the oldest insertions
+            for old_key in list(self.entries)[: self.max_entries // 10]:
+                self.entries.pop(old_key, None)
+        self.entries[key] = (time.monotonic() + ttl, value)
+        for tag in tags:
+            self.tags.setdefault(tag, set()).add(key)
+
+    async def delete(self, *keys: str):
+        for key in keys:
+            self.entries.pop(key, None)
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> int:
+        evicted = 0
+        for tag in tags:
+            for key in self.tags.pop(tag, set()):
+                if self.entries.pop(key, None) is not None:
+                    evicted += 1
+        return evicted
+
+    def _evict_expired(self):
+        now = time.monotonic()
+        for key in [k for k, (expires_at, _) in self.entries.items() if expires_at <= now]:
+            self.entries.pop(key, None)
+        for tag in list(self.tags):
+            self.tags[tag] &= self.entries.keys()
+            if not self.tags[tag]:
+                del self.tags[tag]
+
+
+# KEYS: entry key, then tag sets. ARGV: value, ttl.
+# Tag sets only need to outlive the entries they point at, so their TTL only
+# ever grows (EXPIRE GT/NX would need Redis 7).
+SET_WITH_TAGS_LUA = """
+local ttl = tonumber(ARGV[2])
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ttl)
+for i = 2, #KEYS do
+    redis.call('SADD', KEYS[i], KEYS[1])
+    if redis.call('TTL', KEYS[i]) < ttl then
+        redis.call('EXPIRE', KEYS[i], ttl)
+    end
+end
+return 1
+"""
+
+# KEYS: tag sets. Reads and evicts in one step, so an entry stored while a
+# tag is being invalidated cannot lose its tag membership and survive.
+INVALIDATE_TAGS_LUA = """
+local evicted = 0
+for _, tag in ipairs(KEYS) do
+    local members = redis.call('SMEMBERS', tag)
+    for i = 1, #members, 1000 do
+        evicted = evicted + redis.call('DEL', unpack(members, i, math.min(i + 999, #members)))
+    end
+    redis.call('DEL', tag)
+end
+return evicted
+"""
+
+
+class RedisCacheBackend:
+    """Redis backend; tags are Redis sets of cache keys"""
+
+    def __init__(self, url: str):
+        if url.startswith("rediss://"):
+            self.client = aioredis.from_url(url, decode_responses=True, ssl_cert_reqs=None)
+        else:
+            self.client = aioredis.from_url(url, decode_responses=True)
+        self._set_with_tags = self.client.register_script(SET_WITH_TAGS_LUA)
+        self._invalidate_tags = self.client.register_script(INVALIDATE_TAGS_LUA)
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self.client.get(KEY_PREFIX + key)
+
+    async def set(self, key: str, value: str, ttl: int, tags: Iterable[str] = ()):
+        await self._set_with_tags(
+            keys=[KEY_PREFIX + key, *(TAG_PREFIX + tag for tag in tags)],
+            args=[value, ttl]
+        )
+
+    async def delete(self, *keys: str):
+        if keys:
+            await self.client.delete(*(KEY_PREFIX + key for key in keys))
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> int:
+        tag_keys = [TAG_PREFIX + tag for tag in tags]
+        if not tag_keys:
+            return 0
+        return await self._invalidate_tags(keys=tag_keys)
+
+
+class ResultCache:
+    """JSON result cache with hit/miss counters; backend errors count as misses"""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.invalidations = 0
+
+    async def get_json(self, key: str) -> Optional[Any]:
+        if self.backend is None:
+            return None
+        try:
+            raw = await self.backend.get(key)
+        except Exception as e:
+            print(f"Cache get failed for {key}: {e}")
+            self.errors += 1
+            raw = None
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(raw)
+
+    async def set_json(self, key: str, value: Any, ttl: int, tags: Iterable[str] = ()):
+        if self.backend is None:
+            return
+        try:
+            await self.backend.set(key, json.dumps(value, separators=(",", ":")), ttl, list(tags))
+        except Exception as e:
+            print(f"Cache set failed for {key}: {e}")
+            self.errors += 1
+
+    async def delete(self, *keys: str):
+        if self.backend is None:
+            return
+        try:
+            await self.backend.delete(*keys)
+        except Exception as e:
+            print(f"Cache delete failed for {keys}: {e}")
+            self.errors += 1
+
+    async def invalidate_tags(self, *tags: str):
+        if self.backend is None:
+            return
+        try:
+            self.invalidations += await self.backend.invalidate_tags(tags)
+        except Exception as e:
+            print(f"Cache invalidation failed for {tags}: {e}")
+            self.errors += 1
+
+    def stats(self) -> dict:
+        """Hit/miss counters for this process"""
+        lookups = self.hits + self.misses
+        return {
+            "backend": settings.CACHE_BACKEND,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "errors": self.errors,
+            "evicted_by_invalidation": self.invalidations,
+        }
+
+
+def _create_backend():
+    if settings.CACHE_BACKEND == "redis":
+        url = settings.CACHE_REDIS_URL or settings.REDIS_URL
+        if not url:
+            url = f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}/0"
+        return RedisCacheBackend(url)
+    if settings.CACHE_BACKEND == "memory":
+        if settings.WEB_CONCURRENCY > 1:
+            # Invalidations would only reach the worker that made the write
+            raise ValueError("CACHE_BACKEND=memory is per process; use redis when WEB_CONCURRENCY > 1")
+        return InMemoryCacheBackend()
+    if settings.CACHE_BACKEND == "none":
+        return None
+    raise ValueError(f"Unknown CACHE_BACKEND: {settings.CACHE_BACKEND}")
+
+
+# Global cache instance
+cache = ResultCache(_create_backend())
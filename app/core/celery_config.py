@@ -1,5 +1,7 @@
 # app/core/celery_config.py
 from celery import Celery
+from celery.schedules import crontab
+from kombu import Queue
 import os
 from dotenv import load_dotenv
 from app.core.config import settings
@@ -26,7 +28,7 @@ celery_app = Celery(
     "jobsearch_tasks",
     broker=broker_url,
     backend=settings.CELERY_RESULT_BACKEND or os.getenv("CELERY_RESULT_BACKEND", "redis://localhost:6379/0"),
-    include=["app.tasks.email_tasks"]  # Import tasks
+    include=["app.tasks.email_tasks", "app.tasks.maintenance_tasks"]  # Import tasks
 )
 
 # Celery Configuration
@@ -51,14 +53,60 @@ celery_app.conf.update(
     redis_backend_use_ssl={
         'ssl_cert_reqs': None
     } if REDIS_URL and REDIS_URL.startswith("rediss://") else None,
+    # Nothing reads task results: don't store them, and expire any that are
+    # still written (e.g. by tasks that set ignore_result=False) after an hour
+    task_ignore_result=True,
+    result_expires=60 * 60,
 )
 
+# Queues: user-facing emails never wait behind batch work. Run one worker
+# per queue (see Procfile) so transactional mail has its own capacity.
+celery_app.conf.task_queues = (
+    Queue("transactional"),
+    Queue("bulk"),
+)
+celery_app.conf.task_default_queue = "transactional"
+celery_app.conf.task_routes = {
+    "app.tasks.email_tasks.send_weekly_digest*": {"queue": "bulk"},
+    "app.tasks.maintenance_tasks.*": {"queue": "bulk"},
+    # Everything else goes to "transactional": password resets, and the
+    # batched-email flush, since the buffer only holds user-triggered emails
+}
+
+# Worker profile: "io" runs tasks on a thread pool, since email tasks spend
+# nearly all their time waiting on SendGrid/Redis; "default" keeps one task
+# at a time for small instances
+if settings.CELERY_WORKER_PROFILE == "io":
+    celery_app.conf.update(
+        worker_pool="threads",
+        worker_concurrency=settings.CELERY_WORKER_CONCURRENCY,
+        worker_prefetch_multiplier=4,
+    )
+else:
+    celery_app.conf.worker_pool = "solo"
+
 
-# Optional: Configure periodic tasks (like scheduled emails)
-# from celery.schedules import crontab
-# celery_app.conf.beat_schedule = {
-#     'send-weekly-digest': {
-#         'task': 'app.tasks.email_tasks.send_weekly_digest',
-#         'schedule': crontab(day_of_week=1, hour=9, minute=0),  # Every Monday at 9 AM
-#     },
-# }
\ No newline at end of file
+# Periodic tasks (run with: celery -A app.core.celery_config.celery_app beat)
+celery_app.conf.beat_schedule = {
+    'reconcile-unread-counts': {
+        'task': 'app.tasks.maintenance_tasks.reconcile_unread_counts_task',
+        'schedule': settings.UNREAD_RECONCILE_INTERVAL,
+    },
+    'maintain-notification-partitions': {
+        'task': 'app.tasks.maintenance_tasks.maintain_notification_partitions_task',
+        'schedule': 24 * 60 * 60,  # daily
+    },
+    'prune-notification-tombstones': {
+        'task': 'app.tasks.maintenance_tasks.prune_notification_tombstones_task',
+        'schedule': 24 * 60 * 60,  # daily
+    },
+    # Requeues batched emails whose flush died, even when no new mail arrives
+    'flush-email-batch': {
+        'task': 'app.tasks.email_tasks.flush_email_batch_task',
+        'schedule': settings.EMAIL_BATCH_CLAIM_TIMEOUT,
+    },
+    'send-weekly-digest': {
+        'task': 'app.tasks.email_tasks.send_weekly_digest',
+        'schedule': crontab(day_of_week=1, hour=9, minute=0),  # Every Monday at 9 AM
+    },
+}
\ No newline at end of file
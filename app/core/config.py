@@ -5,12 +5,65 @@ from typing import List
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Job Den Backend"
     DATABASE_URL: str
+    # Database connection mode:
+    #   "transaction_pooler" - behind pgBouncer/Supavisor in transaction mode
+    #                          (no client-side pool, no prepared statements)
+    #   "direct"             - straight to Postgres with a real connection pool
+    DB_CONNECTION_MODE: str = "transaction_pooler"
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds before a pooled connection is replaced
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 500  # asyncpg prepared statements per connection
+    # Optional read replica for read-only endpoints
+    DATABASE_REPLICA_URL: str | None = None
+    REPLICA_MAX_LAG_SECONDS: float = 5.0  # fall back to primary above this lag
+    REPLICA_LAG_CHECK_INTERVAL: float = 5.0  # seconds between lag probes
+    READ_YOUR_WRITES_SECONDS: float = 10.0  # pin a user to primary after a write
+    # Result cache: "redis", "memory" (per-process, single worker only) or "none"
+    CACHE_BACKEND: str = "redis"
+    WEB_CONCURRENCY: int = 1  # uvicorn workers per instance (uvicorn reads it too)
+    CACHE_REDIS_URL: str | None = None  # defaults to REDIS_URL
+    JOB_CACHE_TTL: int = 300  # seconds to cache GET /jobs/{job_id}
+    JOB_LIST_CACHE_TTL: int = 60  # seconds to cache GET /jobs/ pages
+    JOB_FACETS_CACHE_TTL: int = 60  # seconds to cache /jobs/facets per filter set
+    UNREAD_RECONCILE_INTERVAL: int = 3600  # seconds between unread counter reconciliation runs
+    UNREAD_RECONCILE_BATCH: int = 1000  # users locked and recounted per reconciliation transaction
+    # Notifications are partitioned by month on created_at
+    NOTIFICATION_RETENTION_MONTHS: int = 12  # whole months kept before a partition is removed
+    NOTIFICATION_RETENTION_MODE: str = "drop"  # "drop" or "detach" (keep as a table to archive)
+    NOTIFICATION_PARTITIONS_AHEAD: int = 3  # future monthly partitions kept ready
+    NOTIFICATION_READ_WINDOW_DAYS: int = 90  # default lookback for notification lists
+    NOTIFICATION_COALESCE_WINDOW_SECONDS: int = 600  # merge same-job new_application events (0 disables)
+    NOTIFICATION_TOMBSTONE_DAYS: int = 30  # deletions kept for delta sync; older clients reload
     SECRET_KEY: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     ALGORITHM: str = "HS256"
     BACKEND_CORS_ORIGINS: list[AnyHttpUrl] = Field(default_factory=list)
     REDIS_URL: str | None = None
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7     # refresh token lifespan
+    AUTH_USER_CACHE_TTL: int = 60  # seconds a user's token_version/is_active is trusted
+    # WebSocket fan-out: "local" (single process) or "redis" (pub/sub across workers)
+    WEBSOCKET_BACKEND: str = "local"
+    WEBSOCKET_REDIS_URL: str | None = None  # defaults to REDIS_URL
+    WEBSOCKET_SHARDS: int = 16  # channels users are spread over (user_id % shards)
+    WEBSOCKET_PUBLISH_INTERVAL: float = 0.01  # seconds publishes are batched for
+    WEBSOCKET_PUBLISH_BATCH: int = 100  # flush early at this many buffered messages
+    WEBSOCKET_SEND_QUEUE_SIZE: int = 100  # queued messages per socket before it counts as slow
+    WEBSOCKET_SLOW_CONSUMER: str = "disconnect"  # "disconnect" or "drop" messages for slow sockets
+    SSE_HEARTBEAT_SECONDS: int = 15  # comment line sent on idle event streams to keep proxies open
+    SSE_RETRY_MS: int = 3000  # reconnect delay advertised to EventSource clients
+    SSE_CATCHUP_LIMIT: int = 100  # changes replayed on a Last-Event-ID reconnect; further behind must resync
+    # Transactional outbox dispatcher (runs in the web process)
+    OUTBOX_DISPATCHER_ENABLED: bool = True
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_POLL_INTERVAL: float = 1.0  # seconds between polls when idle
+    OUTBOX_MAX_ATTEMPTS: int = 10  # failed events are kept after this many tries
+    OUTBOX_LEASE_SECONDS: float = 30.0  # a claimed batch is retried if not settled by then
+    TASK_QUEUE_SIZE: int = 1000  # Celery tasks waiting to be published per web process
+    TASK_QUEUE_BATCH: int = 100  # tasks published per broker round trip
+    TASK_QUEUE_OVERFLOW: str = "block"  # when full: "block", "drop" or "inline"
     # Cloudinary Configuration
     CLOUDINARY_CLOUD_NAME: str | None = None
     CLOUDINARY_API_KEY: str | None = None
@@ -19,11 +72,24 @@ class Settings(BaseSettings):
     SENDGRID_API_KEY: str | None = None
     SENDGRID_FROM_EMAIL: str | None = None
     SENDGRID_FROM_NAME: str | None = None
+    SENDGRID_API_URL: str = "https://api.sendgrid.com"
+    SENDGRID_POOL_SIZE: int = 20  # kept-alive connections per worker process (match CELERY_WORKER_CONCURRENCY)
+    SENDGRID_TIMEOUT: float = 10.0  # seconds, connect and read
+    EMAIL_DELIVERY_MODE: str = "single_hop"  # render and send in one task, "batched" or "per_message"
+    EMAIL_TEMPLATE_CACHE_DIR: str | None = None  # Jinja bytecode cache, defaults to the temp dir
+    DIGEST_CHUNK_SIZE: int = 500  # job seekers per cursor fetch, match query and bulk task
+    DIGEST_JOBS_PER_USER: int = 5  # best-ranked matches per digest
+    DIGEST_LOOKBACK_DAYS: int = 7  # jobs newer than this are "new"
+    EMAIL_BATCH_WINDOW: int = 2  # seconds messages wait to share a SendGrid request
+    EMAIL_BATCH_MAX_ATTEMPTS: int = 5  # per recipient, for 429/5xx/network failures
+    EMAIL_BATCH_CLAIM_TIMEOUT: int = 300  # seconds before an interrupted flush's messages are requeued
     APP_URL: str | None = None
     APP_NAME: str = "JobDen"
     # Celery Configuration
     CELERY_BROKER_URL: str | None = None
     CELERY_RESULT_BACKEND: str | None = None
+    CELERY_WORKER_PROFILE: str = "io"  # "io" (thread pool) or "default" (one task at a time)
+    CELERY_WORKER_CONCURRENCY: int = 20  # threads per worker with the io profile
     # Rate Limiting Configuration
     REDIS_HOST: str = "localhost"
     REDIS_PORT: int = 6379
@@ -36,8 +36,9 @@ CORS_CONFIG = {
         "User-Agent",
         "DNT",
         "Cache-Control",
-        "X-Requested-With"
+        "X-Requested-With",
+        "Last-Event-ID"
     ],
-    "expose_headers": ["Content-Length", "X-Request-ID"],
+    "expose_headers": ["Content-Length", "X-Request-ID", "X-Next-Cursor"],
     "max_age": 600,  # Cache preflight requests for 10 minutes
 }
\ No newline at end of file
@@ -1,117 +1,144 @@
 # app/core/database_indexes.py
 """
-Database indexes for performance optimization
+Database index usage report
 
-Run this migration to add indexes:
-    alembic revision --autogenerate -m "add performance indexes"
-    alembic upgrade head
-"""
+Indexes are declared in the models' __table_args__ and created with
+CREATE INDEX CONCURRENTLY by Alembic migrations. This report reads
+pg_stat_user_indexes, pg_stat_user_tables and (if installed)
+pg_stat_statements to show:
 
-# Index definitions to add to your models:
-
-RECOMMENDED_INDEXES = """
-# Add these to your models for better query performance:
-
-# User Model
-class User(Base):
-    # Existing columns...
-    email = Column(String, unique=True, index=True)  # Already indexed
-    is_employer = Column(Boolean, default=False, index=True)  # Add index
-    is_active = Column(Boolean, default=True, index=True)  # Add index
-
-# Job Model
-class Job(Base):
-    # Existing columns...
-    title = Column(String, nullable=False, index=True)  # Add index for search
-    location = Column(String, nullable=True, index=True)  # Add index for filtering
-    job_type = Column(String, nullable=True, index=True)  # Add index for filtering
-    is_active = Column(Boolean, default=True, index=True)  # Add index
-    created_at = Column(DateTime, default=datetime.utcnow, index=True)  # Add index for sorting
-    employer_id = Column(Integer, ForeignKey("employer_profiles.id"), index=True)  # Add index
-
-# Application Model
-class Application(Base):
-    # Existing columns...
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)  # Add index
-    job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False, index=True)  # Add index
-    status = Column(String, default="pending", index=True)  # Add index for filtering
-    applied_at = Column(DateTime, default=datetime.utcnow, index=True)  # Add index for sorting
-
-# Bookmark Model
-class Bookmark(Base):
-    # Existing columns...
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)  # Add index
-    job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False, index=True)  # Add index
-    created_at = Column(DateTime, default=datetime.utcnow, index=True)  # Add index
-
-# Notification Model
-class Notification(Base):
-    # Existing columns...
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)  # Add index
-    is_read = Column(Boolean, default=False, index=True)  # Add index for filtering
-    notification_type = Column(String, nullable=True, index=True)  # Add index
-    created_at = Column(DateTime, default=datetime.utcnow, index=True)  # Add index
-
-# Composite Indexes (add to __table_args__)
-
-# Job Search Performance
-Index('idx_job_active_created', Job.is_active, Job.created_at.desc())
-Index('idx_job_location_type', Job.location, Job.job_type)
-
-# Application Queries
-Index('idx_application_user_status', Application.user_id, Application.status)
-Index('idx_application_job_status', Application.job_id, Application.status)
-
-# Notification Queries  
-Index('idx_notification_user_unread', Notification.user_id, Notification.is_read)
-"""
+- indexes declared in the models but missing or invalid in the database
+- unused indexes (never scanned since stats were last reset)
+- tables with heavy sequential scans
+- the most expensive statements
 
-# SQL to add indexes manually (if needed)
-ADD_INDEXES_SQL = """
--- User indexes
-CREATE INDEX IF NOT EXISTS idx_users_is_employer ON users(is_employer);
-CREATE INDEX IF NOT EXISTS idx_users_is_active ON users(is_active);
-
--- Job indexes
-CREATE INDEX IF NOT EXISTS idx_jobs_title ON jobs(title);
-CREATE INDEX IF NOT EXISTS idx_jobs_location ON jobs(location);
-CREATE INDEX IF NOT EXISTS idx_jobs_job_type ON jobs(job_type);
-CREATE INDEX IF NOT EXISTS idx_jobs_is_active ON jobs(is_active);
-CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs(created_at DESC);
-CREATE INDEX IF NOT EXISTS idx_jobs_employer_id ON jobs(employer_id);
-
--- Composite indexes for job search
-CREATE INDEX IF NOT EXISTS idx_jobs_active_created ON jobs(is_active, created_at DESC);
-CREATE INDEX IF NOT EXISTS idx_jobs_location_type ON jobs(location, job_type) WHERE is_active = true;
-
--- Application indexes
-CREATE INDEX IF NOT EXISTS idx_applications_user_id ON applications(user_id);
-CREATE INDEX IF NOT EXISTS idx_applications_job_id ON applications(job_id);
-CREATE INDEX IF NOT EXISTS idx_applications_status ON applications(status);
-CREATE INDEX IF NOT EXISTS idx_applications_applied_at ON applications(applied_at DESC);
-
--- Composite indexes for applications
-CREATE INDEX IF NOT EXISTS idx_applications_user_status ON applications(user_id, status);
-CREATE INDEX IF NOT EXISTS idx_applications_job_status ON applications(job_id, status);
-
--- Bookmark indexes
-CREATE INDEX IF NOT EXISTS idx_bookmarks_user_id ON bookmarks(user_id);
-CREATE INDEX IF NOT EXISTS idx_bookmarks_job_id ON bookmarks(job_id);
-CREATE INDEX IF NOT EXISTS idx_bookmarks_created_at ON bookmarks(created_at DESC);
-
--- Notification indexes
-CREATE INDEX IF NOT EXISTS idx_notifications_user_id ON notifications(user_id);
-CREATE INDEX IF NOT EXISTS idx_notifications_is_read ON notifications(is_read);
-CREATE INDEX IF NOT EXISTS idx_notifications_type ON notifications(notification_type);
-CREATE INDEX IF NOT EXISTS idx_notifications_created_at ON notifications(created_at DESC);
-
--- Composite index for notification queries
-CREATE INDEX IF NOT EXISTS idx_notifications_user_unread ON notifications(user_id, is_read) WHERE is_read = false;
-
--- Full-text search index for job search (PostgreSQL)
-CREATE INDEX IF NOT EXISTS idx_jobs_fulltext ON jobs USING GIN (to_tsvector('english', title || ' ' || COALESCE(description, '')));
+Run it with:
+    python -m app.core.database_indexes
+    python -m app.core.database_indexes --top 20 --min-seq-scans 100
 """
-
-print(RECOMMENDED_INDEXES)
-print("\n\nSQL Commands:")
-print(ADD_INDEXES_SQL)
\ No newline at end of file
+import argparse
+
+from sqlalchemy import text
+
+import app.models  # noqa: F401  (registers every model on Base.metadata)
+from app.db.database import Base, get_sync_engine
+
+
+MISSING_OR_INVALID_INDEXES_SQL = text("""
+    SELECT c.relname AS index_name, i.indisvalid AS is_valid
+    FROM pg_class c
+    JOIN pg_index i ON i.indexrelid = c.oid
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE n.nspname = current_schema()
+""")
+
+UNUSED_INDEXES_SQL = text("""
+    SELECT
+        s.relname AS table_name,
+        s.indexrelname AS index_name,
+        s.idx_scan,
+        pg_size_pretty(pg_relation_size(s.indexrelid)) AS index_size
+    FROM pg_stat_user_indexes s
+    JOIN pg_index i ON i.indexrelid = s.indexrelid
+    WHERE s.idx_scan = 0
+      AND NOT i.indisunique
+      AND NOT i.indisprimary
+    ORDER BY pg_relation_size(s.indexrelid) DESC
+""")
+
+SEQ_SCAN_HOT_SPOTS_SQL = text("""
+    SELECT
+        relname AS table_name,
+        seq_scan,
+        seq_tup_read,
+        COALESCE(idx_scan, 0) AS idx_scan,
+        n_live_tup,
+        seq_tup_read / NULLIF(seq_scan, 0) AS avg_rows_per_seq_scan
+    FROM pg_stat_user_tables
+    WHERE seq_scan >= :min_seq_scans
+    ORDER BY seq_tup_read DESC
+    LIMIT :top
+""")
+
+HAS_PG_STAT_STATEMENTS_SQL = text(
+    "SELECT 1 FROM pg_extension WHERE extname = 'pg_stat_statements'"
+)
+
+TOP_STATEMENTS_SQL = text("""
+    SELECT
+        calls,
+        round(total_exec_time::numeric, 1) AS total_ms,
+        round(mean_exec_time::numeric, 2) AS mean_ms,
+        rows,
+        shared_blks_read,
+        left(regexp_replace(query, '\\s+', ' ', 'g'), 160) AS query
+    FROM pg_stat_statements
+    WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database())
+    ORDER BY total_exec_time DESC
+    LIMIT :top
+""")
+
+
+def declared_index_names() -> set:
+    """Names of every index declared on the models"""
+    names = set()
+    for table in Base.metadata.tables.values():
+        for index in table.indexes:
+            names.add(index.name)
+    return names
+
+
+def print_rows(title: str, rows: list):
+    """Print a result set as an aligned table"""
+    print(f"\n== {title} ==")
+    if not rows:
+        print("(none)")
+        return
+    columns = list(rows[0].keys())
+    widths = [
+        max(len(str(column)), *(len(str(row[column])) for row in rows))
+        for column in columns
+    ]
+    print("  ".join(str(column).ljust(width) for column, width in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(str(row[column]).ljust(width) for column, width in zip(columns, widths)))
+
+
+def run_report(top: int = 10, min_seq_scans: int = 50):
+    """Print the index usage report for the configured database"""
+    engine = get_sync_engine()
+    with engine.connect() as conn:
+        existing = {
+            row.index_name: row.is_valid
+            for row in conn.execute(MISSING_OR_INVALID_INDEXES_SQL)
+        }
+        problems = []
+        for name in sorted(declared_index_names()):
+            if name not in existing:
+                problems.append({"index_name": name, "problem": "missing (run alembic upgrade head)"})
+            elif not existing[name]:
+                problems.append({"index_name": name, "problem": "invalid (failed concurrent build, drop and rebuild)"})
+        print_rows("Declared indexes missing or invalid", problems)
+
+        unused = [dict(row._mapping) for row in conn.execute(UNUSED_INDEXES_SQL)]
+        print_rows("Unused indexes (idx_scan = 0)", unused)
+
+        hot_spots = [
+            dict(row._mapping)
+            for row in conn.execute(SEQ_SCAN_HOT_SPOTS_SQL, {"min_seq_scans": min_seq_scans, "top": top})
+        ]
+        print_rows("Sequential scan hot spots", hot_spots)
+
+        if conn.execute(HAS_PG_STAT_STATEMENTS_SQL).scalar():
+            statements = [dict(row._mapping) for row in conn.execute(TOP_STATEMENTS_SQL, {"top": top})]
+            print_rows("Most expensive statements (pg_stat_statements)", statements)
+        else:
+            print("\npg_stat_statements is not installed; skipping statement report")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report index usage and sequential scan hot spots")
+    parser.add_argument("--top", type=int, default=10, help="rows per section")
+    parser.add_argument("--min-seq-scans", type=int, default=50, help="ignore tables with fewer sequential scans")
+    args = parser.parse_args()
+    run_report(top=args.top, min_seq_scans=args.min_seq_scans)
@@ -1,25 +1,120 @@
 # app/core/deps.py
+import time
+from typing import Dict, Optional, Tuple
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
+from app.core.config import settings
 from app.core.security import decode_access_token
 from app.db.database import get_db
 from app.models.user import User
+from app.schemas.auth import TokenClaims
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
+# {user_id: (expires_at, token_version, is_active)}
+_user_auth_cache: Dict[int, Tuple[float, int, bool]] = {}
+
+
+def invalidate_user_auth_cache(user_id: int):
+    """Forget cached revocation state so the next request re-reads it"""
+    _user_auth_cache.pop(user_id, None)
+
+
 async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)):
-    try:
-        payload = decode_access_token(token)
-        user_id = int(payload.get("sub"))
-    except Exception:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication credentials")
+    payload, user_id = _decode_token(token)
 
     stmt = select(User).where(User.id == user_id)
     res = await db.execute(stmt)
     user = res.scalar_one_or_none()
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    # The row is loaded anyway: check it directly rather than the cache
+    check_token_state(payload, user.token_version or 0, bool(user.is_active))
     return user
+
+
+def _decode_token(token: Optional[str]) -> Tuple[dict, int]:
+    """Verified access-token payload and its user id, or 401"""
+    payload = decode_access_token(token) if token else None
+    try:
+        user_id = int(payload.get("sub"))
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication credentials")
+    return payload, user_id
+
+
+def check_token_state(payload: dict, token_version: int, is_active: bool) -> None:
+    """
+    Reject a token revoked by a token_version bump, or belonging to an
+    inactive user. Every token issued since the token_version migration
+    carries "tv"; one without it can't be revoked, so it isn't accepted.
+    """
+    if payload.get("tv") is None or payload["tv"] != token_version:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has been revoked")
+    if not is_active:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User is inactive")
+
+
+async def get_token_payload(token: str = Depends(oauth2_scheme)) -> Tuple[dict, int]:
+    """
+    (payload, user_id) with signature and expiry verified, but not revocation
+    or is_active: for endpoints whose first query reads the user's row anyway.
+    They must pass that row to check_token_state before anything else.
+    """
+    return _decode_token(token)
+
+
+async def authenticate_token(db: AsyncSession, token: Optional[str]) -> Tuple[dict, int]:
+    """
+    Verify an access token outside the dependency system (WebSocket, SSE):
+    signature and expiry, then revocation and is_active through the auth
+    cache. Returns (payload, user_id) or raises a 401 HTTPException.
+    """
+    payload, user_id = _decode_token(token)
+    token_version, is_active = await _get_auth_state(db, user_id)
+    check_token_state(payload, token_version, is_active)
+    return payload, user_id
+
+
+async def _get_auth_state(db: AsyncSession, user_id: int) -> Tuple[int, bool]:
+    """
+    Current (token_version, is_active) for a user.
+    Served from a per-process cache for AUTH_USER_CACHE_TTL seconds, so
+    revocation takes effect within that window on every worker.
+    """
+    now = time.monotonic()
+    cached = _user_auth_cache.get(user_id)
+    if cached and cached[0] > now:
+        return cached[1], cached[2]
+
+    stmt = select(User.token_version, User.is_active).where(User.id == user_id)
+    res = await db.execute(stmt)
+    row = res.one_or_none()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+
+    token_version, is_active = row.token_version or 0, bool(row.is_active)
+    _user_auth_cache[user_id] = (now + settings.AUTH_USER_CACHE_TTL, token_version, is_active)
+    return token_version, is_active
+
+
+async def get_current_user_claims(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+) -> TokenClaims:
+    """
+    Authenticate from verified token claims without loading the user row.
+    The session is only used on a revocation-cache miss.
+    """
+    payload, user_id = await authenticate_token(db, token)
+    return TokenClaims(
+        id=user_id,
+        is_employer=bool(payload.get("is_employer")),
+        is_active=True,
+        profile_id=payload.get("profile_id"),
+        token_version=payload["tv"]
+    )
@@ -2,11 +2,12 @@
 from fastapi import Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_current_user
+from app.core.deps import get_current_user, get_current_user_claims
 from app.models.user import User
 from app.models.employer_profile import EmployerProfile
 from app.db.database import get_db
-from app.services.employer_service import get_employer_profile_by_user_id
+from app.schemas.auth import TokenClaims
+from app.services.employer_service import get_employer_profile_by_user_id, get_employer_profile_by_id
 
 
 async def get_current_employer(
@@ -21,12 +22,47 @@ async def get_current_employer(
     return current_user
 
 
+async def get_current_employer_claims(
+    claims: TokenClaims = Depends(get_current_user_claims)
+) -> TokenClaims:
+    """Verify from token claims that the current user is an employer"""
+    if not claims.is_employer:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only employers can access this resource"
+        )
+    return claims
+
+
+async def get_current_employer_profile_id(
+    claims: TokenClaims = Depends(get_current_employer_claims),
+    db: AsyncSession = Depends(get_db)
+) -> int:
+    """Get the employer profile id, straight from the token when it carries one"""
+    if claims.profile_id:
+        return claims.profile_id
+
+    profile = await get_employer_profile_by_user_id(db, claims.id)
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Employer profile not found. Please create your profile first."
+        )
+    return profile.id
+
+
 async def get_current_employer_profile(
-    current_user: User = Depends(get_current_employer),
+    claims: TokenClaims = Depends(get_current_employer_claims),
     db: AsyncSession = Depends(get_db)
 ) -> EmployerProfile:
     """Get the employer profile for the current employer user"""
-    profile = await get_employer_profile_by_user_id(db, current_user.id)
+    profile = None
+    if claims.profile_id:
+        profile = await get_employer_profile_by_id(db, claims.profile_id)
+        if profile and profile.user_id != claims.id:
+            profile = None
+    if profile is None:
+        profile = await get_employer_profile_by_user_id(db, claims.id)
     
     if not profile:
         raise HTTPException(
@@ -34,4 +70,4 @@ async def get_current_employer_profile(
             detail="Employer profile not found. Please create your profile first."
         )
     
-    return profile
\ No newline at end of file
+    return profile
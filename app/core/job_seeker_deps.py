@@ -2,11 +2,12 @@
 from fastapi import Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_current_user
+from app.core.deps import get_current_user, get_current_user_claims
 from app.models.user import User
 from app.models.job_seeker_profile import JobSeekerProfile
 from app.db.database import get_db
-from app.services.job_seeker_service import get_job_seeker_profile_by_user_id
+from app.schemas.auth import TokenClaims
+from app.services.job_seeker_service import get_job_seeker_profile_by_user_id, get_job_seeker_profile_by_id
 
 
 async def get_current_job_seeker(
@@ -21,12 +22,30 @@ async def get_current_job_seeker(
     return current_user
 
 
+async def get_current_job_seeker_claims(
+    claims: TokenClaims = Depends(get_current_user_claims)
+) -> TokenClaims:
+    """Verify from token claims that the current user is a job seeker"""
+    if claims.is_employer:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only job seekers can access this resource"
+        )
+    return claims
+
+
 async def get_current_job_seeker_profile(
-    current_user: User = Depends(get_current_job_seeker),
+    claims: TokenClaims = Depends(get_current_job_seeker_claims),
     db: AsyncSession = Depends(get_db)
 ) -> JobSeekerProfile:
     """Get the job seeker profile for the current user"""
-    profile = await get_job_seeker_profile_by_user_id(db, current_user.id)
+    profile = None
+    if claims.profile_id:
+        profile = await get_job_seeker_profile_by_id(db, claims.profile_id)
+        if profile and profile.user_id != claims.id:
+            profile = None
+    if profile is None:
+        profile = await get_job_seeker_profile_by_user_id(db, claims.id)
     
     if not profile:
         raise HTTPException(
@@ -34,4 +53,4 @@ async def get_current_job_seeker_profile(
             detail="Job seeker profile not found. Please create your profile first."
         )
     
-    return profile
\ No newline at end of file
+    return profile
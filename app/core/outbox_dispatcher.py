@@ -0,0 +1,232 @@
+# app/core/outbox_dispatcher.py
+"""
+Outbox dispatcher
+
+Drains the outbox table in batches. A batch is claimed in a short
+transaction (FOR UPDATE SKIP LOCKED, then available_at is pushed
+OUTBOX_LEASE_SECONDS ahead), so several dispatchers (one per web worker)
+split the rows between them and no lock is held while delivering.
+Delivered rows are deleted in a second short transaction; failed rows are
+retried with exponential backoff up to OUTBOX_MAX_ATTEMPTS and then left in
+the table for inspection. Delivery is at-least-once: a dispatcher that dies
+mid-batch leaves its rows to be claimed again when the lease runs out.
+
+Runs inside the web process (started from the app lifespan). Notification
+pushes go through the WebSocket manager's pub/sub backend, so with
+WEBSOCKET_BACKEND=redis they reach sockets held by any worker. Celery tasks
+are published through the shared task queue (app.core.task_queue).
+"""
+import asyncio
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+from sqlalchemy import select, update, delete
+
+from app.core.config import settings
+from app.core.task_queue import task_queue
+from app.db.database import AsyncSessionLocal
+from app.models.outbox import OutboxEvent
+from app.services.outbox_service import NOTIFICATION_TOPIC, TASK_TOPIC
+
+MAX_BACKOFF_SECONDS = 300
+
+
+class OutboxDispatcher:
+    """Background loop delivering outbox events"""
+
+    def __init__(self, batch_size: int, poll_interval: float, max_attempts: int, lease_seconds: float):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.dispatched = 0
+        self.failed = 0
+        self._loop = None
+        self._wake_event = None
+        self._task = None
+
+    def start(self):
+        """Start the dispatch loop on the running event loop"""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake_event = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Cancel the dispatch loop"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._loop = None
+
+    def wake(self):
+        """Run the next batch now (safe to call from any thread)"""
+        if self._loop is None:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._wake_event.set()
+        else:
+            self._loop.call_soon_threadsafe(self._wake_event.set)
+
+    async def _run(self):
+        while True:
+            try:
+                count = await self.dispatch_batch()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Outbox dispatch failed: {e}")
+                count = 0
+
+            # A full batch means there is probably more waiting
+            if count >= self.batch_size:
+                continue
+
+            try:
+                await asyncio.wait_for(self._wake_event.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake_event.clear()
+
+    async def dispatch_batch(self) -> int:
+        """Deliver one batch of due events; returns how many were claimed"""
+        # Claim: push the batch's available_at past the lease and commit, so
+        # no row lock is held while delivering and other dispatchers skip it
+        async with AsyncSessionLocal() as db:
+            now = datetime.utcnow()
+            due = (
+                select(OutboxEvent.id)
+                .where(
+                    OutboxEvent.available_at <= now,
+                    OutboxEvent.attempts < self.max_attempts
+                )
+                .order_by(OutboxEvent.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            stmt = (
+                update(OutboxEvent)
+                .where(OutboxEvent.id.in_(due.scalar_subquery()))
+                .values(available_at=now + timedelta(seconds=self.lease_seconds))
+                .returning(*OutboxEvent.__table__.c)
+            )
+            result = await db.execute(select(OutboxEvent).from_statement(stmt))
+            events = sorted(result.scalars().all(), key=lambda e: e.id)
+            await db.commit()
+        if not events:
+            return 0
+
+        failures = await self._deliver(events)
+
+        # Settle: delete what went out, back off the rest. An event whose
+        # dispatcher dies before this step is retried once its lease ends.
+        delivered = [e.id for e in events if e.id not in failures]
+        retries = []
+        now = datetime.utcnow()
+        for outbox_event in events:
+            error = failures.get(outbox_event.id)
+            if error is None:
+                continue
+            attempts = outbox_event.attempts + 1
+            retries.append({
+                "id": outbox_event.id,
+                "attempts": attempts,
+                "last_error": str(error)[:1000],
+                "available_at": now + timedelta(seconds=min(2 ** attempts, MAX_BACKOFF_SECONDS)),
+            })
+            if attempts >= self.max_attempts:
+                print(f"Outbox event {outbox_event.id} ({outbox_event.topic}) gave up: {error}")
+
+        async with AsyncSessionLocal() as db:
+            if delivered:
+                await db.execute(
+                    delete(OutboxEvent)
+                    .where(OutboxEvent.id.in_(delivered))
+                    .execution_options(synchronize_session=False)
+                )
+            if retries:
+                await db.execute(update(OutboxEvent), retries)
+            await db.commit()
+
+        self.dispatched += len(delivered)
+        self.failed += len(failures)
+        return len(events)
+
+    async def _deliver(self, events: List[OutboxEvent]) -> Dict[int, Exception]:
+        """Deliver a batch; returns {event_id: error} for the events that failed"""
+        failures: Dict[int, Exception] = {}
+        tasks: List[Tuple[int, str, list]] = []
+        pushes: List[Tuple[int, dict]] = []
+
+        # A coalesced notification updated several times in one batch is pushed once, in its latest state
+        latest_push = {}
+        for outbox_event in events:
+            if outbox_event.topic == NOTIFICATION_TOPIC:
+                latest_push[outbox_event.payload["notification"]["id"]] = outbox_event.id
+
+        for outbox_event in events:
+            payload = outbox_event.payload
+            if outbox_event.topic == TASK_TOPIC:
+                tasks.append((outbox_event.id, payload["task"], payload.get("args", [])))
+            elif outbox_event.topic == NOTIFICATION_TOPIC:
+                if latest_push[payload["notification"]["id"]] != outbox_event.id:
+                    continue  # superseded later in this batch
+                pushes.append((outbox_event.id, payload))
+            else:
+                failures[outbox_event.id] = ValueError(f"Unknown outbox topic: {outbox_event.topic}")
+
+        if pushes:
+            # Concurrently, so they share pub/sub batches; each returns once
+            # its batch is published, or raises and is retried
+            results = await asyncio.gather(
+                *(_push(payload) for _, payload in pushes), return_exceptions=True
+            )
+            for (event_id, _), result in zip(pushes, results):
+                if isinstance(result, Exception):
+                    failures[event_id] = result
+
+        if tasks:
+            # Published off the event loop in batches; a rejected or failed
+            # publish leaves the event for a later retry
+            futures = [await task_queue.submit(task_name, args) for _, task_name, args in tasks]
+            results = await asyncio.gather(*futures, return_exceptions=True)
+            for (event_id, _, _), result in zip(tasks, results):
+                if isinstance(result, Exception):
+                    failures[event_id] = result
+
+        return failures
+
+    def stats(self) -> dict:
+        """Delivery counters for this process"""
+        return {
+            "running": self._task is not None,
+            "dispatched": self.dispatched,
+            "failed": self.failed,
+        }
+
+
+async def _push(payload: dict):
+    from app.core.websocket_manager import manager
+    await manager.send_notification(
+        notification=payload["notification"],
+        user_id=payload["user_id"]
+    )
+
+
+# Global dispatcher instance
+outbox_dispatcher = OutboxDispatcher(
+    batch_size=settings.OUTBOX_BATCH_SIZE,
+    poll_interval=settings.OUTBOX_POLL_INTERVAL,
+    max_attempts=settings.OUTBOX_MAX_ATTEMPTS,
+    lease_seconds=settings.OUTBOX_LEASE_SECONDS
+)
@@ -0,0 +1,122 @@
+# app/core/pagination.py
+import base64
+import hashlib
+import hmac
+import json
+from datetime import datetime
+from typing import Any, Optional, Sequence, Tuple
+
+from fastapi import Query, Request, Response
+
+from app.core.config import settings
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Query parameters that move through a list rather than define it
+PAGING_PARAMS = {"cursor", "skip", "limit"}
+
+
+class InvalidCursorError(ValueError):
+    """Malformed, tampered with, or issued for a different list (mapped to 400)"""
+
+
+def _sign(payload: bytes) -> str:
+    digest = hmac.new(settings.SECRET_KEY.encode(), payload, hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest[:16]).decode().rstrip("=")
+
+
+def request_scope(request: Request) -> str:
+    """Fingerprint of an endpoint and its filters, so a cursor only pages the list it came from"""
+    params = sorted(
+        (key, value) for key, value in request.query_params.multi_items()
+        if key not in PAGING_PARAMS
+    )
+    raw = json.dumps([request.url.path, params], separators=(",", ":"))
+    return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+
+def encode_cursor(sort_value: datetime, row_id: int, scope: Optional[str] = None) -> str:
+    """
+    Build an opaque, signed keyset cursor from the last row of a page
+
+    Args:
+        sort_value: Timestamp the list is ordered by (created_at, applied_at)
+        row_id: Primary key of the row, used as tie-breaker
+        scope: request_scope() of the list, checked when the cursor comes back
+
+    Returns:
+        Cursor string safe to put in a query parameter
+    """
+    payload = json.dumps(
+        {"v": sort_value.isoformat(), "id": row_id, "s": scope},
+        separators=(",", ":")
+    ).encode()
+    body = base64.urlsafe_b64encode(payload).decode().rstrip("=")
+    return f"{body}.{_sign(payload)}"
+
+
+def decode_cursor(cursor: str, scope: Optional[str] = None) -> Tuple[datetime, int]:
+    """
+    Verify and decode a keyset cursor
+
+    Args:
+        cursor: Cursor from X-Next-Cursor
+        scope: If given, the cursor must have been issued for this scope
+
+    Returns:
+        (sort_value, row_id) of the last row on the previous page
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed, was tampered with,
+            or belongs to another endpoint or filter set
+    """
+    try:
+        body, signature = cursor.split(".", 1)
+        payload = base64.urlsafe_b64decode(body + "=" * (-len(body) % 4))
+        if not hmac.compare_digest(signature, _sign(payload)):
+            raise ValueError("bad signature")
+        data = json.loads(payload)
+        if scope is not None and data.get("s") != scope:
+            raise ValueError("cursor issued for another list")
+        return datetime.fromisoformat(data["v"]), int(data["id"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError(f"Invalid pagination cursor: {e}")
+
+
+def page_cursor(
+    request: Request,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page")
+) -> Optional[str]:
+    """Cursor query parameter, rejected if it came from another endpoint or filter set"""
+    if cursor is not None:
+        decode_cursor(cursor, scope=request_scope(request))
+    return cursor
+
+
+def get_next_cursor(
+    items: Sequence[Any],
+    limit: int,
+    sort_attr: str = "created_at",
+    scope: Optional[str] = None
+) -> Optional[str]:
+    """Cursor for the page after `items`, or None if this was the last page"""
+    if len(items) < limit or not items:
+        return None
+    last = items[-1]
+    sort_value = getattr(last, sort_attr)
+    if sort_value is None:
+        return None
+    return encode_cursor(sort_value, last.id, scope)
+
+
+def set_next_cursor(
+    request: Request,
+    response: Response,
+    items: Sequence[Any],
+    limit: int,
+    sort_attr: str = "created_at"
+) -> None:
+    """Expose the next page cursor in the X-Next-Cursor response header"""
+    cursor = get_next_cursor(items, limit, sort_attr, scope=request_scope(request))
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
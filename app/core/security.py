@@ -17,12 +17,21 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
-def create_access_token(subject: str, expires_minutes: Optional[int] = None) -> str:
+def create_access_token(
+    subject: str,
+    expires_minutes: Optional[int] = None,
+    claims: Optional[dict] = None
+) -> str:
+    """
+    Create an access JWT token.
+    Extra `claims` (is_employer, is_active, profile_id, tv) let request
+    dependencies authenticate without reading the users table.
+    """
     # Use timezone-aware datetime
     expire = datetime.now(timezone.utc) + timedelta(
         minutes=(expires_minutes if expires_minutes is not None else settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     )
-    to_encode = {"exp": expire, "sub": str(subject)}
+    to_encode = {**(claims or {}), "exp": expire, "sub": str(subject)}
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
@@ -37,7 +46,11 @@ def decode_access_token(token: str) -> Optional[dict]:
     except JWTError:
         return None
     
-def create_refresh_token(subject: str, expires_days: Optional[int] = None) -> str:
+def create_refresh_token(
+    subject: str,
+    expires_days: Optional[int] = None,
+    token_version: Optional[int] = None
+) -> str:
     """
     Create a refresh JWT token.
     """
@@ -45,6 +58,8 @@ def create_refresh_token(subject: str, expires_days: Optional[int] = None) -> st
         days=(expires_days if expires_days is not None else settings.REFRESH_TOKEN_EXPIRE_DAYS)
     )
     to_encode = {"exp": expire, "sub": str(subject)}
+    if token_version is not None:
+        to_encode["tv"] = token_version
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
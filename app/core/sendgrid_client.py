@@ -0,0 +1,106 @@
+# app/core/sendgrid_client.py
+"""
+Pooled SendGrid v3 client
+
+One urllib3 PoolManager per worker process keeps TLS connections to the
+SendGrid API open between sends, instead of building a SendGridAPIClient
+(and doing a handshake) for every message.
+
+A /mail/send request can carry up to PERSONALIZATIONS_PER_REQUEST
+recipients that share one body; each personalization has its own subject
+and substitutions, which SendGrid replaces in the body per recipient.
+"""
+import json
+import os
+from typing import List, Optional
+
+import urllib3
+
+from app.core.config import settings
+
+PERSONALIZATIONS_PER_REQUEST = 1000  # SendGrid's limit per /mail/send request
+
+
+class SendGridError(Exception):
+    """Non-2xx response (status 0: the request never got a response)"""
+
+    def __init__(self, status: int, body: str):
+        super().__init__(f"SendGrid returned {status}: {body[:500]}")
+        self.status = status
+        self.body = body
+
+    @property
+    def retryable(self) -> bool:
+        return self.status == 0 or self.status == 429 or self.status >= 500
+
+
+class SendGridClient:
+    def __init__(self, api_key: str, base_url: str, pool_size: int, timeout: float):
+        self.url = base_url.rstrip("/") + "/v3/mail/send"
+        self.http = urllib3.PoolManager(
+            maxsize=pool_size,
+            retries=False,  # callers decide what to retry
+            timeout=urllib3.Timeout(connect=timeout, read=timeout),
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json",
+            },
+        )
+
+    def send(self, payload: dict) -> int:
+        """POST one /mail/send payload; returns the status or raises SendGridError"""
+        try:
+            response = self.http.request("POST", self.url, body=json.dumps(payload).encode())
+        except urllib3.exceptions.HTTPError as e:
+            raise SendGridError(0, str(e))
+        if response.status >= 300:
+            raise SendGridError(response.status, response.data.decode(errors="replace"))
+        return response.status
+
+
+_client: Optional[SendGridClient] = None
+_client_pid: Optional[int] = None
+
+
+def get_sendgrid_client() -> SendGridClient:
+    """The process's client (rebuilt after a fork, so prefork children don't share sockets)"""
+    global _client, _client_pid
+    if _client is None or _client_pid != os.getpid():
+        _client = SendGridClient(
+            settings.SENDGRID_API_KEY or "",
+            settings.SENDGRID_API_URL,
+            settings.SENDGRID_POOL_SIZE,
+            settings.SENDGRID_TIMEOUT,
+        )
+        _client_pid = os.getpid()
+    return _client
+
+
+def sender(from_email: Optional[str] = None, from_name: Optional[str] = None) -> dict:
+    sender = {"email": from_email or settings.SENDGRID_FROM_EMAIL}
+    name = from_name or settings.SENDGRID_FROM_NAME
+    if name:
+        sender["name"] = name
+    return sender
+
+
+def personalization(to_email: str, subject: str, substitutions: Optional[dict] = None) -> dict:
+    entry = {"to": [{"email": to_email}], "subject": subject}
+    if substitutions:
+        entry["substitutions"] = substitutions
+    return entry
+
+
+def mail_payload(
+    html_content: str,
+    personalizations: List[dict],
+    from_email: Optional[str] = None,
+    from_name: Optional[str] = None
+) -> dict:
+    """One /mail/send body: a shared HTML body for every personalization"""
+    return {
+        "from": sender(from_email, from_name),
+        "subject": personalizations[0]["subject"],
+        "personalizations": personalizations,
+        "content": [{"type": "text/html", "value": html_content}],
+    }
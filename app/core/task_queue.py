@@ -0,0 +1,170 @@
+# app/core/task_queue.py
+"""
+Async Celery enqueue facade
+
+Kombu publishing is blocking, so the web process never publishes on the
+event loop. Request handlers write tasks to the outbox; the outbox
+dispatcher submits them to a bounded in-process queue and awaits each
+publish, and one background task drains the queue, publishing each batch in
+a worker thread over one pooled producer connection.
+
+TASK_QUEUE_OVERFLOW decides what happens when the queue is full:
+    "block"  - the caller waits for room (backpressure)
+    "drop"   - the task is rejected with TaskQueueFull
+    "inline" - the task is published straight away in a thread
+"""
+import asyncio
+import time
+from typing import List, Optional, Tuple
+
+from app.core.config import settings
+
+
+class TaskQueueFull(Exception):
+    """The queue was full and TASK_QUEUE_OVERFLOW is "drop" """
+
+
+class TaskQueue:
+    """Bounded queue of Celery tasks, published in batches by a background task"""
+
+    def __init__(self, max_size: int, batch_size: int, overflow: str):
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.overflow = overflow
+        self._queue: Optional[asyncio.Queue] = None
+        self._task = None
+        # Metrics
+        self.submitted = 0
+        self.published = 0
+        self.failed = 0
+        self.dropped = 0
+        self.max_depth = 0
+        self.max_enqueue_wait = 0.0
+        self._latency_total = 0.0
+        self.max_latency = 0.0
+
+    def start(self):
+        """Start the publisher on the running event loop"""
+        if self._task is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the publisher and publish whatever is still queued"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        batch = []
+        while not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        if batch:
+            await self._publish(batch)
+
+    async def submit(self, task_name: str, args: list) -> asyncio.Future:
+        """
+        Queue a task; the returned future resolves once it is published
+        (or holds the publish error).
+        """
+        future = asyncio.get_running_loop().create_future()
+        item = (task_name, args, future, time.monotonic())
+        self.submitted += 1
+
+        if self._task is None:
+            # Not started (scripts, tests): publish directly, still off the loop
+            await self._publish([item])
+            return future
+
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            if self.overflow == "drop":
+                self.dropped += 1
+                future.set_exception(TaskQueueFull(f"Task queue full, dropped {task_name}"))
+                return future
+            if self.overflow == "inline":
+                await self._publish([item])
+                return future
+            await self._queue.put(item)
+            self.max_enqueue_wait = max(self.max_enqueue_wait, time.monotonic() - item[3])
+
+        self.max_depth = max(self.max_depth, self._queue.qsize())
+        return future
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            await self._publish(batch)
+
+    async def _publish(self, batch: list):
+        try:
+            errors = await asyncio.to_thread(_publish_batch, [(name, args) for name, args, _, _ in batch])
+        except Exception as e:
+            # Broker unreachable: the whole batch fails
+            errors = [e] * len(batch)
+
+        now = time.monotonic()
+        for (_, _, future, queued_at), error in zip(batch, errors):
+            latency = now - queued_at
+            self._latency_total += latency
+            self.max_latency = max(self.max_latency, latency)
+            if error is None:
+                self.published += 1
+            else:
+                self.failed += 1
+            if future.done():
+                continue
+            if error is None:
+                future.set_result(None)
+            else:
+                future.set_exception(error)
+
+    def stats(self) -> dict:
+        """Queue depth and enqueue-to-publish latency for this process"""
+        completed = self.published + self.failed
+        return {
+            "running": self._task is not None,
+            "depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_depth": self.max_depth,
+            "submitted": self.submitted,
+            "published": self.published,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "max_enqueue_wait_ms": round(self.max_enqueue_wait * 1000, 2),
+            "avg_latency_ms": round(self._latency_total / completed * 1000, 2) if completed else 0.0,
+            "max_latency_ms": round(self.max_latency * 1000, 2),
+        }
+
+
+def _publish_batch(tasks: List[Tuple[str, list]]) -> List[Optional[Exception]]:
+    """Publish Celery tasks over one pooled producer connection; one error (or None) per task"""
+    from app.core.celery_config import celery_app
+
+    errors: List[Optional[Exception]] = []
+    with celery_app.producer_or_acquire() as producer:
+        for task_name, args in tasks:
+            try:
+                celery_app.send_task(task_name, args=args, producer=producer)
+                errors.append(None)
+            except Exception as e:
+                errors.append(e)
+    return errors
+
+
+# Global task queue instance
+task_queue = TaskQueue(
+    max_size=settings.TASK_QUEUE_SIZE,
+    batch_size=settings.TASK_QUEUE_BATCH,
+    overflow=settings.TASK_QUEUE_OVERFLOW
+)
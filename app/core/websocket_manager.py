@@ -1,53 +1,234 @@
 # app/core/websocket_manager.py
-from typing import Dict, List
-from fastapi import WebSocket
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+from fastapi import WebSocket, status
+import asyncio
+import contextlib
 import json
 from datetime import datetime
 
+from app.core.config import settings
+from app.core.websocket_pubsub import create_pubsub_backend
+
+
+class ClientConnection:
+    """
+    One WebSocket with a bounded send queue drained by its own writer task,
+    so a slow client only ever delays itself.
+    """
+
+    def __init__(self, websocket: WebSocket, user_id: int, max_queue: int):
+        self.websocket = websocket
+        self.key = websocket
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.writer: Optional[asyncio.Task] = None
+        self.closing = False
+
+    def start(self, on_failure):
+        """Start the writer task; on_failure(connection) runs if a send fails"""
+        self.writer = asyncio.create_task(self._write(on_failure))
+
+    def offer(self, text: str, event_id: Optional[int] = None, event_type: Optional[str] = None) -> bool:
+        """Queue a serialized message without waiting; False if the queue is full"""
+        try:
+            self.queue.put_nowait(text)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    async def send_json(self, message: dict):
+        """Queue a reply to this client, waiting for room in its queue"""
+        await self.queue.put(json.dumps(message))
+
+    async def _write(self, on_failure):
+        while True:
+            text = await self.queue.get()
+            try:
+                await self.websocket.send_text(text)
+            except Exception as e:
+                print(f"Error sending to user {self.user_id}: {e}")
+                await on_failure(self)
+                return
+
+    def stop(self):
+        """Cancel the writer task"""
+        if self.writer is not None and self.writer is not asyncio.current_task():
+            self.writer.cancel()
+        self.writer = None
+
+    async def close(self):
+        """Close the socket as a slow consumer"""
+        await self.websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+
+
+class StreamConnection:
+    """
+    One Server-Sent Events stream. The response generator drains the queue
+    itself, so there is no writer task per connection.
+    """
+
+    def __init__(self, user_id: int, max_queue: int):
+        self.key = self
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.closing = False
+
+    def offer(self, text: str, event_id: Optional[int] = None, event_type: Optional[str] = None) -> bool:
+        """Queue an SSE frame without waiting; False if the queue is full"""
+        try:
+            self.queue.put_nowait(sse_frame(text, event_id, event_type))
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def stop(self):
+        pass
+
+    async def close(self):
+        """The generator stops once it sees `closing`"""
+        self.closing = True
+
+
+def sse_frame(data: str, event_id: Optional[int] = None, event_type: Optional[str] = None) -> str:
+    """Format one Server-Sent Events frame"""
+    frame = ""
+    if event_id is not None:
+        frame += f"id: {event_id}\n"
+    if event_type:
+        frame += f"event: {event_type}\n"
+    return frame + f"data: {data}\n\n"
+
+
 class ConnectionManager:
-    """Manages WebSocket connections for real-time notifications"""
-    
+    """
+    Manages WebSocket connections for real-time notifications.
+    Notifications go through a pub/sub backend so they reach the user's
+    sockets on whichever worker holds them.
+
+    Messages are serialized once per fan-out and handed to each
+    connection's send queue without waiting. A connection whose queue is
+    full is a slow consumer: depending on WEBSOCKET_SLOW_CONSUMER the
+    message is dropped for it or the socket is closed.
+    """
+
     def __init__(self):
-        # Store active connections: {user_id: [websockets]}
-        self.active_connections: Dict[int, List[WebSocket]] = {}
-    
-    async def connect(self, websocket: WebSocket, user_id: int):
-        """Connect a user's WebSocket"""
+        # Store active connections: {user_id: {websocket or stream: connection}}
+        self.active_connections: Dict[int, Dict[Any, Any]] = {}
+        self.backend = create_pubsub_backend(self.send_personal_message)
+        self.dropped_messages = 0
+        self.slow_consumers_closed = 0
+        # Running slow-consumer closes; the loop only keeps weak references to tasks
+        self._closing_tasks: Set[asyncio.Task] = set()
+        # {user_id: (lock, holders)}: serializes watch/unwatch per user
+        self._user_locks: Dict[int, Tuple[asyncio.Lock, int]] = {}
+
+    async def connect(self, websocket: WebSocket, user_id: int) -> ClientConnection:
+        """Connect a user's WebSocket; replies should go through the returned connection"""
         await websocket.accept()
-        
-        if user_id not in self.active_connections:
-            self.active_connections[user_id] = []
-        
-        self.active_connections[user_id].append(websocket)
-        print(f"User {user_id} connected. Total connections: {len(self.active_connections[user_id])}")
-    
-    def disconnect(self, websocket: WebSocket, user_id: int):
-        """Disconnect a user's WebSocket"""
-        if user_id in self.active_connections:
-            if websocket in self.active_connections[user_id]:
-                self.active_connections[user_id].remove(websocket)
-            
+
+        connection = ClientConnection(websocket, user_id, settings.WEBSOCKET_SEND_QUEUE_SIZE)
+        connection.start(self._on_send_failure)
+        await self._register(connection)
+        return connection
+
+    async def connect_stream(self, user_id: int) -> StreamConnection:
+        """Register a Server-Sent Events stream on the same delivery path as WebSockets"""
+        connection = StreamConnection(user_id, settings.WEBSOCKET_SEND_QUEUE_SIZE)
+        await self._register(connection)
+        return connection
+
+    @contextlib.asynccontextmanager
+    async def _user_lock(self, user_id: int):
+        """
+        Hold the user's lock across a connection change and its watch/unwatch,
+        so a connect racing the last disconnect cannot end up unsubscribed.
+        The lock is dropped with its last holder.
+        """
+        lock, holders = self._user_locks.get(user_id, (None, 0))
+        if lock is None:
+            lock = asyncio.Lock()
+        self._user_locks[user_id] = (lock, holders + 1)
+        try:
+            async with lock:
+                yield
+        finally:
+            lock, holders = self._user_locks[user_id]
+            if holders == 1:
+                del self._user_locks[user_id]
+            else:
+                self._user_locks[user_id] = (lock, holders - 1)
+
+    async def _register(self, connection):
+        user_id = connection.user_id
+        async with self._user_lock(user_id):
+            if user_id not in self.active_connections:
+                self.active_connections[user_id] = {}
+                # First local connection for this user: listen on their channel
+                await self.backend.watch_user(user_id)
+
+            self.active_connections[user_id][connection.key] = connection
+            print(f"User {user_id} connected. Total connections: {len(self.active_connections[user_id])}")
+
+    async def disconnect(self, key, user_id: int):
+        """Disconnect a user's WebSocket (or SSE stream)"""
+        async with self._user_lock(user_id):
+            connections = self.active_connections.get(user_id)
+            if connections is None:
+                return
+
+            connection = connections.pop(key, None)
+            if connection is None:
+                return
+            connection.stop()
+
             # Remove user if no connections left
-            if not self.active_connections[user_id]:
+            if not connections:
                 del self.active_connections[user_id]
-        
+                await self.backend.unwatch_user(user_id)
+
         print(f"User {user_id} disconnected")
-    
+
+    async def _on_send_failure(self, connection: ClientConnection):
+        await self.disconnect(connection.key, connection.user_id)
+
+    async def _close_slow_consumer(self, connection):
+        try:
+            await connection.close()
+        except Exception:
+            pass
+        await self.disconnect(connection.key, connection.user_id)
+
+    def _fan_out(
+        self,
+        text: str,
+        connections: Iterable,
+        event_id: Optional[int] = None,
+        event_type: Optional[str] = None
+    ):
+        """Hand one serialized message to many connections without awaiting any of them"""
+        for connection in list(connections):
+            if connection.closing or connection.offer(text, event_id, event_type):
+                continue
+            if settings.WEBSOCKET_SLOW_CONSUMER == "disconnect":
+                print(f"Closing slow WebSocket consumer for user {connection.user_id}")
+                connection.closing = True
+                self.slow_consumers_closed += 1
+                task = asyncio.create_task(self._close_slow_consumer(connection))
+                self._closing_tasks.add(task)
+                task.add_done_callback(self._closing_tasks.discard)
+            else:
+                self.dropped_messages += 1
+
     async def send_personal_message(self, message: dict, user_id: int):
-        """Send a message to a specific user across all their connections"""
-        if user_id in self.active_connections:
-            disconnected = []
-            for websocket in self.active_connections[user_id]:
-                try:
-                    await websocket.send_json(message)
-                except Exception as e:
-                    print(f"Error sending to user {user_id}: {e}")
-                    disconnected.append(websocket)
-            
-            # Clean up disconnected websockets
-            for ws in disconnected:
-                self.disconnect(ws, user_id)
-    
+        """Send a message to a specific user across all their connections on this worker"""
+        connections = self.active_connections.get(user_id)
+        if connections:
+            event_type = message.get("type")
+            # A notification's version is its SSE event id: a coalesced update
+            # keeps the notification id but is a new event
+            event_id = message["data"]["version"] if event_type == "notification" else None
+            self._fan_out(json.dumps(message), connections.values(), event_id, event_type)
+
     async def send_notification(self, notification: dict, user_id: int):
         """Send a notification to a user"""
         notification_message = {
@@ -55,21 +236,39 @@ class ConnectionManager:
             "data": notification,
             "timestamp": datetime.utcnow().isoformat()
         }
-        await self.send_personal_message(notification_message, user_id)
-    
+        await self.publish(notification_message, user_id)
+
+    async def publish(self, message: dict, user_id: int):
+        """Send a message to a user on every worker holding one of their sockets"""
+        await self.backend.publish(message, user_id)
+
     async def broadcast_to_all(self, message: dict):
-        """Broadcast a message to all connected users"""
-        for user_id in list(self.active_connections.keys()):
-            await self.send_personal_message(message, user_id)
-    
+        """Broadcast a message to all users connected to this worker"""
+        text = json.dumps(message)
+        for connections in list(self.active_connections.values()):
+            self._fan_out(text, connections.values(), event_type=message.get("type"))
+
     def is_user_online(self, user_id: int) -> bool:
         """Check if a user is online"""
         return user_id in self.active_connections and len(self.active_connections[user_id]) > 0
-    
+
     def get_online_user_count(self) -> int:
         """Get total number of online users"""
         return len(self.active_connections)
 
+    def stats(self) -> dict:
+        """Delivery counters for this worker"""
+        return {
+            "dropped_messages": self.dropped_messages,
+            "slow_consumers_closed": self.slow_consumers_closed,
+        }
+
+    async def close(self):
+        """Finish closing slow consumers, flush pending publishes and stop listening"""
+        if self._closing_tasks:
+            await asyncio.gather(*self._closing_tasks, return_exceptions=True)
+        await self.backend.close()
+
 
 # Global connection manager instance
-manager = ConnectionManager()
\ No newline at end of file
+manager = ConnectionManager()
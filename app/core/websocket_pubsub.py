@@ -0,0 +1,262 @@
+# app/core/websocket_pubsub.py
+"""
+Pub/sub backends for WebSocket fan-out
+
+A message for a user is published to the user's shard channel
+(user_id % WEBSOCKET_SHARDS). Each worker subscribes only to the shards of
+the users whose sockets it holds, and delivers what it receives to its own
+connections.
+
+WEBSOCKET_BACKEND selects the backend:
+    "local" - in-process delivery, for single-process runs (default)
+    "redis" - Redis pub/sub across workers and instances
+              (WEBSOCKET_REDIS_URL, falls back to REDIS_URL)
+"""
+import asyncio
+import contextlib
+import json
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+
+CHANNEL_PREFIX = "jobden:ws:"
+
+# deliver(message, user_id) hands a message to this worker's local sockets
+DeliverCallback = Callable[[dict, int], Awaitable[None]]
+
+
+def shard_for_user(user_id: int, shards: int) -> int:
+    """Shard number of a user's channel"""
+    return user_id % shards
+
+
+class LocalPubSubBackend:
+    """Single-process backend: publishing is local delivery"""
+
+    def __init__(self, deliver: DeliverCallback):
+        self.deliver = deliver
+
+    async def publish(self, message: dict, user_id: int):
+        await self.deliver(message, user_id)
+
+    async def watch_user(self, user_id: int):
+        pass
+
+    async def unwatch_user(self, user_id: int):
+        pass
+
+    async def close(self):
+        pass
+
+    def stats(self) -> dict:
+        return {"backend": "local"}
+
+
+class RedisPubSubBackend:
+    """
+    Redis backend with sharded channels and batched publishes.
+
+    Publishes are buffered per shard for up to `flush_interval` seconds (or
+    `max_batch` messages) and sent as one JSON array per channel in a single
+    pipeline, so a burst of notifications costs one round trip. publish()
+    waits for its batch, so a failed pipeline reaches every publisher in it.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        deliver: DeliverCallback,
+        shards: int,
+        flush_interval: float,
+        max_batch: int
+    ):
+        if url.startswith("rediss://"):
+            self.client = aioredis.from_url(url, decode_responses=True, ssl_cert_reqs=None)
+        else:
+            self.client = aioredis.from_url(url, decode_responses=True)
+        self.deliver = deliver
+        self.shards = shards
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+
+        # {shard: [(user_id, message)]} waiting to be published
+        self._pending: Dict[int, List[Tuple[int, dict]]] = {}
+        self._pending_count = 0
+        # Resolved (or failed) when the buffered messages are published
+        self._batch: Optional[asyncio.Future] = None
+        self._flush_task: Optional[asyncio.Task] = None
+
+        # {shard: local users watching it}
+        self._watchers: Dict[int, int] = {}
+        self._pubsub = None
+        self._listener: Optional[asyncio.Task] = None
+        self._subscribe_lock = asyncio.Lock()
+
+        self.published = 0
+        self.received = 0
+        self.errors = 0
+
+    def channel(self, shard: int) -> str:
+        return f"{CHANNEL_PREFIX}{shard}"
+
+    # Publishing
+
+    async def publish(self, message: dict, user_id: int):
+        """Buffer a message; returns once its batch is published, raises if that failed"""
+        shard = shard_for_user(user_id, self.shards)
+        if self._batch is None:
+            self._batch = asyncio.get_running_loop().create_future()
+        batch = self._batch
+        self._pending.setdefault(shard, []).append((user_id, message))
+        self._pending_count += 1
+
+        if self._pending_count >= self.max_batch:
+            with contextlib.suppress(Exception):
+                await self.flush()  # a failure is raised from the batch below
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+        # Shielded: a cancelled publisher must not cancel the batch for the others
+        await asyncio.shield(batch)
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.flush_interval)
+        self._flush_task = None
+        with contextlib.suppress(Exception):
+            await self.flush()  # the batch's publishers get the error
+
+    async def flush(self):
+        """Publish everything buffered, one message per shard channel; raises if that failed"""
+        if not self._pending:
+            return
+        pending, self._pending, self._pending_count = self._pending, {}, 0
+        batch, self._batch = self._batch, None
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                for shard, items in pending.items():
+                    pipe.publish(self.channel(shard), json.dumps(items, separators=(",", ":")))
+                await pipe.execute()
+        except Exception as e:
+            print(f"WebSocket publish failed: {e}")
+            self.errors += 1
+            batch.set_exception(e)
+            raise
+        self.published += sum(len(items) for items in pending.values())
+        batch.set_result(None)
+
+    # Subscribing
+
+    async def watch_user(self, user_id: int):
+        """Subscribe to the user's shard when the first local socket in it connects"""
+        shard = shard_for_user(user_id, self.shards)
+        async with self._subscribe_lock:
+            self._watchers[shard] = self._watchers.get(shard, 0) + 1
+            if self._watchers[shard] > 1:
+                return
+            try:
+                if self._pubsub is None:
+                    self._pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                await self._pubsub.subscribe(self.channel(shard))
+            except Exception as e:
+                print(f"WebSocket subscribe failed for shard {shard}: {e}")
+                self.errors += 1
+                self._watchers.pop(shard, None)
+                return
+            if self._listener is None:
+                self._listener = asyncio.create_task(self._listen())
+
+    async def unwatch_user(self, user_id: int):
+        """Unsubscribe from the shard once no local user in it is connected"""
+        shard = shard_for_user(user_id, self.shards)
+        async with self._subscribe_lock:
+            remaining = self._watchers.get(shard, 0) - 1
+            if remaining > 0:
+                self._watchers[shard] = remaining
+                return
+            self._watchers.pop(shard, None)
+            if self._pubsub is not None:
+                try:
+                    await self._pubsub.unsubscribe(self.channel(shard))
+                except Exception as e:
+                    print(f"WebSocket unsubscribe failed for shard {shard}: {e}")
+                    self.errors += 1
+
+    async def _listen(self):
+        while True:
+            try:
+                message = await self._pubsub.get_message(timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"WebSocket subscription error: {e}")
+                self.errors += 1
+                await asyncio.sleep(1.0)
+                continue
+            if message is None or message.get("type") != "message":
+                continue
+
+            try:
+                batch = json.loads(message["data"])
+            except Exception as e:
+                print(f"WebSocket message could not be decoded: {e}")
+                self.errors += 1
+                continue
+            for user_id, payload in batch:
+                self.received += 1
+                try:
+                    await self.deliver(payload, user_id)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    # One bad message must not stop delivery for the whole shard
+                    print(f"WebSocket delivery failed for user {user_id}: {e}")
+                    self.errors += 1
+
+    async def close(self):
+        """Flush pending publishes and drop the subscription"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        with contextlib.suppress(Exception):
+            await self.flush()  # already reported to the publishers
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+        self._watchers.clear()
+        await self.client.aclose()
+
+    def stats(self) -> dict:
+        return {
+            "backend": "redis",
+            "shards": self.shards,
+            "subscribed_shards": len(self._watchers),
+            "published": self.published,
+            "received": self.received,
+            "errors": self.errors,
+        }
+
+
+def create_pubsub_backend(deliver: DeliverCallback):
+    """Backend selected by WEBSOCKET_BACKEND"""
+    if settings.WEBSOCKET_BACKEND == "local":
+        return LocalPubSubBackend(deliver)
+    if settings.WEBSOCKET_BACKEND == "redis":
+        url = settings.WEBSOCKET_REDIS_URL or settings.REDIS_URL
+        if not url:
+            url = f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}/0"
+        return RedisPubSubBackend(
+            url,
+            deliver,
+            shards=settings.WEBSOCKET_SHARDS,
+            flush_interval=settings.WEBSOCKET_PUBLISH_INTERVAL,
+            max_batch=settings.WEBSOCKET_PUBLISH_BATCH
+        )
+    raise ValueError(f"Unknown WEBSOCKET_BACKEND: {settings.WEBSOCKET_BACKEND}")
@@ -2,7 +2,7 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import NullPool, AsyncAdaptedQueuePool
 from app.core.config import settings
 import ssl
 import uuid
@@ -10,11 +10,17 @@ import uuid
 DATABASE_URL = settings.DATABASE_URL
 
 # Fix Protocol
-if DATABASE_URL:
-    if DATABASE_URL.startswith("postgres://"):
-        DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql+asyncpg://", 1)
-    elif DATABASE_URL.startswith("postgresql://"):
-        DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://")
+def normalize_database_url(url: str) -> str:
+    """Force the asyncpg driver on plain postgres URLs"""
+    if url:
+        if url.startswith("postgres://"):
+            url = url.replace("postgres://", "postgresql+asyncpg://", 1)
+        elif url.startswith("postgresql://"):
+            url = url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
+
+
+DATABASE_URL = normalize_database_url(DATABASE_URL)
 
 
 # Handle SSL
@@ -25,25 +31,85 @@ ssl_context.verify_mode = ssl.CERT_NONE
 # print(f"FINAL DATABASE URL: {DATABASE_URL}")
 # Create Engine
 
-engine = create_async_engine(
-    DATABASE_URL,
-    future=True,
-    poolclass=NullPool,
-    echo=False,
-    connect_args={
-        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
-        "statement_cache_size": 0, # This is the only place you need it
-        "prepared_statement_cache_size": 0,
-        "ssl": ssl_context,
-    }
-)
+def create_db_engine(url: str):
+    """
+    Create an async engine for the configured DB_CONNECTION_MODE.
+
+    "transaction_pooler": pgBouncer/Supavisor hands a different backend to
+    every transaction, so we keep no client-side pool and disable prepared
+    statements (named statements would collide across backends).
+
+    "direct": we own the connections, so keep a real pool and let asyncpg
+    cache prepared statements per connection.
+    """
+    if settings.DB_CONNECTION_MODE == "direct":
+        return create_async_engine(
+            url,
+            future=True,
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+            echo=False,
+            connect_args={
+                "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+                "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+                "ssl": ssl_context,
+            }
+        )
+
+    if settings.DB_CONNECTION_MODE != "transaction_pooler":
+        raise ValueError(f"Unknown DB_CONNECTION_MODE: {settings.DB_CONNECTION_MODE}")
+
+    return create_async_engine(
+        url,
+        future=True,
+        poolclass=NullPool,
+        echo=False,
+        connect_args={
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+            "statement_cache_size": 0, # This is the only place you need it
+            "prepared_statement_cache_size": 0,
+            "ssl": ssl_context,
+        }
+    )
+
+
+engine = create_db_engine(DATABASE_URL)
 
 AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 Base = declarative_base()
 
+
+def get_sync_database_url() -> str:
+    """Same database through psycopg, for scripts and Celery tasks"""
+    return DATABASE_URL.replace("postgresql+asyncpg://", "postgresql+psycopg://", 1)
+
+
+_sync_engine = None
+
+
+def get_sync_engine():
+    """Lazily create a synchronous engine (never used by request handlers)"""
+    global _sync_engine
+    if _sync_engine is None:
+        connect_args = {}
+        if settings.DB_CONNECTION_MODE == "transaction_pooler":
+            # psycopg auto-prepares repeated statements; poolers can't route them
+            connect_args["prepare_threshold"] = None
+        _sync_engine = create_engine(
+            get_sync_database_url(),
+            pool_pre_ping=True,
+            connect_args=connect_args
+        )
+    return _sync_engine
+
+
 async def get_db():
     async with AsyncSessionLocal() as session:
         try:
             yield session
         finally:
-            await session.close()
\ No newline at end of file
+            await session.close()
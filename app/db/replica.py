@@ -0,0 +1,180 @@
+# app/db/replica.py
+"""
+Read-replica routing for read-only endpoints
+
+Reads go to DATABASE_REPLICA_URL when it is configured, healthy and not
+lagging. Everything else (and every write) stays on the primary.
+
+- Lag is probed on the replica at most every REPLICA_LAG_CHECK_INTERVAL
+  seconds and reported by /health.
+- After a user's own write they are pinned to the primary for
+  READ_YOUR_WRITES_SECONDS so they always see what they just changed.
+  The pin travels in a short-lived cookie, so it holds on whichever worker
+  serves the next request; clients without a cookie jar fall back to a
+  per-process map.
+"""
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.security import decode_access_token
+from app.db.database import AsyncSessionLocal, create_db_engine, normalize_database_url
+
+replica_engine = (
+    create_db_engine(normalize_database_url(settings.DATABASE_REPLICA_URL))
+    if settings.DATABASE_REPLICA_URL else None
+)
+ReplicaSessionLocal = (
+    sessionmaker(replica_engine, class_=AsyncSession, expire_on_commit=False)
+    if replica_engine is not None else None
+)
+
+logger = logging.getLogger(__name__)
+
+# Cookie carrying the wall-clock deadline of a user's read-your-writes window
+PRIMARY_PIN_COOKIE = "primary_pin"
+
+# Zero when the replica has replayed everything it received, otherwise the
+# age of the last replayed transaction.
+REPLICA_LAG_SQL = text("""
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+class ReplicaRouter:
+    """Decides whether a read can be served by the replica"""
+
+    def __init__(self):
+        # {user_id: monotonic deadline until which reads go to primary}
+        self.sticky_users: Dict[int, float] = {}
+        self.lag_seconds: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._checked_at = 0.0
+        self._next_prune = 0.0
+        self._lock = asyncio.Lock()
+
+    def mark_write(self, user_id: int):
+        """Pin a user to the primary after they wrote something"""
+        now = time.monotonic()
+        self.sticky_users[user_id] = now + settings.READ_YOUR_WRITES_SECONDS
+        if now >= self._next_prune:
+            # Write-once users never read again to expire their own entry
+            self.sticky_users = {
+                uid: deadline for uid, deadline in self.sticky_users.items() if deadline >= now
+            }
+            self._next_prune = now + settings.READ_YOUR_WRITES_SECONDS
+
+    def is_sticky(self, user_id: int) -> bool:
+        """Check if a user is still inside their read-your-writes window"""
+        deadline = self.sticky_users.get(user_id)
+        if deadline is None:
+            return False
+        if deadline < time.monotonic():
+            self.sticky_users.pop(user_id, None)
+            return False
+        return True
+
+    async def refresh_lag(self):
+        """Probe replica lag if the last probe is stale"""
+        if replica_engine is None:
+            return
+        if time.monotonic() - self._checked_at < settings.REPLICA_LAG_CHECK_INTERVAL:
+            return
+
+        async with self._lock:
+            # Another request may have refreshed while we waited
+            if time.monotonic() - self._checked_at < settings.REPLICA_LAG_CHECK_INTERVAL:
+                return
+            try:
+                async with replica_engine.connect() as conn:
+                    result = await conn.execute(REPLICA_LAG_SQL)
+                    self.lag_seconds = float(result.scalar() or 0)
+                    self.last_error = None
+            except Exception as e:
+                logger.warning("Replica lag check failed: %s", e)
+                self.lag_seconds = None
+                self.last_error = str(e)
+            self._checked_at = time.monotonic()
+
+    def is_healthy(self) -> bool:
+        """Replica is reachable and within the lag threshold"""
+        return (
+            self.lag_seconds is not None
+            and self.lag_seconds <= settings.REPLICA_MAX_LAG_SECONDS
+        )
+
+    def status(self) -> dict:
+        """Replica status for health reporting"""
+        return {
+            "configured": replica_engine is not None,
+            "healthy": self.is_healthy(),
+            "lag_seconds": self.lag_seconds,
+            "max_lag_seconds": settings.REPLICA_MAX_LAG_SECONDS,
+            "error": self.last_error,
+        }
+
+
+replica_router = ReplicaRouter()
+
+
+def set_primary_pin(response):
+    """Pin the caller to the primary on any worker for READ_YOUR_WRITES_SECONDS"""
+    response.set_cookie(
+        PRIMARY_PIN_COOKIE,
+        str(time.time() + settings.READ_YOUR_WRITES_SECONDS),
+        max_age=max(int(settings.READ_YOUR_WRITES_SECONDS), 1),
+        httponly=True,
+        samesite="lax"
+    )
+
+
+def has_primary_pin(request: Request) -> bool:
+    """The request carries an unexpired read-your-writes cookie"""
+    try:
+        return float(request.cookies.get(PRIMARY_PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def get_user_id_from_request(request: Request) -> Optional[int]:
+    """Read the user id from a bearer token without touching the DB"""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    payload = decode_access_token(token)
+    if not payload:
+        return None
+    try:
+        return int(payload.get("sub"))
+    except (TypeError, ValueError):
+        return None
+
+
+async def get_read_db(request: Request):
+    """
+    Session for read-only endpoints.
+    Uses the replica unless it is missing, lagging, or the caller just wrote.
+    """
+    session_factory = AsyncSessionLocal
+
+    if ReplicaSessionLocal is not None and not has_primary_pin(request):
+        await replica_router.refresh_lag()
+        user_id = get_user_id_from_request(request) if replica_router.sticky_users else None
+        if replica_router.is_healthy() and not (user_id and replica_router.is_sticky(user_id)):
+            session_factory = ReplicaSessionLocal
+
+    async with session_factory() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
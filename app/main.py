@@ -5,6 +5,7 @@ from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 from slowapi.errors import RateLimitExceeded
 from dotenv import load_dotenv
+from contextlib import asynccontextmanager
 import time
 import os
 from app.core.config import settings
@@ -12,16 +13,36 @@ from app.core.config import settings
 from app.api.api_v1.api import api_router
 from app.core.rate_limiter import limiter, rate_limit_exceeded_handler
 from app.core.cors_config import CORS_CONFIG
+from app.core.pagination import InvalidCursorError
+from app.db.replica import replica_router, get_user_id_from_request, set_primary_pin
+from app.core.cache import cache
+from app.core.outbox_dispatcher import outbox_dispatcher
+from app.core.task_queue import task_queue
+from app.core.websocket_manager import manager
 
 load_dotenv()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop background workers with the app"""
+    task_queue.start()
+    if settings.OUTBOX_DISPATCHER_ENABLED:
+        outbox_dispatcher.start()
+    yield
+    await outbox_dispatcher.stop()
+    await task_queue.stop()
+    await manager.close()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="JobSearch API",
     description="A comprehensive job search platform API",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Add rate limiter state
@@ -64,6 +85,21 @@ async def add_process_time_header(request: Request, call_next):
     return response
 
 
+# Read-your-writes middleware for replica routing
+@app.middleware("http")
+async def pin_writers_to_primary(request: Request, call_next):
+    """Send a user's reads to the primary for a short window after they write"""
+    response = await call_next(request)
+
+    if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+        user_id = get_user_id_from_request(request)
+        if user_id:
+            replica_router.mark_write(user_id)
+            set_primary_pin(response)
+
+    return response
+
+
 # Security headers middleware
 @app.middleware("http")
 async def add_security_headers(request: Request, call_next):
@@ -87,7 +123,11 @@ async def health_check():
     return {
         "status": "healthy",
         "version": "1.0.0",
-        "environment": settings.ENVIRONMENT or os.getenv("ENVIRONMENT", "development")
+        "environment": settings.ENVIRONMENT or os.getenv("ENVIRONMENT", "development"),
+        "replica": replica_router.status(),
+        "cache": cache.stats(),
+        "outbox": outbox_dispatcher.stats(),
+        "task_queue": task_queue.stats()
     }
 
 
@@ -108,6 +148,15 @@ app.include_router(api_router, prefix="/api/v1")
 
 
 # Global exception handler
+@app.exception_handler(InvalidCursorError)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursorError):
+    """A cursor from another list, or a tampered one, is the client's error"""
+    return JSONResponse(
+        status_code=400,
+        content={"detail": "Invalid pagination cursor"}
+    )
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Handle all unhandled exceptions"""
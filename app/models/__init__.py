@@ -7,3 +7,6 @@ from .job import Job
 from .application_document import ApplicationDocument
 from .bookmark import Bookmark
 from .notification import Notification  
+from .employer_stats import EmployerStats
+from .outbox import OutboxEvent
+from .notification_tombstone import NotificationTombstone
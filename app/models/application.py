@@ -1,5 +1,5 @@
 # app/models/application.py
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, Text, String, JSON
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Text, String, JSON, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.database import Base
@@ -12,7 +12,7 @@ class Application(Base):
     job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False)
     cover_letter = Column(Text, nullable=True)
     status = Column(String, default="pending")  # pending, reviewed, accepted, rejected, withdrawn
-    applied_at = Column(DateTime, default=datetime.utcnow)
+    applied_at = Column(DateTime, nullable=False, default=datetime.utcnow, server_default=text("(now() AT TIME ZONE 'utc')"))  # keyset sort key, never NULL
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # NEW: Store answers to custom questions as JSON
@@ -28,4 +28,12 @@ class Application(Base):
     # Relationships
     user = relationship("User", back_populates="applications")
     job = relationship("Job", back_populates="applications")
-    documents = relationship("ApplicationDocument", back_populates="application", cascade="all, delete-orphan")
\ No newline at end of file
+    documents = relationship("ApplicationDocument", back_populates="application", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        # Job seeker's applications, keyset on (applied_at, id); also serves duplicate checks by user
+        Index('idx_applications_user_applied', user_id, applied_at.desc(), id.desc()),
+        # Applicants per job and per-status counts
+        Index('idx_applications_job_status', job_id, status),
+        Index('idx_applications_job_applied', job_id, applied_at.desc()),
+    )
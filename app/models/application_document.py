@@ -1,5 +1,5 @@
 # app/models/application_document.py
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.database import Base
@@ -15,4 +15,8 @@ class ApplicationDocument(Base):
     uploaded_at = Column(DateTime, default=datetime.utcnow)
 
     # Relationship
-    application = relationship("Application", back_populates="documents")
\ No newline at end of file
+    application = relationship("Application", back_populates="documents")
+
+    __table_args__ = (
+        Index('idx_application_documents_application', application_id, uploaded_at.desc()),
+    )
@@ -1,5 +1,5 @@
 # app/models/bookmark.py
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, UniqueConstraint
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, UniqueConstraint, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.database import Base
@@ -10,7 +10,7 @@ class Bookmark(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, server_default=text("(now() AT TIME ZONE 'utc')"))  # keyset sort key, never NULL
 
     # Relationships
     user = relationship("User", backref="bookmarks")
@@ -19,4 +19,6 @@ class Bookmark(Base):
     # Prevent duplicate bookmarks
     __table_args__ = (
         UniqueConstraint('user_id', 'job_id', name='unique_user_job_bookmark'),
+        # Bookmark list, keyset on (created_at, id)
+        Index('idx_bookmarks_user_created', user_id, created_at.desc(), id.desc()),
     )
\ No newline at end of file
@@ -9,7 +9,7 @@ class EmployerProfile(Base):
     company_name = Column(String, nullable=False)
     company_website = Column(String, nullable=True)
     company_description = Column(String, nullable=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)  # looked up on every employer request
 
     user = relationship("User", back_populates="employer_profile")
     jobs = relationship("Job", back_populates="employer")
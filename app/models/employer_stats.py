@@ -0,0 +1,23 @@
+# app/models/employer_stats.py
+from sqlalchemy import Column, Integer, ForeignKey, DateTime
+from datetime import datetime
+from app.db.database import Base
+
+class EmployerStats(Base):
+    """
+    Per-employer dashboard counters.
+    Kept exact by the job and application services in the same transaction
+    as the change, so the dashboard is a primary-key read.
+    """
+    __tablename__ = "employer_stats"
+
+    employer_id = Column(Integer, ForeignKey("employer_profiles.id", ondelete="CASCADE"), primary_key=True)
+    total_jobs = Column(Integer, nullable=False, default=0, server_default="0")
+    active_jobs = Column(Integer, nullable=False, default=0, server_default="0")
+    total_applications = Column(Integer, nullable=False, default=0, server_default="0")
+    pending_applications = Column(Integer, nullable=False, default=0, server_default="0")
+    reviewed_applications = Column(Integer, nullable=False, default=0, server_default="0")
+    accepted_applications = Column(Integer, nullable=False, default=0, server_default="0")
+    rejected_applications = Column(Integer, nullable=False, default=0, server_default="0")
+    withdrawn_applications = Column(Integer, nullable=False, default=0, server_default="0")
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
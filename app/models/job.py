@@ -1,6 +1,7 @@
 # app/models/job.py
-from sqlalchemy import Column, Float, Integer, String, ForeignKey, Text, Boolean, DateTime, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Float, Integer, String, ForeignKey, Text, Boolean, DateTime, JSON, Computed, Index, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 from app.db.database import Base
 
@@ -15,7 +16,7 @@ class Job(Base):
     job_type = Column(String, nullable=True)  # e.g., Full-time, Part-time, Contract
     requirements = Column(Text, nullable=True)
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, server_default=text("(now() AT TIME ZONE 'utc')"))  # keyset sort key, never NULL
     
     # NEW: Custom application questions stored as JSON
     custom_questions = Column(JSON, nullable=True, default=list)
@@ -29,6 +30,31 @@ class Job(Base):
     #   }
     # ]
 
+    # Weighted full-text search document: title (A) > requirements (B) > description (C)
+    # Generated by Postgres, deferred so list queries don't ship it over the wire
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(requirements, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'C')",
+            persisted=True
+        ),
+        nullable=True
+    ))
+
     employer_id = Column(Integer, ForeignKey("employer_profiles.id"))
     employer = relationship("EmployerProfile", back_populates="jobs")
-    applications = relationship("Application", back_populates="job")
\ No newline at end of file
+    applications = relationship("Application", back_populates="job")
+
+    __table_args__ = (
+        Index('idx_jobs_fulltext', 'search_vector', postgresql_using='gin'),
+        # Public job list: newest active jobs, keyset on (created_at, id)
+        Index(
+            'idx_jobs_active_created',
+            created_at.desc(), id.desc(),
+            postgresql_where=(is_active == True)
+        ),
+        # Employer job list
+        Index('idx_jobs_employer_created', employer_id, created_at.desc(), id.desc()),
+    )
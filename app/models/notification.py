@@ -1,5 +1,5 @@
 # app/models/notification.py
-from sqlalchemy import Column, Integer, String, ForeignKey, Text, Boolean, DateTime
+from sqlalchemy import Column, BigInteger, Integer, String, ForeignKey, Text, Boolean, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.database import Base
@@ -7,14 +7,42 @@ from app.db.database import Base
 class Notification(Base):
     __tablename__ = "notifications"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     title = Column(String, nullable=False)
     message = Column(Text, nullable=False)
     notification_type = Column(String, nullable=True)  # e.g., "application", "job_update", "general"
     related_id = Column(Integer, nullable=True)  # ID of related entity (job_id, application_id, etc.)
     is_read = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    # Partition key: notifications are range-partitioned by month, so it is
+    # part of the primary key (partitions managed by maintenance_tasks)
+    created_at = Column(DateTime, primary_key=True, nullable=False, default=datetime.utcnow)
+    # Coalescing: events with the same group_key inside the window update this row
+    group_key = Column(String, nullable=True)  # e.g. "new_application:job:42"
+    event_count = Column(Integer, nullable=False, default=1, server_default="1")
+    updated_at = Column(DateTime, nullable=True)
+    # users.notification_version of the last change to this row (delta sync)
+    version = Column(BigInteger, nullable=False, default=0, server_default="0")
 
     # Relationship
-    user = relationship("User", backref="notifications")
\ No newline at end of file
+    user = relationship("User", backref="notifications")
+
+    __table_args__ = (
+        # Notification inbox, keyset on (created_at, id)
+        Index('idx_notifications_user_created', user_id, created_at.desc(), id.desc()),
+        # Unread lookups only ever touch unread rows
+        Index(
+            'idx_notifications_user_unread',
+            user_id, is_read,
+            postgresql_where=(is_read == False)
+        ),
+        # Open coalescing group lookup
+        Index(
+            'idx_notifications_user_group',
+            user_id, group_key, created_at.desc(),
+            postgresql_where=(group_key.isnot(None))
+        ),
+        # Delta sync: rows changed after a client's version
+        Index('idx_notifications_user_version', user_id, version),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
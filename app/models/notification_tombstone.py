@@ -0,0 +1,21 @@
+# app/models/notification_tombstone.py
+from sqlalchemy import Column, BigInteger, Integer, ForeignKey, DateTime, Index
+from datetime import datetime
+from app.db.database import Base
+
+class NotificationTombstone(Base):
+    """
+    Marks a deleted notification so delta sync (GET /notifications/changes)
+    can tell clients to drop it. Pruned after NOTIFICATION_TOMBSTONE_DAYS.
+    """
+    __tablename__ = "notification_tombstones"
+
+    id = Column(BigInteger, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    notification_id = Column(Integer, nullable=False)
+    version = Column(BigInteger, nullable=False)  # users.notification_version of the delete
+    deleted_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index('idx_notification_tombstones_user_version', user_id, version),
+    )
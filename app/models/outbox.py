@@ -0,0 +1,25 @@
+# app/models/outbox.py
+from sqlalchemy import Column, BigInteger, Integer, String, Text, DateTime, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from datetime import datetime
+from app.db.database import Base
+
+class OutboxEvent(Base):
+    """
+    Side effect (WebSocket push, Celery task) written in the same transaction
+    as the change that causes it. The outbox dispatcher delivers and deletes it.
+    """
+    __tablename__ = "outbox"
+
+    id = Column(BigInteger, primary_key=True)
+    topic = Column(String, nullable=False)  # "notification" or "task"
+    payload = Column(JSONB, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    available_at = Column(DateTime, nullable=False, default=datetime.utcnow)  # pushed back on failure
+
+    __table_args__ = (
+        # Dispatcher batches: oldest deliverable events first
+        Index('idx_outbox_available', available_at, id),
+    )
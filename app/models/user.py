@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean
+from sqlalchemy import Column, BigInteger, Integer, String, Boolean
 from sqlalchemy.orm import relationship
 from app.db.database import Base
 
@@ -10,6 +10,18 @@ class User(Base):
     hashed_password = Column(String, nullable=False)
     is_active = Column(Boolean, default=True)
     is_employer = Column(Boolean, default=False)
+    # Bumped to revoke every token issued before; carried in JWTs as "tv"
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
+    # Unread notifications, kept exact by notification_service in the same
+    # transaction as each change (reconciled periodically by a Celery task)
+    unread_notifications = Column(Integer, nullable=False, default=0, server_default="0")
+    # Delta sync: bumped by every notification change (stamped on the row or
+    # its tombstone); clients that last synced below the floor must reload.
+    # Starts at 1 so since=0 always asks for a resync
+    notification_version = Column(BigInteger, nullable=False, default=1, server_default="1")
+    notification_sync_floor = Column(BigInteger, nullable=False, default=0, server_default="0")
+    # notification_version when the unread counter was last reconciled
+    unread_checked_version = Column(BigInteger, nullable=False, default=1, server_default="1")
 
     employer_profile = relationship("EmployerProfile", back_populates="user", uselist=False)
     job_seeker_profile = relationship("JobSeekerProfile", back_populates="user", uselist=False)
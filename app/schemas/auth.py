@@ -16,6 +16,14 @@ class UserRead(BaseModel):
     class Config:
         orm_mode = True
 
+class TokenClaims(BaseModel):
+    """Identity read from a verified access token"""
+    id: int
+    is_employer: bool = False
+    is_active: bool = True
+    profile_id: Optional[int] = None  # employer or job seeker profile id
+    token_version: int = 0
+
 class Token(BaseModel):
     access_token: str
     refresh_token: str
@@ -40,4 +40,13 @@ class JobRead(JobBase):
     created_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class FacetCount(BaseModel):
+    value: Optional[str] = None  # None groups jobs without a value
+    count: int
+
+class JobFacets(BaseModel):
+    location: List[FacetCount] = []
+    job_type: List[FacetCount] = []
+    salary: List[FacetCount] = []  # under_30k, 30k_60k, ..., 150k_plus, unspecified
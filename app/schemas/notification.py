@@ -1,7 +1,7 @@
 # app/schemas/notification.py
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 class NotificationCreate(BaseModel):
     user_id: int
@@ -18,10 +18,38 @@ class NotificationRead(BaseModel):
     notification_type: Optional[str]
     related_id: Optional[int]
     is_read: bool
+    event_count: int = 1
     created_at: datetime
+    updated_at: Optional[datetime] = None
+    version: int = 0
 
     class Config:
         from_attributes = True
 
 class NotificationUpdate(BaseModel):
-    is_read: bool
\ No newline at end of file
+    is_read: bool
+class NotificationBulkAction(BaseModel):
+    """Either a list of notification ids or everything created before a timestamp"""
+    ids: Optional[List[int]] = Field(None, min_length=1, max_length=1000)
+    before: Optional[datetime] = None
+
+    @model_validator(mode="after")
+    def check_exactly_one(self):
+        if (self.ids is None) == (self.before is None):
+            raise ValueError("Pass either ids or before")
+        return self
+
+class NotificationBulkResult(BaseModel):
+    count: int
+    notification_ids: List[int]
+
+class NotificationChanges(BaseModel):
+    """
+    Changes after a client's version. With resync_required the client reloads
+    the list and then syncs from `version`; with has_more it asks again from `version`.
+    """
+    version: int
+    notifications: List[NotificationRead] = []
+    deleted_ids: List[int] = []
+    has_more: bool = False
+    resync_required: bool = False
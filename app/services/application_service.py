@@ -1,14 +1,38 @@
 # app/services/application_service.py
-from sqlalchemy import select
+from sqlalchemy import select, insert, tuple_, and_, func, union_all, literal, exists
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, aliased
+from sqlalchemy.orm.attributes import set_committed_value
 from typing import Optional, List
 from datetime import datetime
 
+from app.core.pagination import decode_cursor
 from app.models.application import Application
 from app.models.application_document import ApplicationDocument
 from app.models.job import Job
+from app.models.employer_profile import EmployerProfile
+from app.models.job_seeker_profile import JobSeekerProfile
+from app.models.user import User
 from app.schemas.application import ApplicationCreate, ApplicationUpdate
+from app.services.employer_stats_service import (
+    adjust_employer_counters_for_job,
+    application_status_deltas,
+    employer_counters_upsert,
+    status_column
+)
+from app.services import email_service
+from app.services.notification_service import (
+    application_submitted_notification,
+    coalesced_unread_delta,
+    next_versions,
+    notification_insert,
+    notification_push_rows,
+    open_notification_group,
+    version_of
+)
+from app.services.notification_helpers import employer_new_application_writes, new_application_group_key
+from app.services.outbox_service import TASK_TOPIC, enqueue_rows
 
 
 async def create_application(
@@ -30,11 +54,192 @@ async def create_application(
         
     )
     db.add(application)
+    await adjust_employer_counters_for_job(
+        db,
+        application_data.job_id,
+        total_applications=1,
+        pending_applications=1
+    )
     await db.commit()
     await db.refresh(application, ["documents"])  # Load documents relationship
     return application
 
 
+async def get_apply_context(
+    db: AsyncSession,
+    user_id: int,
+    job_id: int
+):
+    """
+    Load everything the apply pipeline needs in one query, starting from the
+    applicant's row: their token_version and is_active (so the endpoint
+    authenticates without another lookup), email and name, the job, its
+    employer profile and employer email, any existing application by this
+    user for the job, and a freshly drawn id for the new application.
+    Locks the employer's users row until commit, so submit_application
+    reads the open coalescing group after any concurrent apply to the job.
+    Returns None if the user doesn't exist; Job is None if the job doesn't.
+    """
+    EmployerUser = aliased(User)
+    Applicant = aliased(User)
+    employer_lock = (
+        select(EmployerUser.id)
+        .where(EmployerUser.id == EmployerProfile.user_id)
+        .with_for_update()
+        .scalar_subquery()
+    )
+    stmt = (
+        select(
+            Job,
+            Applicant.token_version.label("applicant_token_version"),
+            Applicant.is_active.label("applicant_is_active"),
+            Applicant.email.label("applicant_email"),
+            JobSeekerProfile.full_name.label("applicant_full_name"),
+            EmployerProfile.company_name,
+            employer_lock.label("employer_user_id"),
+            select(EmployerUser.email)
+            .where(EmployerUser.id == EmployerProfile.user_id)
+            .scalar_subquery()
+            .label("employer_email"),
+            Application.id.label("existing_application_id"),
+            func.nextval(func.pg_get_serial_sequence("applications", "id")).label("application_id")
+        )
+        .select_from(Applicant)
+        .outerjoin(Job, Job.id == job_id)
+        .outerjoin(EmployerProfile, EmployerProfile.id == Job.employer_id)
+        .outerjoin(JobSeekerProfile, JobSeekerProfile.user_id == Applicant.id)
+        .outerjoin(
+            Application,
+            and_(Application.job_id == Job.id, Application.user_id == Applicant.id)
+        )
+        .where(Applicant.id == user_id)
+        .limit(1)
+    )
+    result = await db.execute(stmt)
+    return result.one_or_none()
+
+
+async def submit_application(
+    db: AsyncSession,
+    user_id: int,
+    application_data: ApplicationCreate,
+    context
+) -> Application:
+    """
+    Write the application, both notifications, the confirmation emails and the
+    employer counters in one statement: the application INSERT carries every
+    other write as a data-modifying CTE, the outbox rows for the pushes and
+    emails included, so they are delivered after (and only if) the commit
+    succeeds. With get_apply_context that is two round trips plus the commit.
+    The employer's notification coalesces with others for the same job, and
+    the employer email is only sent for the first application in the window.
+    """
+    job = context.Job
+    application_id = context.application_id
+    applicant_name = context.applicant_full_name or context.applicant_email
+    company_name = context.company_name or "Company"
+    now = datetime.utcnow()
+    
+    app_dict = application_data.model_dump()
+    if app_dict.get('question_answers'):
+        app_dict['question_answers'] = [
+            q.model_dump() for q in application_data.question_answers
+        ]
+    
+    ctes = []
+    unread_deltas = {user_id: 1}
+    employer_user_id = context.employer_user_id
+    if employer_user_id:
+        # Read under the employer lock taken by get_apply_context
+        open_group = open_notification_group(
+            employer_user_id, new_application_group_key(job.id), now
+        ).cte("open_group")
+        ctes.append(open_group)
+        unread_deltas[employer_user_id] = unread_deltas.get(employer_user_id, 0) + coalesced_unread_delta(open_group)
+    # One UPDATE for both users, so an employer applying to their own job
+    # doesn't update the same row twice in one statement
+    versions = next_versions(unread_deltas).cte("next_versions")
+    ctes.append(versions)
+    
+    seeker_notification = notification_insert(
+        application_submitted_notification(user_id, job.title, application_id),
+        version_of(versions, user_id)
+    ).cte("seeker_notification")
+    ctes.append(seeker_notification)
+    outbox_rows = [
+        notification_push_rows(seeker_notification),
+        _task_row(email_service.application_confirmation_email_task(
+            email=context.applicant_email,
+            applicant_name=applicant_name,
+            job_title=job.title,
+            company_name=company_name,
+            application_id=application_id
+        ))
+    ]
+    
+    # Bursts on a hot job coalesce into one notification and one email
+    if employer_user_id:
+        created, coalesced = employer_new_application_writes(
+            employer_user_id,
+            job_id=job.id,
+            job_title=job.title,
+            applicant_name=applicant_name,
+            application_id=application_id,
+            open_group=open_group,
+            version=version_of(versions, employer_user_id),
+            now=now
+        )
+        created = created.cte("employer_notification_created")
+        coalesced = coalesced.cte("employer_notification_coalesced")
+        ctes += [created, coalesced]
+        outbox_rows += [notification_push_rows(created), notification_push_rows(coalesced)]
+        if context.employer_email:
+            outbox_rows.append(
+                _task_row(email_service.new_application_email_task(
+                    email=context.employer_email,
+                    employer_name=context.company_name,
+                    applicant_name=applicant_name,
+                    job_title=job.title,
+                    application_id=application_id
+                )).where(~exists(select(open_group.c.id)))
+            )
+    ctes.append(enqueue_rows(db, union_all(*outbox_rows)).cte("outbox_events"))
+    
+    if job.employer_id:
+        counters = employer_counters_upsert(job.employer_id, total_applications=1, pending_applications=1)
+        if counters is not None:
+            ctes.append(counters.cte("employer_counters"))
+    
+    # Column defaults don't fire for an INSERT run through from_statement
+    stmt = (
+        insert(Application)
+        .values(
+            id=application_id,
+            user_id=user_id,
+            status="pending",
+            applied_at=now,
+            updated_at=now,
+            **app_dict
+        )
+        .returning(*Application.__table__.c)
+    )
+    for cte in ctes:
+        stmt = stmt.add_cte(cte)
+    result = await db.execute(select(Application).from_statement(stmt))
+    application = result.scalar_one()
+    
+    await db.commit()
+    
+    # A brand-new application has no documents; avoid a lazy load on serialization
+    set_committed_value(application, "documents", [])
+    return application
+
+
+def _task_row(payload: dict):
+    """(topic, payload) outbox row of a task, for enqueue_rows"""
+    return select(literal(TASK_TOPIC).label("topic"), literal(payload, JSONB).label("payload"))
+
+
 async def get_application_by_id(
     db: AsyncSession,
     application_id: int
@@ -71,9 +276,10 @@ async def get_user_applications(
     user_id: int,
     skip: int = 0,
     limit: int = 100,
-    status: Optional[str] = None
+    status: Optional[str] = None,
+    cursor: Optional[str] = None
 ) -> List[Application]:
-    """Get all applications for a user"""
+    """Get all applications for a user (cursor takes precedence over skip)"""
     stmt = (
         select(Application)
         .options(
@@ -86,7 +292,15 @@ async def get_user_applications(
     if status:
         stmt = stmt.where(Application.status == status)
     
-    stmt = stmt.order_by(Application.applied_at.desc()).offset(skip).limit(limit)
+    if cursor:
+        applied_at, last_id = decode_cursor(cursor)
+        stmt = stmt.where(
+            tuple_(Application.applied_at, Application.id) < tuple_(applied_at, last_id)
+        )
+    else:
+        stmt = stmt.offset(skip)
+    
+    stmt = stmt.order_by(Application.applied_at.desc(), Application.id.desc()).limit(limit)
     
     result = await db.execute(stmt)
     return list(result.scalars().all())
@@ -99,6 +313,7 @@ async def update_application(
 ) -> Application:
     """Update an application"""
     update_dict = update_data.model_dump(exclude_unset=True)
+    old_status = application.status
     
     # Job seekers can only update cover_letter or set status to "withdrawn"
     for field, value in update_dict.items():
@@ -106,6 +321,11 @@ async def update_application(
             continue  # Skip invalid status updates from job seekers
         setattr(application, field, value)
     
+    await adjust_employer_counters_for_job(
+        db,
+        application.job_id,
+        **application_status_deltas(old_status, application.status)
+    )
     application.updated_at = datetime.utcnow()
     await db.commit()
     await db.refresh(application)
@@ -117,6 +337,11 @@ async def withdraw_application(
     application: Application
 ) -> Application:
     """Withdraw an application"""
+    await adjust_employer_counters_for_job(
+        db,
+        application.job_id,
+        **application_status_deltas(application.status, "withdrawn")
+    )
     application.status = "withdrawn"
     application.updated_at = datetime.utcnow()
     await db.commit()
@@ -137,6 +362,11 @@ async def delete_application(
     application: Application
 ) -> None:
     """Delete an application (cascade deletes documents)"""
+    deltas = {"total_applications": -1}
+    column = status_column(application.status)
+    if column:
+        deltas[column] = -1
+    await adjust_employer_counters_for_job(db, application.job_id, **deltas)
     await db.delete(application)
     await db.commit()
 
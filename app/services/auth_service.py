@@ -1,11 +1,15 @@
 # app/services/auth_service.py
-from sqlalchemy import select
+from typing import Optional
+
+from sqlalchemy import select, update
 from sqlalchemy.exc import NoResultFound
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user import User
 from app.models.employer_profile import EmployerProfile
+from app.models.job_seeker_profile import JobSeekerProfile
 from app.core.security import get_password_hash, verify_password, create_access_token, create_refresh_token
+from app.core.deps import invalidate_user_auth_cache
 
 async def get_user_by_email(db: AsyncSession, email: str):
     stmt = select(User).where(User.email == email)
@@ -13,6 +17,11 @@ async def get_user_by_email(db: AsyncSession, email: str):
     user = res.scalar_one_or_none()
     return user
 
+async def get_user_by_id(db: AsyncSession, user_id: int):
+    stmt = select(User).where(User.id == user_id)
+    res = await db.execute(stmt)
+    return res.scalar_one_or_none()
+
 async def create_user(db: AsyncSession, email: str, password: str, is_employer: bool = False):
     hashed = get_password_hash(password)
 
@@ -42,10 +51,41 @@ async def authenticate_user(db: AsyncSession, email: str, password: str):
         return None
     return user
 
-async def create_token_for_user(user):
+async def get_profile_id_for_user(db: AsyncSession, user: User) -> Optional[int]:
+    """Get the employer or job seeker profile id for a user"""
+    profile_model = EmployerProfile if user.is_employer else JobSeekerProfile
+    stmt = select(profile_model.id).where(profile_model.user_id == user.id)
+    res = await db.execute(stmt)
+    return res.scalars().first()
+
+def build_access_token(user: User, profile_id: Optional[int]) -> str:
+    """Access token carrying the claims used by zero-query auth"""
+    return create_access_token(
+        str(user.id),
+        claims={
+            "is_employer": bool(user.is_employer),
+            "is_active": bool(user.is_active),
+            "profile_id": profile_id,
+            "tv": user.token_version or 0,
+        }
+    )
+
+async def create_token_for_user(db: AsyncSession, user: User):
     """
     Generate both access and refresh tokens for the user
     """
-    access_token = create_access_token(str(user.id))
-    refresh_token = create_refresh_token(str(user.id))
+    profile_id = await get_profile_id_for_user(db, user)
+    access_token = build_access_token(user, profile_id)
+    refresh_token = create_refresh_token(str(user.id), token_version=user.token_version or 0)
     return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
+
+async def revoke_user_tokens(db: AsyncSession, user_id: int) -> None:
+    """Invalidate every access and refresh token issued to a user so far"""
+    stmt = (
+        update(User)
+        .where(User.id == user_id)
+        .values(token_version=User.token_version + 1)
+    )
+    await db.execute(stmt)
+    await db.commit()
+    invalidate_user_auth_cache(user_id)
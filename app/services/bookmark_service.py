@@ -1,9 +1,10 @@
 # app/services/bookmark_service.py
-from sqlalchemy import select
+from sqlalchemy import select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from typing import Optional, List
 
+from app.core.pagination import decode_cursor
 from app.models.bookmark import Bookmark
 from app.models.job import Job
 
@@ -42,17 +43,23 @@ async def get_user_bookmarks(
     db: AsyncSession,
     user_id: int,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[str] = None
 ) -> List[Bookmark]:
-    """Get all bookmarks for a user with job details"""
+    """Get all bookmarks for a user with job details (cursor takes precedence over skip)"""
     stmt = (
         select(Bookmark)
         .options(selectinload(Bookmark.job))
         .where(Bookmark.user_id == user_id)
-        .order_by(Bookmark.created_at.desc())
-        .offset(skip)
-        .limit(limit)
     )
+    
+    if cursor:
+        created_at, last_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(Bookmark.created_at, Bookmark.id) < tuple_(created_at, last_id))
+    else:
+        stmt = stmt.offset(skip)
+    
+    stmt = stmt.order_by(Bookmark.created_at.desc(), Bookmark.id.desc()).limit(limit)
     result = await db.execute(stmt)
     return list(result.scalars().all())
 
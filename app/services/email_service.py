@@ -2,7 +2,13 @@
 """
 Email service wrapper for Celery tasks
 This provides a clean interface to trigger email tasks
+
+Emails are queued in the transactional outbox with the caller's session and
+published to Celery by the outbox dispatcher after the commit.
 """
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.outbox_service import enqueue_task, task_payload
 from app.tasks.email_tasks import (
     send_welcome_email_task,
     send_application_confirmation_task,
@@ -13,25 +19,27 @@ from app.tasks.email_tasks import (
 )
 
 
-def send_welcome_email(email: str, name: str):
+def send_welcome_email(db: AsyncSession, email: str, name: str):
     """Queue welcome email task"""
-    send_welcome_email_task.delay(email, name)
+    enqueue_task(db, send_welcome_email_task.name, email, name)
 
 
-def send_application_confirmation_email(
+def application_confirmation_email_task(
     email: str,
     applicant_name: str,
     job_title: str,
     company_name: str,
     application_id: int
-):
-    """Queue application confirmation email task"""
-    send_application_confirmation_task.delay(
+) -> dict:
+    """Outbox payload of the application confirmation email task"""
+    return task_payload(
+        send_application_confirmation_task.name,
         email, applicant_name, job_title, company_name, application_id
     )
 
 
 def send_application_status_email(
+    db: AsyncSession,
     email: str,
     applicant_name: str,
     job_title: str,
@@ -40,25 +48,28 @@ def send_application_status_email(
     application_id: int
 ):
     """Queue application status update email task"""
-    send_application_status_update_task.delay(
+    enqueue_task(
+        db, send_application_status_update_task.name,
         email, applicant_name, job_title, company_name, status, application_id
     )
 
 
-def send_new_application_email(
+def new_application_email_task(
     email: str,
     employer_name: str,
     applicant_name: str,
     job_title: str,
     application_id: int
-):
-    """Queue new application notification email task"""
-    send_new_application_notification_task.delay(
+) -> dict:
+    """Outbox payload of the new application notification email task"""
+    return task_payload(
+        send_new_application_notification_task.name,
         email, employer_name, applicant_name, job_title, application_id
     )
 
 
 def send_application_withdrawn_email(
+    db: AsyncSession,
     email: str,
     employer_name: str,
     applicant_name: str,
@@ -66,11 +77,12 @@ def send_application_withdrawn_email(
     application_id: int
 ):
     """Queue application withdrawn notification email task"""
-    send_application_withdrawn_notification_task.delay(
+    enqueue_task(
+        db, send_application_withdrawn_notification_task.name,
         email, employer_name, applicant_name, job_title, application_id
     )
 
 
-def send_password_reset_email(email: str, name: str, reset_token: str):
+def send_password_reset_email(db: AsyncSession, email: str, name: str, reset_token: str):
     """Queue password reset email task"""
-    send_password_reset_email_task.delay(email, name, reset_token)
\ No newline at end of file
+    enqueue_task(db, send_password_reset_email_task.name, email, name, reset_token)
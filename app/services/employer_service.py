@@ -1,14 +1,16 @@
 # app/services/employer_service.py
-from sqlalchemy import select, func
+from sqlalchemy import select, func, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from typing import Optional
 
+from app.core.pagination import decode_cursor
 from app.models.employer_profile import EmployerProfile
 from app.models.job import Job
 from app.models.user import User
 from app.models.application import Application
 from app.schemas.employer_profile import EmployerProfileCreate, EmployerProfileUpdate
+from app.services.employer_stats_service import get_employer_counters, compute_employer_statistics
 
 
 async def create_employer_profile(
@@ -66,49 +68,34 @@ async def get_employer_jobs(
     employer_id: int,
     skip: int = 0,
     limit: int = 100,
-    active_only: bool = False
+    active_only: bool = False,
+    cursor: Optional[str] = None
 ) -> list[Job]:
-    """Get all jobs posted by an employer"""
+    """Get all jobs posted by an employer (cursor takes precedence over skip)"""
     stmt = select(Job).where(Job.employer_id == employer_id)
     
     if active_only:
         stmt = stmt.where(Job.is_active == True)
     
-    stmt = stmt.offset(skip).limit(limit).order_by(Job.created_at.desc())
+    if cursor:
+        created_at, last_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(Job.created_at, Job.id) < tuple_(created_at, last_id))
+    else:
+        stmt = stmt.offset(skip)
+    
+    stmt = stmt.order_by(Job.created_at.desc(), Job.id.desc()).limit(limit)
     
     result = await db.execute(stmt)
     return list(result.scalars().all())
 
 
 async def get_employer_statistics(db: AsyncSession, employer_id: int) -> dict:
-    """Get statistics for employer dashboard"""
-    # Total jobs
-    total_jobs_stmt = select(func.count(Job.id)).where(Job.employer_id == employer_id)
-    total_jobs_result = await db.execute(total_jobs_stmt)
-    total_jobs = total_jobs_result.scalar() or 0
-    
-    # Active jobs
-    active_jobs_stmt = select(func.count(Job.id)).where(
-        Job.employer_id == employer_id,
-        Job.is_active == True
-    )
-    active_jobs_result = await db.execute(active_jobs_stmt)
-    active_jobs = active_jobs_result.scalar() or 0
-    
-    # Total applications across all jobs
-    total_applications_stmt = (
-        select(func.count(Application.id))
-        .join(Job, Application.job_id == Job.id)
-        .where(Job.employer_id == employer_id)
-    )
-    total_applications_result = await db.execute(total_applications_stmt)
-    total_applications = total_applications_result.scalar() or 0
-    
-    return {
-        "total_jobs": total_jobs,
-        "active_jobs": active_jobs,
-        "total_applications": total_applications
-    }
+    """Get statistics for employer dashboard (primary-key read of the maintained counters)"""
+    stats = await get_employer_counters(db, employer_id)
+    if stats is None:
+        # No counter row yet: fall back to one aggregate over the source tables
+        stats = await compute_employer_statistics(db, employer_id)
+    return stats
 
 
 async def get_job_applicants(
@@ -0,0 +1,132 @@
+# app/services/employer_stats_service.py
+from sqlalchemy import select, func, literal, distinct
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from app.models.application import Application
+from app.models.employer_stats import EmployerStats
+from app.models.job import Job
+
+APPLICATION_STATUSES = ("pending", "reviewed", "accepted", "rejected", "withdrawn")
+
+COUNTER_COLUMNS = (
+    "total_jobs",
+    "active_jobs",
+    "total_applications",
+    *(f"{status}_applications" for status in APPLICATION_STATUSES),
+)
+
+
+def status_column(status: Optional[str]) -> Optional[str]:
+    """Counter column for an application status, None for unknown statuses"""
+    if status in APPLICATION_STATUSES:
+        return f"{status}_applications"
+    return None
+
+
+def application_status_deltas(old_status: Optional[str], new_status: Optional[str]) -> dict:
+    """Counter deltas for an application moving from old_status to new_status"""
+    deltas = {}
+    old_column, new_column = status_column(old_status), status_column(new_status)
+    if old_column == new_column:
+        return deltas
+    if old_column:
+        deltas[old_column] = -1
+    if new_column:
+        deltas[new_column] = 1
+    return deltas
+
+
+def _upsert(stmt, deltas: dict):
+    """ON CONFLICT clause adding the deltas to the existing counters"""
+    return stmt.on_conflict_do_update(
+        index_elements=[EmployerStats.employer_id],
+        set_={
+            **{
+                column: getattr(EmployerStats, column) + getattr(stmt.excluded, column)
+                for column in deltas
+            },
+            "updated_at": func.now(),
+        }
+    )
+
+
+def employer_counters_upsert(employer_id: int, **deltas: int):
+    """
+    Upsert adding deltas to an employer's counters, None if every delta is 0.
+    Usable as a data-modifying CTE of another write.
+    """
+    deltas = {column: delta for column, delta in deltas.items() if delta}
+    if not deltas:
+        return None
+    # updated_at spelled out: as a CTE of another INSERT, SQLAlchemy can't fill
+    # in both statements' Python-side updated_at defaults
+    stmt = insert(EmployerStats).values(employer_id=employer_id, updated_at=func.now(), **deltas)
+    return _upsert(stmt, deltas)
+
+
+async def adjust_employer_counters(db: AsyncSession, employer_id: int, **deltas: int) -> None:
+    """
+    Add deltas to an employer's counters (no commit).
+    Call it before the commit of the change it describes.
+    """
+    stmt = employer_counters_upsert(employer_id, **deltas)
+    if stmt is not None:
+        await db.execute(stmt)
+
+
+async def adjust_employer_counters_for_job(db: AsyncSession, job_id: int, **deltas: int) -> None:
+    """Same as adjust_employer_counters, resolving the employer from a job id in SQL"""
+    deltas = {column: delta for column, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    columns = list(deltas)
+    source = select(
+        Job.employer_id,
+        *(literal(deltas[column]) for column in columns)
+    ).where(Job.id == job_id, Job.employer_id.isnot(None))
+    stmt = insert(EmployerStats).from_select(["employer_id", *columns], source)
+    await db.execute(_upsert(stmt, deltas))
+
+
+async def compute_employer_statistics(db: AsyncSession, employer_id: int) -> dict:
+    """Exact statistics from the source tables in one aggregate query"""
+    stmt = (
+        select(
+            func.count(distinct(Job.id)).label("total_jobs"),
+            func.count(distinct(Job.id)).filter(Job.is_active == True).label("active_jobs"),
+            func.count(Application.id).label("total_applications"),
+            *(
+                func.count(Application.id).filter(Application.status == status).label(f"{status}_applications")
+                for status in APPLICATION_STATUSES
+            )
+        )
+        .select_from(Job)
+        .outerjoin(Application, Application.job_id == Job.id)
+        .where(Job.employer_id == employer_id)
+    )
+    result = await db.execute(stmt)
+    return dict(result.one()._mapping)
+
+
+async def recompute_employer_statistics(db: AsyncSession, employer_id: int) -> dict:
+    """Overwrite an employer's counters with exact values (no commit)"""
+    stats = await compute_employer_statistics(db, employer_id)
+    stmt = insert(EmployerStats).values(employer_id=employer_id, **stats)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[EmployerStats.employer_id],
+        set_={**{column: getattr(stmt.excluded, column) for column in COUNTER_COLUMNS}, "updated_at": func.now()}
+    )
+    await db.execute(stmt)
+    return stats
+
+
+async def get_employer_counters(db: AsyncSession, employer_id: int) -> Optional[dict]:
+    """Read an employer's counters by primary key"""
+    stmt = select(EmployerStats).where(EmployerStats.employer_id == employer_id)
+    result = await db.execute(stmt)
+    row = result.scalar_one_or_none()
+    if row is None:
+        return None
+    return {column: getattr(row, column) for column in COUNTER_COLUMNS}
@@ -1,11 +1,22 @@
 # app/services/job_service.py
+import hashlib
+import json
 from datetime import datetime
-from sqlalchemy import select, or_
+from sqlalchemy import select, func, tuple_, case
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Optional, List
+from typing import Any, Awaitable, Callable, Iterable, Optional, List, Tuple
 
+from app.core.cache import cache
+from app.core.config import settings
+from app.core.pagination import decode_cursor, get_next_cursor
 from app.models.job import Job
-from app.schemas.job import JobCreate, JobUpdate
+from app.schemas.job import JobCreate, JobUpdate, JobRead
+from app.services.employer_stats_service import adjust_employer_counters
+
+# Cache tags: one per job, plus one for every list page and facet result
+JOB_TAG = "job:{}"
+JOB_LISTS_TAG = "jobs:lists"
+JOB_FACETS_TAG = "jobs:facets"
 
 
 async def create_job(
@@ -27,8 +38,17 @@ async def create_job(
         **job_dict
     )
     db.add(job)
+    await adjust_employer_counters(
+        db,
+        employer_id,
+        total_jobs=1,
+        active_jobs=1 if job.is_active else 0
+    )
     await db.commit()
     await db.refresh(job)
+    
+    # A new job can land on any list page
+    await cache.invalidate_tags(JOB_LISTS_TAG, JOB_FACETS_TAG)
     return job
 
 
@@ -39,19 +59,18 @@ async def get_job_by_id(db: AsyncSession, job_id: int) -> Optional[Job]:
     return result.scalar_one_or_none()
 
 
-async def get_jobs(
-    db: AsyncSession,
-    skip: int = 0,
-    limit: int = 100,
+def _apply_job_filters(
+    stmt,
     location: Optional[str] = None,
     job_type: Optional[str] = None,
     min_salary: Optional[float] = None,
     search: Optional[str] = None,
     active_only: bool = True
-) -> List[Job]:
-    """Get jobs with optional filters"""
-    stmt = select(Job)
-    
+):
+    """
+    Apply the public job filters to a select over Job.
+    Returns the filtered statement and the tsquery (None without search).
+    """
     # Filter by active status
     if active_only:
         stmt = stmt.where(Job.is_active == True)
@@ -68,23 +87,266 @@ async def get_jobs(
     if min_salary:
         stmt = stmt.where(Job.salary >= min_salary)
     
-    # Search in title, description, or requirements
+    # Full-text search in title, requirements and description (GIN index)
+    ts_query = None
     if search:
-        search_pattern = f"%{search}%"
-        stmt = stmt.where(
-            or_(
-                Job.title.ilike(search_pattern),
-                Job.description.ilike(search_pattern),
-                Job.requirements.ilike(search_pattern)
-            )
-        )
+        ts_query = func.websearch_to_tsquery('english', search)
+        stmt = stmt.where(Job.search_vector.op('@@')(ts_query))
+    
+    return stmt, ts_query
+
+
+async def get_jobs(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    location: Optional[str] = None,
+    job_type: Optional[str] = None,
+    min_salary: Optional[float] = None,
+    search: Optional[str] = None,
+    active_only: bool = True,
+    cursor: Optional[str] = None,
+    sort: str = "newest"
+) -> List[Job]:
+    """
+    Get jobs with optional filters (cursor takes precedence over skip)
+
+    `search` uses web-search syntax ("python -java", "\"data engineer\"")
+    against the weighted search_vector. sort="relevance" orders matches by
+    ts_rank_cd and pages with skip only.
+    """
+    stmt, ts_query = _apply_job_filters(
+        select(Job),
+        location=location,
+        job_type=job_type,
+        min_salary=min_salary,
+        search=search,
+        active_only=active_only
+    )
+    
+    # Relevance ranking has no stable keyset, so it pages with offset
+    if sort == "relevance" and ts_query is not None:
+        rank = func.ts_rank_cd(Job.search_vector, ts_query)
+        stmt = stmt.order_by(rank.desc(), Job.id.desc()).offset(skip).limit(limit)
+        result = await db.execute(stmt)
+        return list(result.scalars().all())
+    
     # Apply pagination and ordering
-    stmt = stmt.offset(skip).limit(limit).order_by(Job.created_at.desc())
+    if cursor:
+        created_at, last_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(Job.created_at, Job.id) < tuple_(created_at, last_id))
+    else:
+        stmt = stmt.offset(skip)
+    stmt = stmt.order_by(Job.created_at.desc(), Job.id.desc()).limit(limit)
     
     result = await db.execute(stmt)
     return list(result.scalars().all())
 
 
+# Salary facet buckets: (key, lower bound inclusive, upper bound exclusive)
+SALARY_BUCKETS = [
+    ("under_30k", None, 30000),
+    ("30k_60k", 30000, 60000),
+    ("60k_100k", 60000, 100000),
+    ("100k_150k", 100000, 150000),
+    ("150k_plus", 150000, None),
+]
+
+# Max values returned per location/job_type facet
+FACET_LIMIT = 20
+
+def _salary_bucket_expression():
+    """CASE expression mapping Job.salary to a SALARY_BUCKETS key"""
+    whens = [(Job.salary.is_(None), "unspecified")]
+    for key, _, upper in SALARY_BUCKETS:
+        if upper is not None:
+            whens.append((Job.salary < upper, key))
+    return case(*whens, else_=SALARY_BUCKETS[-1][0])
+
+
+def _filter_cache_key(prefix: str, **filters) -> str:
+    """Normalize filters so equivalent requests share a cache entry"""
+    normalized = {}
+    for name, value in filters.items():
+        if isinstance(value, str):
+            value = " ".join(value.lower().split()) or None
+        normalized[name] = value
+    digest = hashlib.sha1(json.dumps(normalized, sort_keys=True, default=str).encode()).hexdigest()
+    return f"{prefix}:{digest}"
+
+
+def _serialize_job(job: Job) -> dict:
+    return JobRead.model_validate(job).model_dump(mode="json")
+
+
+async def _read_through(
+    key: str,
+    ttl: int,
+    load: Callable[[], Awaitable[Any]],
+    tags: Callable[[Any], Iterable[str]]
+) -> Any:
+    """
+    Cached JSON value for key, or load() stored for ttl seconds under tags(value).
+    load() must read the primary: a replica read right after an invalidation
+    could write the pre-update row back for the whole TTL. None is not cached.
+    """
+    cached = await cache.get_json(key)
+    if cached is not None:
+        return cached
+    
+    value = await load()
+    if value is not None:
+        await cache.set_json(key, value, ttl=ttl, tags=tags(value))
+    return value
+
+
+async def get_job_cached(db: AsyncSession, job_id: int) -> Optional[dict]:
+    """Read-through cache for a single job, as a JobRead dict"""
+    async def load() -> Optional[dict]:
+        job = await get_job_by_id(db, job_id)
+        return _serialize_job(job) if job else None
+    
+    return await _read_through(
+        f"jobs:detail:{job_id}",
+        settings.JOB_CACHE_TTL,
+        load,
+        lambda _: [JOB_TAG.format(job_id)]
+    )
+
+
+async def get_jobs_cached(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    location: Optional[str] = None,
+    job_type: Optional[str] = None,
+    min_salary: Optional[float] = None,
+    search: Optional[str] = None,
+    cursor: Optional[str] = None,
+    sort: str = "newest",
+    cursor_scope: Optional[str] = None
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    Read-through cache for a page of public jobs.
+    Returns (JobRead dicts, next cursor). Each page is tagged with the ids of
+    the jobs on it so changing one job evicts only the pages showing it.
+    """
+    key = _filter_cache_key(
+        "jobs:list",
+        skip=None if cursor else skip,
+        limit=limit,
+        location=location,
+        job_type=job_type,
+        min_salary=min_salary,
+        search=search,
+        cursor=cursor,
+        sort=sort,
+        scope=cursor_scope
+    )
+    async def load() -> dict:
+        jobs = await get_jobs(
+            db=db,
+            skip=skip,
+            limit=limit,
+            location=location,
+            job_type=job_type,
+            min_salary=min_salary,
+            search=search,
+            cursor=cursor,
+            sort=sort
+        )
+        # Relevance pages with offset only
+        next_cursor = None if (sort == "relevance" and search) else get_next_cursor(jobs, limit, scope=cursor_scope)
+        return {"items": [_serialize_job(job) for job in jobs], "next_cursor": next_cursor}
+    
+    page = await _read_through(
+        key,
+        settings.JOB_LIST_CACHE_TTL,
+        load,
+        lambda page: [JOB_LISTS_TAG, *(JOB_TAG.format(item["id"]) for item in page["items"])]
+    )
+    return page["items"], page["next_cursor"]
+
+
+async def get_job_facets(
+    db: AsyncSession,
+    location: Optional[str] = None,
+    job_type: Optional[str] = None,
+    min_salary: Optional[float] = None,
+    search: Optional[str] = None,
+    active_only: bool = True
+) -> dict:
+    """
+    Count jobs per location, job type and salary bucket for a filter set.
+    All three facets come from one GROUPING SETS query and are cached
+    for JOB_FACETS_CACHE_TTL seconds.
+    """
+    cache_key = _filter_cache_key(
+        "jobs:facets",
+        location=location,
+        job_type=job_type,
+        min_salary=min_salary,
+        search=search,
+        active_only=active_only
+    )
+    async def load() -> dict:
+        filtered, _ = _apply_job_filters(
+            select(
+                Job.location.label("location"),
+                Job.job_type.label("job_type"),
+                _salary_bucket_expression().label("salary_bucket")
+            ),
+            location=location,
+            job_type=job_type,
+            min_salary=min_salary,
+            search=search,
+            active_only=active_only
+        )
+        # Bucket in a subquery so GROUP BY sees plain columns
+        sq = filtered.subquery()
+    
+        stmt = (
+            select(
+                sq.c.location,
+                sq.c.job_type,
+                sq.c.salary_bucket,
+                func.grouping(sq.c.location).label("g_location"),
+                func.grouping(sq.c.job_type).label("g_job_type"),
+                func.count().label("count")
+            )
+            .group_by(
+                func.grouping_sets(
+                    tuple_(sq.c.location),
+                    tuple_(sq.c.job_type),
+                    tuple_(sq.c.salary_bucket)
+                )
+            )
+        )
+        result = await db.execute(stmt)
+    
+        facets = {"location": [], "job_type": [], "salary": []}
+        for row in result:
+            if row.g_location == 0:
+                facets["location"].append({"value": row.location, "count": row.count})
+            elif row.g_job_type == 0:
+                facets["job_type"].append({"value": row.job_type, "count": row.count})
+            else:
+                facets["salary"].append({"value": row.salary_bucket, "count": row.count})
+    
+        for name in ("location", "job_type"):
+            facets[name] = sorted(facets[name], key=lambda f: f["count"], reverse=True)[:FACET_LIMIT]
+        bucket_order = {key: i for i, (key, _, _) in enumerate(SALARY_BUCKETS)}
+        facets["salary"].sort(key=lambda f: bucket_order.get(f["value"], len(bucket_order)))
+        return facets
+    
+    return await _read_through(
+        cache_key,
+        settings.JOB_FACETS_CACHE_TTL,
+        load,
+        lambda _: [JOB_FACETS_TAG]
+    )
+
+
 async def update_job(
     db: AsyncSession,
     job: Job,
@@ -92,16 +354,37 @@ async def update_job(
 ) -> Job:
     """Update a job posting"""
     update_data = job_update.model_dump(exclude_unset=True)
+    was_active = bool(job.is_active)
     
     for field, value in update_data.items():
         setattr(job, field, value)
     
+    if bool(job.is_active) != was_active:
+        await adjust_employer_counters(db, job.employer_id, active_jobs=1 if job.is_active else -1)
+    
     await db.commit()
     await db.refresh(job)
+    
+    # Evict the detail and every page showing this job. A reactivated job
+    # can appear on any page; other edits that make a job match new filters
+    # show up once those pages expire (JOB_LIST_CACHE_TTL).
+    tags = [JOB_TAG.format(job.id), JOB_FACETS_TAG]
+    if update_data.get("is_active") is True:
+        tags.append(JOB_LISTS_TAG)
+    await cache.invalidate_tags(*tags)
     return job
 
 
 async def delete_job(db: AsyncSession, job: Job) -> None:
     """Delete a job (delete completely from database)"""
+    job_id = job.id
+    await adjust_employer_counters(
+        db,
+        job.employer_id,
+        total_jobs=-1,
+        active_jobs=-1 if job.is_active else 0
+    )
     await db.delete(job)
-    await db.commit()
\ No newline at end of file
+    await db.commit()
+    
+    await cache.invalidate_tags(JOB_TAG.format(job_id), JOB_FACETS_TAG)
@@ -1,29 +1,63 @@
 # app/services/notification_helpers.py
+from datetime import datetime
+from sqlalchemy import func
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.notification import NotificationCreate
-from app.services.notification_service import create_notification
+from app.services.notification_service import add_notification, coalesced_notification_writes
 
 
-async def notify_employer_new_application(
-    db: AsyncSession,
+def new_application_group_key(job_id: int) -> str:
+    """Coalescing group of an employer's new-application notifications for one job"""
+    return f"new_application:job:{job_id}"
+
+
+def employer_new_application_writes(
     employer_user_id: int,
+    job_id: int,
     job_title: str,
     applicant_name: str,
-    application_id: int
+    application_id: int,
+    open_group,
+    version,
+    now: datetime
 ):
-    """Notify employer about new application"""
-    await create_notification(
-        db,
-        NotificationCreate(
-            user_id=employer_user_id,
-            title="New Application Received",
-            message=f"{applicant_name} applied to '{job_title}'",
-            notification_type="new_application",
-            related_id=application_id
-        )
+    """
+    (insert, update) notifying the employer about a new application, as CTEs
+    of the apply statement. Applications to the same job within the
+    coalescing window are merged into one notification (see
+    coalesced_notification_writes); open_group is its open_notification_group.
+    """
+    return coalesced_notification_writes(
+        new_application_notification(employer_user_id, job_title, applicant_name, application_id),
+        new_application_group_key(job_id),
+        lambda count: new_applications_message(count, job_title),
+        open_group,
+        version,
+        now
     )
 
 
+def new_application_notification(
+    employer_user_id: int,
+    job_title: str,
+    applicant_name: str,
+    application_id: int
+) -> NotificationCreate:
+    """New application notification for the employer"""
+    return NotificationCreate(
+        user_id=employer_user_id,
+        title="New Application Received",
+        message=f"{applicant_name} applied to '{job_title}'",
+        notification_type="new_application",
+        related_id=application_id
+    )
+
+
+def new_applications_message(count, job_title: str):
+    """Message of a coalesced new-application notification; count is a SQL expression"""
+    return func.concat(count, f" new applicants for '{job_title}'")
+
+
 async def notify_applicant_status_change(
     db: AsyncSession,
     applicant_user_id: int,
@@ -31,7 +65,7 @@ async def notify_applicant_status_change(
     new_status: str,
     application_id: int
 ):
-    """Notify applicant about application status change"""
+    """Notify applicant about application status change (committed with the caller's transaction)"""
     status_messages = {
         "reviewed": f"Your application for '{job_title}' is being reviewed",
         "accepted": f"Congratulations! Your application for '{job_title}' has been accepted",
@@ -40,7 +74,7 @@ async def notify_applicant_status_change(
     
     message = status_messages.get(new_status, f"Your application status for '{job_title}' has been updated to {new_status}")
     
-    await create_notification(
+    await add_notification(
         db,
         NotificationCreate(
             user_id=applicant_user_id,
@@ -59,8 +93,8 @@ async def notify_employer_application_withdrawn(
     applicant_name: str,
     application_id: int
 ):
-    """Notify employer that applicant withdrew their application"""
-    await create_notification(
+    """Notify employer that applicant withdrew their application (committed with the caller's transaction)"""
+    await add_notification(
         db,
         NotificationCreate(
             user_id=employer_user_id,
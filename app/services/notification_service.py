@@ -1,10 +1,346 @@
 # app/services/notification_service.py
-from sqlalchemy import select, func
+from sqlalchemy import select, update, delete, insert, func, tuple_, case, exists, false, literal
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Optional, List
+from sqlalchemy.orm.attributes import set_committed_value
+from typing import Any, Callable, Dict, Optional, List
+from datetime import datetime, timedelta, timezone
 
+from app.core.config import settings
+from app.core.pagination import decode_cursor
 from app.models.notification import Notification
+from app.models.notification_tombstone import NotificationTombstone
+from app.models.user import User
 from app.schemas.notification import NotificationCreate
+from app.services.outbox_service import NOTIFICATION_TOPIC, enqueue_notification
+
+async def add_notification(
+    db: AsyncSession,
+    notification_data: NotificationCreate,
+    group_key: Optional[str] = None
+) -> Notification:
+    """Add a notification and its WebSocket push to the session (no commit)"""
+    # Version bump, unread counter and the row itself in one statement
+    next_version = _next_version(notification_data.user_id, unread_delta=1).cte("next_version")
+    return await _insert_notification(db, notification_data, group_key, next_version)
+
+
+async def _insert_notification(
+    db: AsyncSession,
+    notification_data: NotificationCreate,
+    group_key: Optional[str],
+    next_version
+) -> Notification:
+    """Insert the row stamped with next_version's notification_version, and queue its push"""
+    stmt = notification_insert(
+        notification_data,
+        select(next_version.c.notification_version).scalar_subquery(),
+        group_key
+    ).add_cte(next_version)
+    result = await db.execute(select(Notification).from_statement(stmt))
+    notification = result.scalar_one()
+    
+    # Delivered by the outbox dispatcher once the transaction commits
+    enqueue_notification(db, notification.user_id, notification_payload(notification))
+    return notification
+
+
+def _notification_values(notification_data: NotificationCreate, version, group_key: Optional[str]) -> dict:
+    # Defaults spelled out: two INSERTs in one statement can't both have
+    # SQLAlchemy fill in a Python-side default for the same column
+    return {
+        "user_id": notification_data.user_id,
+        "title": notification_data.title,
+        "message": notification_data.message,
+        "notification_type": notification_data.notification_type,
+        "related_id": notification_data.related_id,
+        "group_key": group_key,
+        "version": version,
+        "is_read": False,
+        "event_count": 1,
+        "created_at": datetime.utcnow()
+    }
+
+
+def notification_insert(
+    notification_data: NotificationCreate,
+    version,
+    group_key: Optional[str] = None
+):
+    """INSERT of a notification stamped with `version` (a SQL expression), RETURNING the row"""
+    return (
+        insert(Notification)
+        .values(**_notification_values(notification_data, version, group_key))
+        .returning(*Notification.__table__.c)
+    )
+
+
+def notification_payload(notification: Notification) -> dict:
+    """WebSocket payload for a notification"""
+    return {
+        "id": notification.id,
+        "title": notification.title,
+        "message": notification.message,
+        "notification_type": notification.notification_type,
+        "related_id": notification.related_id,
+        "is_read": notification.is_read,
+        "event_count": notification.event_count,
+        "created_at": notification.created_at.isoformat(),
+        "updated_at": notification.updated_at.isoformat() if notification.updated_at else None,
+        "version": notification.version
+    }
+
+
+def _isoformat(column):
+    """datetime.isoformat() of a naive timestamp column, in SQL"""
+    return func.to_char(column, 'YYYY-MM-DD"T"HH24:MI:SS.US')
+
+
+def notification_push_rows(notifications):
+    """
+    (topic, payload) outbox rows pushing every notification a RETURNING CTE
+    wrote, for enqueue_rows; the payload is notification_payload() in SQL
+    """
+    n = notifications.c
+    return select(
+        literal(NOTIFICATION_TOPIC).label("topic"),
+        func.jsonb_build_object(
+            "user_id", n.user_id,
+            "notification", func.jsonb_build_object(
+                "id", n.id,
+                "title", n.title,
+                "message", n.message,
+                "notification_type", n.notification_type,
+                "related_id", n.related_id,
+                "is_read", n.is_read,
+                "event_count", n.event_count,
+                "created_at", _isoformat(n.created_at),
+                "updated_at", _isoformat(n.updated_at),
+                "version", n.version
+            ),
+            type_=JSONB
+        ).label("payload")
+    )
+
+
+def open_notification_group(user_id: int, group_key: str, now: datetime):
+    """
+    SELECT of the user's notification with group_key created less than
+    NOTIFICATION_COALESCE_WINDOW_SECONDS ago; never a row with coalescing off.
+    Run it while holding the user's row lock (see coalesced_notification_writes).
+    """
+    window = settings.NOTIFICATION_COALESCE_WINDOW_SECONDS
+    stmt = select(Notification.id, Notification.created_at, Notification.is_read).where(
+        Notification.user_id == user_id,
+        Notification.group_key == group_key,
+        Notification.created_at >= now - timedelta(seconds=window)
+    )
+    if window <= 0:
+        stmt = stmt.where(false())
+    return stmt.order_by(Notification.created_at.desc()).limit(1)
+
+
+def coalesced_unread_delta(open_group):
+    """Unread counter change of a coalesced write: 0 when it folds into an open unread notification"""
+    return case(
+        (exists(select(open_group.c.id).where(open_group.c.is_read.isnot(True))), 0),
+        else_=1
+    )
+
+
+def coalesced_notification_writes(
+    notification_data: NotificationCreate,
+    group_key: str,
+    aggregate_message: Callable[[Any], Any],
+    open_group,
+    version,
+    now: datetime
+):
+    """
+    (insert, update) for one statement that adds a notification, or folds it
+    into `open_group` (an open_notification_group CTE) if there is one. The
+    open notification is updated in place: event_count goes up, the message
+    becomes aggregate_message(new event_count as a SQL expression), and it is
+    unread again. Each RETURNs the row it wrote; exactly one writes.
+
+    The group is read from the statement's snapshot, so the caller must
+    already hold the user's row lock: concurrent events for the group then
+    queue on it, and the snapshot includes what the previous holder wrote.
+    """
+    no_group = ~exists(select(open_group.c.id))
+    values = _notification_values(notification_data, version, group_key)
+    columns = Notification.__table__.c
+    insert_stmt = (
+        insert(Notification)
+        .from_select(
+            list(values),
+            select(*(
+                value if name == "version" else literal(value, columns[name].type)
+                for name, value in values.items()
+            )).where(no_group)
+        )
+        .returning(*columns)
+    )
+    # Same id, new version: the client replaces the notification, and the
+    # update is a new event (its version is the SSE event id)
+    update_stmt = (
+        update(Notification)
+        .where(Notification.id == open_group.c.id, Notification.created_at == open_group.c.created_at)
+        .values(
+            version=version,
+            event_count=Notification.event_count + 1,
+            message=aggregate_message(Notification.event_count + 1),
+            related_id=notification_data.related_id,
+            is_read=False,
+            updated_at=now
+        )
+        .returning(*columns)
+    )
+    return insert_stmt, update_stmt
+
+
+async def adjust_unread_count(
+    db: AsyncSession,
+    user_id: int,
+    delta: int
+) -> None:
+    """Add delta to a user's unread counter (no commit)"""
+    if not delta:
+        return
+    stmt = (
+        update(User)
+        .where(User.id == user_id)
+        .values(unread_notifications=func.greatest(User.unread_notifications + delta, 0))
+        .execution_options(synchronize_session=False)
+    )
+    await db.execute(stmt)
+
+
+async def bump_notification_version(
+    db: AsyncSession,
+    user_id: int,
+    unread_delta: int = 0
+) -> int:
+    """
+    Take the user's next notification version (and adjust the unread counter
+    in the same statement). The users row stays locked until commit, so a
+    user's changes commit in version order. No commit.
+    """
+    stmt = _next_version(user_id, unread_delta).execution_options(synchronize_session=False)
+    result = await db.execute(stmt)
+    return result.scalar_one()
+
+
+def next_versions(unread_deltas: Dict[int, Any]):
+    """
+    UPDATE taking the next notification version of several users at once,
+    {user_id: unread counter delta (int or SQL expression)}, RETURNING
+    id and notification_version. Read one back with version_of().
+    """
+    delta = case(*((User.id == user_id, d) for user_id, d in unread_deltas.items()), else_=0)
+    return (
+        update(User)
+        .where(User.id.in_(list(unread_deltas)))
+        .values(
+            notification_version=User.notification_version + 1,
+            unread_notifications=func.greatest(User.unread_notifications + delta, 0)
+        )
+        .returning(User.id, User.notification_version)
+    )
+
+
+def version_of(versions, user_id: int):
+    """A user's version from a next_versions CTE"""
+    return select(versions.c.notification_version).where(versions.c.id == user_id).scalar_subquery()
+
+
+def _next_version(user_id: int, unread_delta: int = 0):
+    """
+    UPDATE taking a user's next notification version and adjusting the
+    unread counter, RETURNING the version
+    """
+    return (
+        update(User)
+        .where(User.id == user_id)
+        .values(
+            notification_version=User.notification_version + 1,
+            unread_notifications=func.greatest(User.unread_notifications + unread_delta, 0)
+        )
+        .returning(User.notification_version)
+    )
+
+
+async def _add_tombstones(
+    db: AsyncSession,
+    user_id: int,
+    notification_ids: List[int],
+    version: int
+) -> None:
+    """Record deleted notifications for delta sync (no commit)"""
+    if not notification_ids:
+        return
+    await db.execute(
+        insert(NotificationTombstone),
+        [
+            {"user_id": user_id, "notification_id": notification_id, "version": version}
+            for notification_id in notification_ids
+        ]
+    )
+
+
+async def get_notification_changes(
+    db: AsyncSession,
+    user_id: int,
+    since: int,
+    limit: int = 500
+) -> dict:
+    """
+    Notifications created, updated or read after version `since`, and the ids
+    deleted after it. Pages end on a whole version, so a bulk change is never
+    split; a single version bigger than `limit` asks the client to resync.
+    """
+    stmt = select(User.notification_version, User.notification_sync_floor).where(User.id == user_id)
+    result = await db.execute(stmt)
+    current, floor = result.one()
+    
+    # since=0 means the client has nothing yet (versions start at 1); below
+    # the floor, deletions it never saw were pruned (tombstones or whole partitions)
+    if since <= 0 or since < floor or since > current:
+        return {"version": current, "resync_required": True}
+    if since == current:
+        return {"version": current, "notifications": [], "deleted_ids": [], "has_more": False}
+    
+    stmt = (
+        select(Notification)
+        .where(Notification.user_id == user_id, Notification.version > since)
+        .order_by(Notification.version.asc(), Notification.id.asc())
+        .limit(limit + 1)
+    )
+    result = await db.execute(stmt)
+    notifications = list(result.scalars().all())
+    
+    upto, has_more = current, False
+    if len(notifications) > limit:
+        upto = notifications[limit].version - 1
+        notifications = [n for n in notifications if n.version <= upto]
+        if not notifications:
+            return {"version": current, "resync_required": True}
+        has_more = True
+    
+    stmt = select(NotificationTombstone.notification_id).where(
+        NotificationTombstone.user_id == user_id,
+        NotificationTombstone.version > since,
+        NotificationTombstone.version <= upto
+    )
+    result = await db.execute(stmt)
+    deleted_ids = list(result.scalars().all())
+    
+    return {
+        "version": upto,
+        "notifications": notifications,
+        "deleted_ids": deleted_ids,
+        "has_more": has_more
+    }
 
 
 async def create_notification(
@@ -12,32 +348,8 @@ async def create_notification(
     notification_data: NotificationCreate
 ) -> Notification:
     """Create a new notification and send via WebSocket"""
-    notification = Notification(
-        user_id=notification_data.user_id,
-        title=notification_data.title,
-        message=notification_data.message,
-        notification_type=notification_data.notification_type,
-        related_id=notification_data.related_id
-    )
-    db.add(notification)
+    notification = await add_notification(db, notification_data)
     await db.commit()
-    await db.refresh(notification)
-    
-    # Send real-time notification via WebSocket
-    from app.core.websocket_manager import manager
-    await manager.send_notification(
-        notification={
-            "id": notification.id,
-            "title": notification.title,
-            "message": notification.message,
-            "notification_type": notification.notification_type,
-            "related_id": notification.related_id,
-            "is_read": notification.is_read,
-            "created_at": notification.created_at.isoformat()
-        },
-        user_id=notification_data.user_id
-    )
-    
     return notification
 
 
@@ -46,26 +358,59 @@ async def get_user_notifications(
     user_id: int,
     skip: int = 0,
     limit: int = 100,
-    unread_only: bool = False
+    unread_only: bool = False,
+    cursor: Optional[str] = None,
+    since: Optional[datetime] = None
 ) -> List[Notification]:
-    """Get all notifications for a user"""
-    stmt = select(Notification).where(Notification.user_id == user_id)
+    """
+    Get a user's notifications (cursor takes precedence over skip).
+    Only notifications created after `since` are read, by default the last
+    NOTIFICATION_READ_WINDOW_DAYS days, so only recent partitions are scanned.
+    """
+    stmt = select(Notification).where(
+        Notification.user_id == user_id,
+        Notification.created_at >= read_window_start(since)
+    )
     
     if unread_only:
         stmt = stmt.where(Notification.is_read == False)
     
-    stmt = stmt.order_by(Notification.created_at.desc()).offset(skip).limit(limit)
+    if cursor:
+        created_at, last_id = decode_cursor(cursor)
+        stmt = stmt.where(
+            tuple_(Notification.created_at, Notification.id) < tuple_(created_at, last_id)
+        )
+    else:
+        stmt = stmt.offset(skip)
+    
+    stmt = stmt.order_by(Notification.created_at.desc(), Notification.id.desc()).limit(limit)
     
     result = await db.execute(stmt)
     return list(result.scalars().all())
 
 
+def read_window_start(since: Optional[datetime] = None) -> datetime:
+    """Oldest created_at a read looks at: `since` as naive UTC, by default NOTIFICATION_READ_WINDOW_DAYS ago"""
+    if since is None:
+        return datetime.utcnow() - timedelta(days=settings.NOTIFICATION_READ_WINDOW_DAYS)
+    if since.tzinfo is not None:
+        return since.astimezone(timezone.utc).replace(tzinfo=None)
+    return since
+
+
 async def get_notification_by_id(
     db: AsyncSession,
-    notification_id: int
+    notification_id: int,
+    user_id: int
 ) -> Optional[Notification]:
-    """Get a specific notification by ID"""
-    stmt = select(Notification).where(Notification.id == notification_id)
+    """
+    Get one of a user's notifications by ID, however old it is.
+    Another user's notification is reported as missing.
+    """
+    stmt = select(Notification).where(
+        Notification.id == notification_id,
+        Notification.user_id == user_id
+    )
     result = await db.execute(stmt)
     return result.scalar_one_or_none()
 
@@ -75,9 +420,28 @@ async def mark_notification_as_read(
     notification: Notification
 ) -> Notification:
     """Mark a notification as read"""
-    notification.is_read = True
+    version = await bump_notification_version(db, notification.user_id)
+    # Only the request that actually flips the row decrements the counter
+    stmt = (
+        update(Notification)
+        .where(
+            Notification.id == notification.id,
+            Notification.created_at == notification.created_at,
+            Notification.is_read == False
+        )
+        .values(is_read=True, version=version)
+        .returning(Notification.id)
+        .execution_options(synchronize_session=False)
+    )
+    result = await db.execute(stmt)
+    flipped = result.scalar_one_or_none() is not None
+    if flipped:
+        await adjust_unread_count(db, notification.user_id, -1)
     await db.commit()
-    await db.refresh(notification)
+    
+    set_committed_value(notification, "is_read", True)
+    if flipped:
+        set_committed_value(notification, "version", version)
     return notification
 
 
@@ -86,20 +450,80 @@ async def mark_all_notifications_as_read(
     user_id: int
 ) -> int:
     """Mark all notifications as read for a user"""
-    stmt = select(Notification).where(
-        Notification.user_id == user_id,
-        Notification.is_read == False
+    return len(await mark_notifications_as_read(db, user_id))
+
+
+def _bulk_conditions(
+    user_id: int,
+    ids: Optional[List[int]] = None,
+    before: Optional[datetime] = None
+) -> list:
+    """WHERE clause for a bulk action: all of a user's notifications, by ids, or before a timestamp"""
+    conditions = [Notification.user_id == user_id]
+    if ids is not None:
+        conditions.append(Notification.id.in_(ids))
+    if before is not None:
+        if before.tzinfo is not None:
+            # created_at is naive UTC
+            before = before.astimezone(timezone.utc).replace(tzinfo=None)
+        conditions.append(Notification.created_at < before)
+    return conditions
+
+
+async def mark_notifications_as_read(
+    db: AsyncSession,
+    user_id: int,
+    ids: Optional[List[int]] = None,
+    before: Optional[datetime] = None
+) -> List[int]:
+    """
+    Mark a user's unread notifications as read in one statement
+    (all of them, the given ids, or those created before a timestamp).
+    Returns the ids that were flipped.
+    """
+    version = await bump_notification_version(db, user_id)
+    stmt = (
+        update(Notification)
+        .where(*_bulk_conditions(user_id, ids, before), Notification.is_read == False)
+        .values(is_read=True, version=version)
+        .returning(Notification.id)
+        .execution_options(synchronize_session=False)
     )
     result = await db.execute(stmt)
-    notifications = result.scalars().all()
+    marked_ids = list(result.scalars().all())
     
-    count = 0
-    for notification in notifications:
-        notification.is_read = True
-        count += 1
+    await adjust_unread_count(db, user_id, -len(marked_ids))
+    await db.commit()
+    return marked_ids
+
+
+async def delete_notifications(
+    db: AsyncSession,
+    user_id: int,
+    ids: Optional[List[int]] = None,
+    before: Optional[datetime] = None
+) -> List[int]:
+    """
+    Delete a user's notifications in one statement (the given ids or those
+    created before a timestamp). Returns the deleted ids.
+    """
+    if ids is None and before is None:
+        raise ValueError("delete_notifications needs ids or before")
+    version = await bump_notification_version(db, user_id)
+    stmt = (
+        delete(Notification)
+        .where(*_bulk_conditions(user_id, ids, before))
+        .returning(Notification.id, Notification.is_read)
+        .execution_options(synchronize_session=False)
+    )
+    result = await db.execute(stmt)
+    rows = result.all()
     
+    await _add_tombstones(db, user_id, [row.id for row in rows], version)
+    unread_deleted = sum(1 for row in rows if row.is_read == False)
+    await adjust_unread_count(db, user_id, -unread_deleted)
     await db.commit()
-    return count
+    return [row.id for row in rows]
 
 
 async def delete_notification(
@@ -107,7 +531,20 @@ async def delete_notification(
     notification: Notification
 ) -> None:
     """Delete a notification"""
-    await db.delete(notification)
+    version = await bump_notification_version(db, notification.user_id)
+    stmt = (
+        delete(Notification)
+        .where(Notification.id == notification.id, Notification.created_at == notification.created_at)
+        .returning(Notification.is_read)
+        .execution_options(synchronize_session=False)
+    )
+    result = await db.execute(stmt)
+    row = result.one_or_none()
+    if row is not None:
+        await _add_tombstones(db, notification.user_id, [notification.id], version)
+    was_unread = row is not None and not row.is_read
+    if was_unread:
+        await adjust_unread_count(db, notification.user_id, -1)
     await db.commit()
 
 
@@ -115,11 +552,11 @@ async def get_unread_count(
     db: AsyncSession,
     user_id: int
 ) -> int:
-    """Get count of unread notifications"""
-    stmt = select(func.count(Notification.id)).where(
-        Notification.user_id == user_id,
-        Notification.is_read == False
-    )
+    """
+    Get count of unread notifications (the user's maintained counter).
+    A primary-key lookup, so it is read on the primary, uncached.
+    """
+    stmt = select(User.unread_notifications).where(User.id == user_id)
     result = await db.execute(stmt)
     return result.scalar() or 0
 
@@ -133,11 +570,20 @@ async def create_application_notification(
     """Helper to create application confirmation notification"""
     return await create_notification(
         db,
-        NotificationCreate(
-            user_id=user_id,
-            title="Application Submitted",
-            message=f"Your application for '{job_title}' has been submitted successfully.",
-            notification_type="application",
-            related_id=application_id
-        )
+        application_submitted_notification(user_id, job_title, application_id)
+    )
+
+
+def application_submitted_notification(
+    user_id: int,
+    job_title: str,
+    application_id: int
+) -> NotificationCreate:
+    """Application confirmation notification for the job seeker"""
+    return NotificationCreate(
+        user_id=user_id,
+        title="Application Submitted",
+        message=f"Your application for '{job_title}' has been submitted successfully.",
+        notification_type="application",
+        related_id=application_id
     )
\ No newline at end of file
@@ -0,0 +1,73 @@
+# app/services/outbox_service.py
+"""
+Transactional outbox
+
+Side effects are written as outbox rows in the caller's transaction, so they
+exist if and only if the change that caused them was committed. The outbox
+dispatcher (app.core.outbox_dispatcher) delivers them after the commit;
+requests never wait on Redis or the Celery broker.
+"""
+from datetime import datetime
+
+from sqlalchemy import event, insert, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.outbox import OutboxEvent
+
+NOTIFICATION_TOPIC = "notification"
+TASK_TOPIC = "task"
+
+# Session.info flag: this transaction wrote outbox rows
+_PENDING_KEY = "outbox_pending"
+
+
+def enqueue(db: AsyncSession, topic: str, payload: dict) -> OutboxEvent:
+    """Add an outbox event to the session (no commit)"""
+    outbox_event = OutboxEvent(topic=topic, payload=payload)
+    db.add(outbox_event)
+    db.info[_PENDING_KEY] = True
+    return outbox_event
+
+
+def enqueue_notification(db: AsyncSession, user_id: int, notification: dict) -> OutboxEvent:
+    """Queue a WebSocket notification push for a user"""
+    return enqueue(db, NOTIFICATION_TOPIC, {"user_id": user_id, "notification": notification})
+
+
+def enqueue_task(db: AsyncSession, task_name: str, *args) -> OutboxEvent:
+    """Queue a Celery task by name"""
+    return enqueue(db, TASK_TOPIC, task_payload(task_name, *args))
+
+
+def task_payload(task_name: str, *args) -> dict:
+    """Outbox payload of a Celery task call"""
+    return {"task": task_name, "args": list(args)}
+
+
+def enqueue_rows(db: AsyncSession, rows):
+    """
+    INSERT of outbox events from a SELECT of (topic, payload) rows, to run as a
+    data-modifying CTE of the write that causes them, so the events cost no
+    round trip of their own. No commit; the dispatcher is woken on commit.
+    """
+    db.info[_PENDING_KEY] = True
+    now = datetime.utcnow()
+    rows = rows.subquery("outbox_rows")
+    return insert(OutboxEvent).from_select(
+        ["topic", "payload", "attempts", "created_at", "available_at"],
+        select(rows.c.topic, rows.c.payload, literal(0), literal(now), literal(now))
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_dispatcher(session):
+    """Deliver right after the commit instead of on the next poll"""
+    if session.info.pop(_PENDING_KEY, False):
+        from app.core.outbox_dispatcher import outbox_dispatcher
+        outbox_dispatcher.wake()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session):
+    session.info.pop(_PENDING_KEY, None)
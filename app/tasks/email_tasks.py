@@ -1,16 +1,39 @@
 # app/tasks/email_tasks.py
-from app.core.celery_config import celery_app
-from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail, Email, To, Content
-from jinja2 import Environment, FileSystemLoader
+from app.core.celery_config import celery_app, broker_url
+from celery.signals import worker_init, worker_process_init
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+import json
 import os
+import re
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
 from pathlib import Path
+from typing import List, Optional
+
+import redis
+from sqlalchemy import text
 
 from app.core.config import settings
+from app.db.database import get_sync_engine
+from app.core.sendgrid_client import (
+    PERSONALIZATIONS_PER_REQUEST,
+    SendGridError,
+    get_sendgrid_client,
+    mail_payload,
+    personalization
+)
 
 # Setup Jinja2 for email templates
+# Templates only change with a deploy: no mtime checks on every render, and
+# compiled bytecode is shared on disk between worker processes and restarts
 template_dir = Path(__file__).parent.parent / "templates" / "emails"
-jinja_env = Environment(loader=FileSystemLoader(str(template_dir)))
+jinja_env = Environment(
+    loader=FileSystemLoader(str(template_dir)),
+    bytecode_cache=FileSystemBytecodeCache(settings.EMAIL_TEMPLATE_CACHE_DIR),
+    auto_reload=False
+)
 
 
 def render_email_template(template_name: str, context: dict) -> str:
@@ -19,6 +42,41 @@ def render_email_template(template_name: str, context: dict) -> str:
     return template.render(**context)
 
 
+@worker_init.connect
+@worker_process_init.connect
+def precompile_email_templates(**kwargs):
+    """Compile every email template at worker start instead of on the first email"""
+    for name in jinja_env.list_templates(extensions=["html"]):
+        jinja_env.get_template(name)
+
+
+def _send_or_retry(task, to_email: str, subject: str, html_content: str, retry_kwargs: Optional[dict] = None):
+    """Send one email; retry `task` on failures that may pass next time"""
+    try:
+        status_code = get_sendgrid_client().send(
+            mail_payload(html_content, [personalization(to_email, subject)])
+        )
+        
+        print(f"Email sent to {to_email}. Status code: {status_code}")
+        return {
+            "status": "success",
+            "status_code": status_code,
+            "to": to_email
+        }
+    
+    except SendGridError as e:
+        print(f"Error sending email to {to_email}: {str(e)}")
+        if not e.retryable:
+            # Rejected (bad address, bad payload): retrying won't help
+            return {"status": "failed", "status_code": e.status, "to": to_email}
+        raise task.retry(exc=e, kwargs=retry_kwargs)
+    
+    except Exception as e:
+        print(f"Error sending email to {to_email}: {str(e)}")
+        # Retry the task
+        raise task.retry(exc=e, kwargs=retry_kwargs)
+
+
 @celery_app.task(bind=True, max_retries=3, default_retry_delay=60)
 def send_email_task(self, to_email: str, subject: str, html_content: str):
     """
@@ -29,79 +87,303 @@ def send_email_task(self, to_email: str, subject: str, html_content: str):
         subject: Email subject
         html_content: HTML content of the email
     """
-    try:
-        message = Mail(
-            from_email=Email(settings.SENDGRID_FROM_EMAIL, settings.SENDGRID_FROM_NAME),
-            to_emails=To(to_email),
+    return _send_or_retry(self, to_email, subject, html_content)
+
+
+# Batched delivery (EMAIL_DELIVERY_MODE=batched)
+#
+# Messages wait in a Redis list for up to EMAIL_BATCH_WINDOW seconds. The
+# flush task groups them by template, sender and shared context, renders
+# each group once with substitution tags in place of the per-recipient
+# values, and sends the group as one request with a personalization per
+# recipient.
+
+EMAIL_BATCH_KEY = "jobden:email_batch"
+# A flush moves what it pops into its own processing list and registers the
+# list here, scored by the time its claim runs out. The list is deleted
+# when the flush finishes, with the retries pushed back in the same
+# transaction, so a flush that dies mid-run loses nothing: the next flush
+# requeues lists whose claim has expired.
+EMAIL_PROCESSING_KEY = "jobden:email_batch:processing:{}"
+EMAIL_CLAIMS_KEY = "jobden:email_batch:claims"
+# Set (NX) by whoever schedules the next flush and cleared when it starts, so
+# every message that lands in the buffer has a flush coming. It expires
+# EMAIL_FLUSH_MARKER_GRACE seconds after the flush was due in case the task
+# was lost; the next message then schedules another.
+EMAIL_FLUSH_SCHEDULED_KEY = "jobden:email_batch:flush_scheduled"
+EMAIL_FLUSH_MARKER_GRACE = 60
+
+# KEYS: buffer, processing list, claims; ARGV: count, claim deadline
+CLAIM_EMAILS_LUA = """
+local items = redis.call('LPOP', KEYS[1], ARGV[1])
+if not items then
+    return {}
+end
+redis.call('RPUSH', KEYS[2], unpack(items))
+redis.call('ZADD', KEYS[3], ARGV[2], KEYS[2])
+return items
+"""
+
+# KEYS: buffer, claims; ARGV: now
+REQUEUE_EXPIRED_CLAIMS_LUA = """
+local requeued = 0
+for _, key in ipairs(redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1])) do
+    while redis.call('LMOVE', key, KEYS[1], 'LEFT', 'RIGHT') do
+        requeued = requeued + 1
+    end
+    redis.call('ZREM', KEYS[2], key)
+end
+return requeued
+"""
+
+_email_buffer: Optional[redis.Redis] = None
+
+
+def get_email_buffer() -> redis.Redis:
+    global _email_buffer
+    if _email_buffer is None:
+        url = settings.REDIS_URL or broker_url or "redis://localhost:6379/0"
+        kwargs = {"ssl_cert_reqs": None} if url.startswith("rediss://") else {}
+        _email_buffer = redis.Redis.from_url(url, **kwargs)
+    return _email_buffer
+
+
+def schedule_email_flush(buffer: redis.Redis, countdown: int):
+    """Schedule flush_email_batch_task in `countdown` seconds unless one is already coming"""
+    if buffer.set(EMAIL_FLUSH_SCHEDULED_KEY, 1, nx=True, ex=countdown + EMAIL_FLUSH_MARKER_GRACE):
+        flush_email_batch_task.apply_async(countdown=countdown)
+
+
+def substitution_tag(key: str) -> str:
+    return f"-{key}-"
+
+
+def deliver_email(
+    task,
+    template_name: str,
+    to_email: str,
+    subject: str,
+    context: dict,
+    personal: dict,
+    html_content: Optional[str] = None,
+    batchable: bool = True
+):
+    """
+    Send one templated email from an email task, as EMAIL_DELIVERY_MODE says:
+        "batched"     - buffer it for flush_email_batch_task
+        "single_hop"  - render and send in this task; a retry of `task`
+                        carries the render (html_content) and resends it
+        "per_message" - render here, send from a separate send_email_task
+    `personal` holds the values that differ per recipient (plain {{ }}
+    interpolations in the template); everything in `context` is shared by
+    the emails a batch is grouped on.
+    """
+    mode = settings.EMAIL_DELIVERY_MODE
+    if mode == "batched" and not batchable:
+        mode = "single_hop"
+    
+    if mode != "batched":
+        if html_content is None:
+            html_content = render_email_template(template_name, {**context, **personal})
+        if mode == "single_hop":
+            retry_kwargs = {**(task.request.kwargs or {}), "html_content": html_content}
+            return _send_or_retry(task, to_email, subject, html_content, retry_kwargs)
+        send_email_task.delay(
+            to_email=to_email,
             subject=subject,
-            html_content=Content("text/html", html_content)
+            html_content=html_content
         )
-        
-        sg = SendGridAPIClient(settings.SENDGRID_API_KEY)
-        response = sg.send(message)
-        
-        print(f"Email sent to {to_email}. Status code: {response.status_code}")
-        return {
-            "status": "success",
-            "status_code": response.status_code,
-            "to": to_email
-        }
+        return
     
-    except Exception as e:
-        print(f"Error sending email to {to_email}: {str(e)}")
-        # Retry the task
-        raise self.retry(exc=e)
+    message = {
+        "template": template_name,
+        "from_email": settings.SENDGRID_FROM_EMAIL,
+        "from_name": settings.SENDGRID_FROM_NAME,
+        "to": to_email,
+        "subject": subject,
+        "context": context,
+        "personal": {key: str(value) for key, value in personal.items()},
+        "attempts": 0
+    }
+    buffer = get_email_buffer()
+    pending = buffer.rpush(EMAIL_BATCH_KEY, json.dumps(message))
+    if pending % PERSONALIZATIONS_PER_REQUEST == 0:
+        # A full request is waiting: don't hold it for the window
+        flush_email_batch_task.delay()
+    else:
+        # Not keyed on pending == 1: retries or a requeued claim may already
+        # sit in the buffer with no flush on its way for new mail
+        schedule_email_flush(buffer, settings.EMAIL_BATCH_WINDOW)
+
+
+def _batch_key(message: dict) -> tuple:
+    return (
+        message["template"],
+        message["from_email"],
+        message["from_name"],
+        json.dumps(message["context"], sort_keys=True)
+    )
+
+
+def _send_batch(messages: List[dict], retry: List[dict]) -> int:
+    """
+    Send messages that share a template, sender and context as one request.
+    If SendGrid rejects the request, each recipient is retried alone so one
+    bad address doesn't fail the rest. Retryable failures go to `retry`.
+    Returns how many were sent.
+    """
+    first = messages[0]
+    keys = {key for message in messages for key in message["personal"]}
+    html_content = render_email_template(
+        first["template"],
+        {**first["context"], **{key: substitution_tag(key) for key in keys}}
+    )
+    personalizations = [
+        personalization(
+            message["to"],
+            message["subject"],
+            {substitution_tag(key): message["personal"].get(key, "") for key in keys}
+        )
+        for message in messages
+    ]
+    
+    client = get_sendgrid_client()
+    try:
+        client.send(mail_payload(html_content, personalizations, first["from_email"], first["from_name"]))
+        return len(messages)
+    except SendGridError as e:
+        if e.retryable or len(messages) == 1:
+            print(f"Email batch of {len(messages)} failed: {e}")
+            if e.retryable:
+                retry.extend(messages)
+            return 0
+        print(f"Email batch of {len(messages)} rejected, sending one by one: {e}")
+    
+    sent = 0
+    for message, entry in zip(messages, personalizations):
+        try:
+            client.send(mail_payload(html_content, [entry], first["from_email"], first["from_name"]))
+            sent += 1
+        except SendGridError as e:
+            print(f"Error sending email to {message['to']}: {e}")
+            if e.retryable:
+                retry.append(message)
+    return sent
 
 
 @celery_app.task
-def send_welcome_email_task(email: str, name: str):
-    """Send welcome email to new users"""
-    html_content = render_email_template("welcome", {
-        "name": name,
-        "app_url": settings.APP_URL,
-        "app_name": settings.APP_NAME,
-        "support_email": settings.SENDGRID_FROM_EMAIL
-    })
+def flush_email_batch_task():
+    """Send everything waiting in the email batch buffer"""
+    buffer = get_email_buffer()
+    claim = buffer.register_script(CLAIM_EMAILS_LUA)
+    processing = EMAIL_PROCESSING_KEY.format(uuid.uuid4().hex)
+    # From here on, new messages need a flush of their own
+    buffer.delete(EMAIL_FLUSH_SCHEDULED_KEY)
+    
+    requeued = buffer.register_script(REQUEUE_EXPIRED_CLAIMS_LUA)(
+        keys=[EMAIL_BATCH_KEY, EMAIL_CLAIMS_KEY], args=[time.time()]
+    )
+    if requeued:
+        print(f"Requeued {requeued} emails from an interrupted flush")
+    
+    sent, retry = 0, []
+    while True:
+        raw = claim(
+            keys=[EMAIL_BATCH_KEY, processing, EMAIL_CLAIMS_KEY],
+            args=[PERSONALIZATIONS_PER_REQUEST, time.time() + settings.EMAIL_BATCH_CLAIM_TIMEOUT]
+        )
+        if not raw:
+            break
+        
+        groups = defaultdict(list)
+        for item in raw:
+            message = json.loads(item)
+            groups[_batch_key(message)].append(message)
+        for messages in groups.values():
+            try:
+                sent += _send_batch(messages, retry)
+            except Exception as e:
+                # Rendering or anything else unexpected: the group counts an attempt
+                print(f"Email batch of {len(messages)} failed: {e}")
+                retry.extend(messages)
+    
+    # Pushed back only after draining, so this run doesn't pick them up again
+    given_up = [message for message in retry if message["attempts"] + 1 >= settings.EMAIL_BATCH_MAX_ATTEMPTS]
+    for message in given_up:
+        print(f"Giving up on email to {message['to']} after {message['attempts'] + 1} attempts")
+    retry = [message for message in retry if message["attempts"] + 1 < settings.EMAIL_BATCH_MAX_ATTEMPTS]
+    for message in retry:
+        message["attempts"] += 1
+    
+    # Retries go back and the claim is released in one transaction
+    with buffer.pipeline(transaction=True) as pipe:
+        if retry:
+            pipe.rpush(EMAIL_BATCH_KEY, *(json.dumps(message) for message in retry))
+        pipe.delete(processing)
+        pipe.zrem(EMAIL_CLAIMS_KEY, processing)
+        pipe.execute()
+    if retry:
+        # A flush scheduled for new mail before then sends these along with it
+        backoff = 60 * max(message["attempts"] for message in retry)
+        flush_email_batch_task.apply_async(countdown=backoff)
     
-    send_email_task.delay(
-        to_email=email,
-        subject=f"Welcome to {settings.APP_NAME}!",
+    return {"status": "success", "sent": sent, "retrying": len(retry)}
+
+
+@celery_app.task(bind=True, max_retries=3, default_retry_delay=60)
+def send_welcome_email_task(self, email: str, name: str, html_content: Optional[str] = None):
+    """Send welcome email to new users"""
+    return deliver_email(
+        self,
+        "welcome",
+        email,
+        f"Welcome to {settings.APP_NAME}!",
+        {
+            "app_url": settings.APP_URL,
+            "app_name": settings.APP_NAME,
+            "support_email": settings.SENDGRID_FROM_EMAIL
+        },
+        {"name": name},
         html_content=html_content
     )
 
 
-@celery_app.task
+@celery_app.task(bind=True, max_retries=3, default_retry_delay=60)
 def send_application_confirmation_task(
+    self,
     email: str,
     applicant_name: str,
     job_title: str,
     company_name: str,
-    application_id: int
+    application_id: int,
+    html_content: Optional[str] = None
 ):
     """Send application confirmation email"""
-    html_content = render_email_template("application_confirmation", {
-        "applicant_name": applicant_name,
-        "job_title": job_title,
-        "company_name": company_name,
-        "application_id": application_id,
-        "app_url": settings.APP_URL
-    })
-    
-    send_email_task.delay(
-        to_email=email,
-        subject=f"Application Confirmation - {job_title}",
+    return deliver_email(
+        self,
+        "application_confirmation",
+        email,
+        f"Application Confirmation - {job_title}",
+        {
+            "job_title": job_title,
+            "company_name": company_name,
+            "app_url": settings.APP_URL
+        },
+        {"applicant_name": applicant_name, "application_id": application_id},
         html_content=html_content
     )
 
 
-@celery_app.task
+@celery_app.task(bind=True, max_retries=3, default_retry_delay=60)
 def send_application_status_update_task(
+    self,
     email: str,
     applicant_name: str,
     job_title: str,
     company_name: str,
     status: str,
-    application_id: int
+    application_id: int,
+    html_content: Optional[str] = None
 ):
     """Send application status update email"""
     status_messages = {
@@ -110,86 +392,235 @@ def send_application_status_update_task(
         "rejected": "Thank you for your interest"
     }
     
-    html_content = render_email_template("application_status", {
-        "applicant_name": applicant_name,
-        "job_title": job_title,
-        "company_name": company_name,
-        "status": status,
-        "status_message": status_messages.get(status, f"Status updated to {status}"),
-        "application_id": application_id,
-        "app_url": settings.APP_URL
-    })
-    
-    send_email_task.delay(
-        to_email=email,
-        subject=f"Application Update - {job_title}",
+    return deliver_email(
+        self,
+        "application_status",
+        email,
+        f"Application Update - {job_title}",
+        {
+            "job_title": job_title,
+            "company_name": company_name,
+            "status": status,
+            "status_message": status_messages.get(status, f"Status updated to {status}"),
+            "app_url": settings.APP_URL
+        },
+        {"applicant_name": applicant_name, "application_id": application_id},
         html_content=html_content
     )
 
 
-@celery_app.task
+@celery_app.task(bind=True, max_retries=3, default_retry_delay=60)
 def send_new_application_notification_task(
+    self,
     email: str,
     employer_name: str,
     applicant_name: str,
     job_title: str,
-    application_id: int
+    application_id: int,
+    html_content: Optional[str] = None
 ):
     """Send new application notification to employer"""
-    html_content = render_email_template("new_application", {
-        "employer_name": employer_name,
-        "applicant_name": applicant_name,
-        "job_title": job_title,
-        "application_id": application_id,
-        "app_url": settings.APP_URL
-    })
-    
-    send_email_task.delay(
-        to_email=email,
-        subject=f"New Application for {job_title}",
+    return deliver_email(
+        self,
+        "new_application",
+        email,
+        f"New Application for {job_title}",
+        {
+            "job_title": job_title,
+            "app_url": settings.APP_URL
+        },
+        {
+            "employer_name": employer_name,
+            "applicant_name": applicant_name,
+            "application_id": application_id
+        },
         html_content=html_content
     )
 
 
-@celery_app.task
+@celery_app.task(bind=True, max_retries=3, default_retry_delay=60)
 def send_application_withdrawn_notification_task(
+    self,
     email: str,
     employer_name: str,
     applicant_name: str,
     job_title: str,
-    application_id: int
+    application_id: int,
+    html_content: Optional[str] = None
 ):
     """Send application withdrawn notification to employer"""
-    html_content = render_email_template("application_withdrawn", {
-        "employer_name": employer_name,
-        "applicant_name": applicant_name,
-        "job_title": job_title,
-        "application_id": application_id,
-        "app_url": settings.APP_URL
-    })
-    
-    send_email_task.delay(
-        to_email=email,
-        subject=f"Application Withdrawn - {job_title}",
+    return deliver_email(
+        self,
+        "application_withdrawn",
+        email,
+        f"Application Withdrawn - {job_title}",
+        {
+            "job_title": job_title,
+            "app_url": settings.APP_URL
+        },
+        {
+            "employer_name": employer_name,
+            "applicant_name": applicant_name,
+            "application_id": application_id
+        },
         html_content=html_content
     )
 
 
-@celery_app.task
-def send_password_reset_email_task(email: str, name: str, reset_token: str):
+@celery_app.task(bind=True, max_retries=3, default_retry_delay=60)
+def send_password_reset_email_task(self, email: str, name: str, reset_token: str, html_content: Optional[str] = None):
     """Send password reset email"""
     reset_url = f"{settings.APP_URL}/reset-password?token={reset_token}"
     
-    html_content = render_email_template("password_reset", {
-        "name": name,
-        "reset_url": reset_url,
-        "app_url": settings.APP_URL,
-        "app_name": settings.APP_NAME,
-        "support_email": settings.SENDGRID_FROM_EMAIL
+    # Never batched: sent straight away, and the token isn't parked in Redis
+    return deliver_email(
+        self,
+        "password_reset",
+        email,
+        f"Password Reset Request - {settings.APP_NAME}",
+        {
+            "reset_url": reset_url,
+            "app_url": settings.APP_URL,
+            "app_name": settings.APP_NAME,
+            "support_email": settings.SENDGRID_FROM_EMAIL
+        },
+        {"name": name},
+        html_content=html_content,
+        batchable=False
+    )
+
+
+# Weekly digest
+#
+# send_weekly_digest streams job seekers with skills through a server-side
+# cursor, DIGEST_CHUNK_SIZE at a time. The matches for a whole chunk come
+# from one query (a LATERAL full-text search per user against the week's
+# new jobs), and each chunk is handed to send_weekly_digest_batch on the
+# bulk queue, which renders and sends. Only one chunk is held in memory.
+
+DIGEST_SEEKERS_SQL = text("""
+    SELECT u.id, u.email, p.full_name, p.skills
+    FROM users u
+    JOIN job_seeker_profiles p ON p.user_id = u.id
+    WHERE u.is_active = true
+      AND u.is_employer = false
+      AND coalesce(p.skills, '') <> ''
+    ORDER BY u.id
+""")
+
+DIGEST_MATCHES_SQL = text("""
+    SELECT s.user_id, m.id, m.title, m.location, m.job_type, ep.company_name
+    FROM unnest(CAST(:user_ids AS integer[]), CAST(:queries AS text[])) AS s(user_id, query)
+    CROSS JOIN LATERAL (
+        SELECT j.id, j.title, j.location, j.job_type, j.employer_id, j.created_at,
+               ts_rank(j.search_vector, to_tsquery('english', s.query)) AS rank
+        FROM jobs j
+        WHERE j.is_active = true
+          AND j.created_at >= :since
+          AND j.search_vector @@ to_tsquery('english', s.query)
+        ORDER BY rank DESC, j.created_at DESC
+        LIMIT :per_user
+    ) m
+    LEFT JOIN employer_profiles ep ON ep.id = m.employer_id
+    ORDER BY s.user_id, m.rank DESC, m.created_at DESC
+""")
+
+SKILL_SEPARATOR = re.compile(r"[,;\n]")
+SKILL_WORD = re.compile(r"[a-z0-9]+")
+DIGEST_MAX_SKILLS = 20
+
+
+def skills_tsquery(skills: str) -> Optional[str]:
+    """Profile skills as a tsquery: "Python, machine learning" -> "python | (machine & learning)" """
+    terms = []
+    for skill in SKILL_SEPARATOR.split(skills)[:DIGEST_MAX_SKILLS]:
+        words = SKILL_WORD.findall(skill.lower())
+        if len(words) == 1:
+            terms.append(words[0])
+        elif words:
+            terms.append("(" + " & ".join(words) + ")")
+    return " | ".join(terms) or None
+
+
+def _digest_entries(conn, seekers, since: datetime) -> List[dict]:
+    """Digest entries for one chunk of job seekers (those with at least one match)"""
+    queries = {row.id: skills_tsquery(row.skills) for row in seekers}
+    seekers = [row for row in seekers if queries[row.id]]
+    if not seekers:
+        return []
+    
+    matches = defaultdict(list)
+    result = conn.execute(DIGEST_MATCHES_SQL, {
+        "user_ids": [row.id for row in seekers],
+        "queries": [queries[row.id] for row in seekers],
+        "since": since,
+        "per_user": settings.DIGEST_JOBS_PER_USER
     })
+    for row in result:
+        matches[row.user_id].append({
+            "id": row.id,
+            "title": row.title,
+            "company_name": row.company_name,
+            "location": row.location,
+            "job_type": row.job_type
+        })
     
-    send_email_task.delay(
-        to_email=email,
-        subject=f"Password Reset Request - {settings.APP_NAME}",
-        html_content=html_content
-    )
\ No newline at end of file
+    return [
+        {"email": row.email, "name": row.full_name, "jobs": matches[row.id]}
+        for row in seekers
+        if matches[row.id]
+    ]
+
+
+@celery_app.task
+def send_weekly_digest():
+    """Queue weekly digests of new matching jobs for every job seeker with skills"""
+    since = datetime.utcnow() - timedelta(days=settings.DIGEST_LOOKBACK_DAYS)
+    users, recipients, batches = 0, 0, 0
+    
+    engine = get_sync_engine()
+    with engine.connect() as conn:
+        seekers = conn.execution_options(
+            stream_results=True,
+            yield_per=settings.DIGEST_CHUNK_SIZE
+        ).execute(DIGEST_SEEKERS_SQL)
+        
+        # partitions() needs the size: a Core result doesn't take it from yield_per
+        for chunk in seekers.partitions(settings.DIGEST_CHUNK_SIZE):
+            users += len(chunk)
+            entries = _digest_entries(conn, chunk, since)
+            if entries:
+                send_weekly_digest_batch.delay(entries)
+                recipients += len(entries)
+                batches += 1
+    
+    print(f"Weekly digest: {recipients} of {users} job seekers matched, {batches} batches queued")
+    return {"status": "success", "users": users, "recipients": recipients, "batches": batches}
+
+
+@celery_app.task(bind=True, max_retries=3, default_retry_delay=300)
+def send_weekly_digest_batch(self, entries: List[dict]):
+    """Render and send one chunk of weekly digests; only failed recipients are retried"""
+    client = get_sendgrid_client()
+    subject = f"Your weekly job matches - {settings.APP_NAME}"
+    sent, retry = 0, []
+    
+    for entry in entries:
+        html_content = render_email_template("weekly_digest", {
+            "name": entry["name"],
+            "jobs": entry["jobs"],
+            "app_url": settings.APP_URL,
+            "app_name": settings.APP_NAME
+        })
+        try:
+            client.send(mail_payload(html_content, [personalization(entry["email"], subject)]))
+            sent += 1
+        except SendGridError as e:
+            print(f"Error sending digest to {entry['email']}: {e}")
+            if e.retryable:
+                retry.append(entry)
+    
+    if retry and self.request.retries < self.max_retries:
+        raise self.retry(args=[retry])
+    
+    return {"status": "success", "sent": sent, "failed": len(entries) - sent}
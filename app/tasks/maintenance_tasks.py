@@ -0,0 +1,226 @@
+# app/tasks/maintenance_tasks.py
+import re
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+from app.core.celery_config import celery_app
+from app.core.config import settings
+from app.db.database import get_sync_engine
+
+# Next batch of users with notification changes since their last check.
+# Rows locked by an in-flight change are skipped and picked up next run.
+LOCK_UNREAD_BATCH_SQL = text("""
+    SELECT id
+    FROM users
+    WHERE id > :after
+      AND notification_version <> unread_checked_version
+    ORDER BY id
+    LIMIT :batch
+    FOR UPDATE SKIP LOCKED
+""")
+
+# Runs after the batch is locked, so its snapshot includes every change
+# committed to those users; writers adjust the counter under the same lock
+RECONCILE_UNREAD_BATCH_SQL = text("""
+    UPDATE users
+    SET unread_notifications = actual.unread,
+        unread_checked_version = users.notification_version
+    FROM (
+        SELECT u.id,
+               u.unread_notifications AS counted,
+               (SELECT count(*) FROM notifications n
+                WHERE n.user_id = u.id AND n.is_read = false) AS unread
+        FROM users u
+        WHERE u.id = ANY(:ids)
+    ) actual
+    WHERE users.id = actual.id
+    RETURNING users.id, actual.counted <> actual.unread AS drifted
+""")
+
+
+@celery_app.task
+def reconcile_unread_counts_task():
+    """
+    Recompute users.unread_notifications for users whose notifications
+    changed since the last run, UNREAD_RECONCILE_BATCH users per transaction.
+    """
+    engine = get_sync_engine()
+    checked, fixed, after = 0, 0, 0
+    while True:
+        with engine.begin() as conn:
+            ids = [row.id for row in conn.execute(
+                LOCK_UNREAD_BATCH_SQL, {"after": after, "batch": settings.UNREAD_RECONCILE_BATCH}
+            )]
+            if not ids:
+                break
+            rows = conn.execute(RECONCILE_UNREAD_BATCH_SQL, {"ids": ids}).all()
+        checked += len(ids)
+        fixed += sum(1 for row in rows if row.drifted)
+        after = ids[-1]
+    
+    if fixed:
+        print(f"Reconciled unread counts for {fixed} of {checked} users")
+    return {"status": "success", "checked": checked, "fixed": fixed}
+
+
+NOTIFICATION_PARTITION_PATTERN = re.compile(r"^notifications_p(\d{4})_(\d{2})$")
+DEFAULT_NOTIFICATION_PARTITION = "notifications_default"
+
+LIST_NOTIFICATION_PARTITIONS_SQL = text("""
+    SELECT c.relname AS name
+    FROM pg_inherits i
+    JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = 'notifications'::regclass
+""")
+
+# Unread rows about to leave with a partition come off the users' counters,
+# and clients that synced before the partition's last change must reload
+DISCOUNT_UNREAD_SQL = """
+    UPDATE users
+    SET unread_notifications = GREATEST(users.unread_notifications - gone.unread, 0),
+        notification_sync_floor = GREATEST(users.notification_sync_floor, gone.last_version)
+    FROM (
+        SELECT user_id,
+               count(*) FILTER (WHERE is_read = false) AS unread,
+               max(version) AS last_version
+        FROM {partition}
+        GROUP BY user_id
+    ) gone
+    WHERE users.id = gone.user_id
+"""
+
+
+# Rows that had no monthly partition when they were inserted
+COUNT_DEFAULT_PARTITION_SQL = text(f"""
+    SELECT count(*) AS rows, min(created_at) AS oldest, max(created_at) AS newest
+    FROM {DEFAULT_NOTIFICATION_PARTITION}
+""")
+
+DEFAULT_ROWS_IN_RANGE_SQL = text(f"""
+    SELECT EXISTS (
+        SELECT 1 FROM {DEFAULT_NOTIFICATION_PARTITION}
+        WHERE created_at >= :start AND created_at < :end
+    )
+""")
+
+
+def add_months(month_start: datetime, months: int) -> datetime:
+    """First day of the month `months` after month_start"""
+    index = month_start.year * 12 + month_start.month - 1 + months
+    return month_start.replace(year=index // 12, month=index % 12 + 1)
+
+
+def notification_partition_name(month_start: datetime) -> str:
+    return f"notifications_p{month_start.year:04d}_{month_start.month:02d}"
+
+
+@celery_app.task
+def maintain_notification_partitions_task():
+    """
+    Create the next NOTIFICATION_PARTITIONS_AHEAD monthly partitions and
+    drop (or detach, with NOTIFICATION_RETENTION_MODE=detach) partitions
+    older than NOTIFICATION_RETENTION_MONTHS. Warns when rows are sitting
+    in the default partition.
+    """
+    this_month = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    cutoff = add_months(this_month, -settings.NOTIFICATION_RETENTION_MONTHS)
+    
+    created, removed = [], []
+    engine = get_sync_engine()
+    with engine.begin() as conn:
+        existing = {row.name for row in conn.execute(LIST_NOTIFICATION_PARTITIONS_SQL)}
+        
+        for offset in range(settings.NOTIFICATION_PARTITIONS_AHEAD + 1):
+            month_start = add_months(this_month, offset)
+            name = notification_partition_name(month_start)
+            if name in existing:
+                continue
+            create_notification_partition(conn, name, month_start, add_months(month_start, 1))
+            created.append(name)
+        
+        for name in sorted(existing):
+            match = NOTIFICATION_PARTITION_PATTERN.match(name)
+            if not match:
+                continue
+            month_start = datetime(int(match.group(1)), int(match.group(2)), 1)
+            # Only whole months that ended before the cutoff
+            if add_months(month_start, 1) > cutoff:
+                continue
+            
+            conn.execute(text(DISCOUNT_UNREAD_SQL.format(partition=name)))
+            if settings.NOTIFICATION_RETENTION_MODE == "detach":
+                # Kept as a standalone table for archiving (pg_dump, then drop)
+                conn.execute(text(f"ALTER TABLE notifications DETACH PARTITION {name}"))
+            else:
+                conn.execute(text(f"DROP TABLE {name}"))
+            removed.append(name)
+    
+        default_rows = conn.execute(COUNT_DEFAULT_PARTITION_SQL).one()
+    
+    if created or removed:
+        print(f"Notification partitions created: {created}, removed: {removed}")
+    if default_rows.rows:
+        # Inserts outran the partitions ahead (or a clock is off): needs a look
+        print(
+            f"WARNING: {default_rows.rows} notifications in {DEFAULT_NOTIFICATION_PARTITION} "
+            f"(created_at {default_rows.oldest} to {default_rows.newest})"
+        )
+    return {"status": "success", "created": created, "removed": removed, "default_rows": default_rows.rows}
+
+
+def create_notification_partition(conn, name: str, start: datetime, end: datetime) -> None:
+    """
+    Create the partition for [start, end). Rows for that range already in the
+    default partition are moved into it first; Postgres refuses to add the
+    partition while the default one holds rows it would own.
+    """
+    bounds = f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    params = {"start": start, "end": end}
+    if not conn.execute(DEFAULT_ROWS_IN_RANGE_SQL, params).scalar():
+        conn.execute(text(f"CREATE TABLE {name} PARTITION OF notifications {bounds}"))
+        return
+    
+    conn.execute(text(f"CREATE TABLE {name} (LIKE notifications INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    conn.execute(text(f"""
+        WITH moved AS (
+            DELETE FROM {DEFAULT_NOTIFICATION_PARTITION}
+            WHERE created_at >= :start AND created_at < :end
+            RETURNING *
+        )
+        INSERT INTO {name} SELECT * FROM moved
+    """), params)
+    # Indexes and the primary key are created on it from the parent's
+    conn.execute(text(f"ALTER TABLE notifications ATTACH PARTITION {name} {bounds}"))
+
+
+# Delete old tombstones and raise each user's sync floor past them
+PRUNE_TOMBSTONES_SQL = text("""
+    WITH pruned AS (
+        DELETE FROM notification_tombstones
+        WHERE deleted_at < :cutoff
+        RETURNING user_id, version
+    )
+    UPDATE users
+    SET notification_sync_floor = GREATEST(users.notification_sync_floor, gone.last_version)
+    FROM (
+        SELECT user_id, max(version) AS last_version
+        FROM pruned
+        GROUP BY user_id
+    ) gone
+    WHERE users.id = gone.user_id
+    RETURNING users.id
+""")
+
+
+@celery_app.task
+def prune_notification_tombstones_task():
+    """Drop delta-sync tombstones older than NOTIFICATION_TOMBSTONE_DAYS"""
+    cutoff = datetime.utcnow() - timedelta(days=settings.NOTIFICATION_TOMBSTONE_DAYS)
+    engine = get_sync_engine()
+    with engine.begin() as conn:
+        users = [row.id for row in conn.execute(PRUNE_TOMBSTONES_SQL, {"cutoff": cutoff})]
+    
+    if users:
+        print(f"Pruned notification tombstones for {len(users)} users")
+    return {"status": "success", "users": len(users)}
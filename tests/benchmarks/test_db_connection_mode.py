@@ -0,0 +1,71 @@
+# tests/benchmarks/test_db_connection_mode.py
+"""
+GET /api/v1/jobs/ latency in each DB_CONNECTION_MODE
+
+transaction_pooler opens a connection per request and prepares nothing;
+direct reuses pooled connections and their prepared statements. Requests go
+through the ASGI app in-process, so the numbers are app + database time.
+"""
+import asyncio
+import statistics
+import time
+
+import httpx
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db.database import DATABASE_URL, create_db_engine, get_db
+from app.main import app
+
+pytestmark = pytest.mark.benchmark
+
+JOBS = 500
+REQUESTS = 1000
+CONCURRENCY = 10
+
+
+@pytest.mark.parametrize("mode", ["transaction_pooler", "direct"])
+async def test_list_jobs_latency(mode, seed, monkeypatch, report):
+    employer = seed.employer()
+    seed.jobs(employer["employer_id"], JOBS)
+
+    monkeypatch.setattr(settings, "DB_CONNECTION_MODE", mode)
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", CONCURRENCY)
+    engine = create_db_engine(DATABASE_URL)
+    sessions = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def get_mode_db():
+        async with sessions() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = get_mode_db
+    latencies = []
+
+    async def client_loop(client, count):
+        for _ in range(count):
+            started = time.perf_counter()
+            response = await client.get("/api/v1/jobs/", params={"limit": 20})
+            latencies.append((time.perf_counter() - started) * 1000)
+            assert response.status_code == 200
+
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            await client_loop(client, 20)  # warm up (and fill the pool in direct mode)
+            latencies.clear()
+            started = time.perf_counter()
+            await asyncio.gather(*(
+                client_loop(client, REQUESTS // CONCURRENCY) for _ in range(CONCURRENCY)
+            ))
+            elapsed = time.perf_counter() - started
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        await engine.dispose()
+
+    percentiles = statistics.quantiles(latencies, n=100)
+    report(
+        f"GET /api/v1/jobs/ [{mode}]: p50 {percentiles[49]:.1f} ms, p99 {percentiles[98]:.1f} ms, "
+        f"{len(latencies) / elapsed:.0f} req/s ({len(latencies)} requests, {CONCURRENCY} concurrent)"
+    )
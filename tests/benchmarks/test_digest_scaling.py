@@ -0,0 +1,95 @@
+# tests/benchmarks/test_digest_scaling.py
+"""
+Weekly digest at growing numbers of job seekers: Python heap peak
+(tracemalloc) and run time of send_weekly_digest, which should stay flat
+and grow linearly. Seekers and jobs are generated in Postgres; the queued
+batches are counted and dropped, as a broker would take them away.
+"""
+import time
+import tracemalloc
+
+import pytest
+from sqlalchemy import text
+
+from app.tasks.email_tasks import send_weekly_digest, send_weekly_digest_batch
+
+pytestmark = pytest.mark.benchmark
+
+SIZES = [10_000, 50_000, 100_000]
+JOBS = 500
+SKILLS = [
+    "python, django", "rust", "go, kubernetes", "java, spring", "react, typescript",
+    "machine learning", "sql, postgres", "cobol", "swift, ios", "data engineering",
+]
+TITLES = [
+    "Python Developer", "Rust Engineer", "Go Platform Engineer", "Java Backend Developer",
+    "React Frontend Engineer", "Machine Learning Engineer", "Postgres DBA", "iOS Developer",
+]
+
+
+def add_seekers(conn, first: int, last: int):
+    conn.execute(text("""
+        WITH new_users AS (
+            INSERT INTO users (email, hashed_password, is_active, is_employer)
+            SELECT 'seeker' || g || '@example.com', 'x', true, false
+            FROM generate_series(CAST(:first AS integer), CAST(:last AS integer)) g
+            RETURNING id
+        )
+        INSERT INTO job_seeker_profiles (user_id, full_name, skills)
+        SELECT id, 'Seeker ' || id, (CAST(:skills AS text[]))[1 + id % CAST(:count AS integer)]
+        FROM new_users
+    """), {"first": first, "last": last, "skills": SKILLS, "count": len(SKILLS)})
+
+
+def add_jobs(conn, employer_id: int):
+    conn.execute(text("""
+        INSERT INTO jobs (employer_id, title, description, location, job_type, is_active, created_at)
+        SELECT :employer_id, (CAST(:titles AS text[]))[1 + g % CAST(:count AS integer)] || ' ' || g,
+               'Build and run production services', 'Remote', 'Full-time', true,
+               (now() AT TIME ZONE 'utc') - g * interval '1 minute'
+        FROM generate_series(1, CAST(:jobs AS integer)) g
+    """), {"employer_id": employer_id, "titles": TITLES, "count": len(TITLES), "jobs": JOBS})
+
+
+def test_digest_memory_stays_flat_and_time_scales_linearly(seed, monkeypatch, report):
+    batches = []
+    monkeypatch.setattr(send_weekly_digest_batch, "delay", lambda entries: batches.append(len(entries)))
+    employer = seed.employer()
+    with seed.engine.begin() as conn:
+        add_jobs(conn, employer["employer_id"])
+        conn.execute(text("ANALYZE"))
+
+    runs, seeded = [], 0
+    for size in SIZES:
+        with seed.engine.begin() as conn:
+            add_seekers(conn, seeded + 1, size)
+            conn.execute(text("ANALYZE"))
+        seeded = size
+        batches.clear()
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        result = send_weekly_digest()
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert result["users"] == size
+        assert sum(batches) == result["recipients"]
+        runs.append((size, elapsed, peak))
+
+    for size, elapsed, peak in runs:
+        report(
+            f"Weekly digest, {size} seekers: {elapsed:.1f} s ({size / elapsed:.0f} users/s), "
+            f"peak Python heap {peak / 1024 / 1024:.1f} MiB"
+        )
+    (small, small_time, small_peak), (large, large_time, large_peak) = runs[0], runs[-1]
+    per_user = large_time / large
+    report(
+        f"Weekly digest scaling: {large // small}x the users took {large_time / small_time:.1f}x the time "
+        f"and {large_peak / small_peak:.2f}x the peak heap; 1M seekers extrapolate to "
+        f"{per_user * 1_000_000 / 60:.0f} min"
+    )
+    # One chunk in memory at a time, whatever the number of users
+    assert large_peak < small_peak * 1.5
+    assert per_user < 2 * small_time / small
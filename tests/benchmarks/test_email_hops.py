@@ -0,0 +1,72 @@
+# tests/benchmarks/test_email_hops.py
+"""
+End-to-end email latency and broker traffic: single_hop (render and send
+in the email task) versus per_message (render, then a send_email_task that
+carries the HTML through the broker).
+
+A Celery worker runs in a thread on the in-memory broker, one task at a
+time. Each email is published only after the previous one reached
+FakeSendGrid, so latency is publish-to-SendGrid on an idle worker. Broker
+traffic counts every task message published and the size of its body.
+"""
+import json
+import statistics
+import threading
+import time
+
+import pytest
+from celery.contrib.testing.worker import start_worker
+from celery.signals import before_task_publish
+
+from app.core.celery_config import celery_app
+from app.core.config import settings
+from app.tasks.email_tasks import send_application_confirmation_task
+
+pytestmark = pytest.mark.benchmark
+
+MESSAGES = 200
+LATENCY = 0.005
+
+
+@pytest.mark.parametrize("mode", ["per_message", "single_hop"])
+def test_email_latency_and_broker_traffic(mode, sendgrid, monkeypatch, report):
+    monkeypatch.setattr(settings, "EMAIL_DELIVERY_MODE", mode)
+    # The memory transport polls an empty queue once a second; Redis blocks instead
+    monkeypatch.setitem(celery_app.conf, "broker_transport_options", {"polling_interval": 0.001})
+    sendgrid.latency = LATENCY
+    arrived = threading.Event()
+    handle = sendgrid.handle
+
+    def handle_and_signal(payload):
+        status = handle(payload)
+        arrived.set()
+        return status
+    sendgrid.handle = handle_and_signal
+
+    published = []
+
+    def record(sender=None, body=None, **kwargs):
+        published.append(len(json.dumps(body)))
+    before_task_publish.connect(record, weak=False)
+
+    latencies = []
+    try:
+        with start_worker(celery_app, pool="solo", perform_ping_check=False, shutdown_timeout=10):
+            for i in range(MESSAGES):
+                arrived.clear()
+                started = time.perf_counter()
+                send_application_confirmation_task.delay(
+                    f"user{i}@example.com", f"User {i}", "Python Developer", "Acme", i
+                )
+                assert arrived.wait(timeout=10), "email never reached SendGrid"
+                latencies.append((time.perf_counter() - started) * 1000)
+    finally:
+        before_task_publish.disconnect(record)
+
+    assert len(sendgrid.recipients) == MESSAGES
+    latencies.sort()
+    report(
+        f"Email {mode}, {MESSAGES} messages: publish-to-SendGrid p50 {statistics.median(latencies):.1f} ms / "
+        f"p99 {latencies[int(len(latencies) * 0.99) - 1]:.1f} ms, "
+        f"per email {len(published) / MESSAGES:.0f} task message(s), {sum(published) / MESSAGES / 1024:.1f} KiB through the broker"
+    )
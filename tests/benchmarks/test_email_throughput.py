@@ -0,0 +1,62 @@
+# tests/benchmarks/test_email_throughput.py
+"""
+Email throughput against FakeSendGrid: batched delivery (buffer in Redis,
+one request per group of up to 1000 recipients) versus one request per
+message. Each request to the fake takes LATENCY seconds, standing in for
+the round trip to the real API.
+"""
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.tasks import email_tasks
+from app.tasks.email_tasks import flush_email_batch_task, send_application_confirmation_task
+
+pytestmark = pytest.mark.benchmark
+
+MESSAGES = 2000
+LATENCY = 0.005
+
+
+def send_all():
+    for i in range(MESSAGES):
+        send_application_confirmation_task(
+            f"user{i}@example.com", f"User {i}", "Python Developer", "Acme", i
+        )
+
+
+def test_batched_delivery(fake_redis, sendgrid, monkeypatch, report):
+    monkeypatch.setattr(settings, "EMAIL_DELIVERY_MODE", "batched")
+    monkeypatch.setattr(email_tasks, "_email_buffer", fake_redis)
+    monkeypatch.setattr(flush_email_batch_task, "delay", lambda: None)
+    monkeypatch.setattr(flush_email_batch_task, "apply_async", lambda countdown=None: None)
+    sendgrid.latency = LATENCY
+
+    started = time.perf_counter()
+    send_all()
+    buffered = time.perf_counter() - started
+    result = flush_email_batch_task()
+    elapsed = time.perf_counter() - started
+
+    assert result["sent"] == MESSAGES
+    report(
+        f"Batched email, {MESSAGES} messages: {MESSAGES / elapsed:.0f} msgs/s "
+        f"({len(sendgrid.requests)} SendGrid requests, buffering {buffered * 1000:.0f} ms, "
+        f"total {elapsed * 1000:.0f} ms)"
+    )
+
+
+def test_per_message_delivery(sendgrid, monkeypatch, report):
+    monkeypatch.setattr(settings, "EMAIL_DELIVERY_MODE", "single_hop")
+    sendgrid.latency = LATENCY
+
+    started = time.perf_counter()
+    send_all()
+    elapsed = time.perf_counter() - started
+
+    assert len(sendgrid.recipients) == MESSAGES
+    report(
+        f"Per-message email, {MESSAGES} messages: {MESSAGES / elapsed:.0f} msgs/s "
+        f"({len(sendgrid.requests)} SendGrid requests, total {elapsed * 1000:.0f} ms)"
+    )
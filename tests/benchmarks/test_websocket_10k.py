@@ -0,0 +1,122 @@
+# tests/benchmarks/test_websocket_10k.py
+"""
+Fan-out to 10k simulated WebSocket connections, 1% of them slow
+
+Compares the queued fan-out (one serialization per message, a bounded send
+queue and writer task per socket) with sending to each socket in turn, the
+way ConnectionManager used to. Slow sockets take SLOW_SEND_SECONDS per send,
+so they fall behind the broadcasts and should be closed as slow consumers;
+the serial baseline waits for each of them and only runs a few messages.
+"""
+import asyncio
+import json
+import statistics
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.core.websocket_manager import ConnectionManager
+
+pytestmark = pytest.mark.benchmark
+
+CONNECTIONS = 10_000
+SLOW = 100
+MESSAGES = 50
+BASELINE_MESSAGES = 3
+SLOW_SEND_SECONDS = 0.05
+
+
+class BenchSocket:
+    def __init__(self, slow: bool, tracker):
+        self.slow = slow
+        self.tracker = tracker
+        self.received = 0
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        if self.slow:
+            await asyncio.sleep(SLOW_SEND_SECONDS)
+            return
+        self.tracker.delivered(self.received)
+        self.received += 1
+
+    async def close(self, code: int = 1000):
+        pass
+
+
+class Tracker:
+    """When the last healthy socket got each message"""
+
+    def __init__(self, healthy: int, messages: int):
+        self.healthy = healthy
+        self.counts = [0] * messages
+        self.completed_at = [None] * messages
+        self.all_done = asyncio.Event()
+
+    def delivered(self, index: int):
+        self.counts[index] += 1
+        if self.counts[index] == self.healthy:
+            self.completed_at[index] = time.perf_counter()
+            if index == len(self.counts) - 1:
+                self.all_done.set()
+
+
+def message(n: int) -> dict:
+    return {"type": "announcement", "data": {"n": n, "title": "Scheduled maintenance", "body": "x" * 200}}
+
+
+async def test_queued_fan_out_to_10k_connections(monkeypatch, report):
+    monkeypatch.setattr(settings, "WEBSOCKET_SEND_QUEUE_SIZE", 8)
+    monkeypatch.setattr(settings, "WEBSOCKET_SLOW_CONSUMER", "disconnect")
+    tracker = Tracker(CONNECTIONS - SLOW, MESSAGES)
+    manager = ConnectionManager()
+    sockets = [BenchSocket(slow=i % (CONNECTIONS // SLOW) == 0, tracker=tracker) for i in range(CONNECTIONS)]
+
+    started = time.perf_counter()
+    for user_id, websocket in enumerate(sockets):
+        await manager.connect(websocket, user_id)
+    connect_seconds = time.perf_counter() - started
+
+    sent_at = []
+    started = time.perf_counter()
+    for n in range(MESSAGES):
+        sent_at.append(time.perf_counter())
+        await manager.broadcast_to_all(message(n))
+        await asyncio.sleep(0)
+    await asyncio.wait_for(tracker.all_done.wait(), timeout=60)
+    elapsed = time.perf_counter() - started
+    await manager.close()
+
+    latencies = [(done - sent) * 1000 for done, sent in zip(tracker.completed_at, sent_at)]
+    assert manager.slow_consumers_closed == SLOW
+    report(
+        f"Queued fan-out, {CONNECTIONS} sockets ({SLOW} slow), {MESSAGES} broadcasts: "
+        f"all healthy sockets served in {elapsed * 1000:.0f} ms, "
+        f"{tracker.healthy * MESSAGES / elapsed:.0f} deliveries/s, "
+        f"per-message p50 {statistics.median(latencies):.1f} ms / max {max(latencies):.1f} ms, "
+        f"{manager.slow_consumers_closed} slow consumers closed, connect {connect_seconds * 1000:.0f} ms"
+    )
+
+
+async def test_serial_send_baseline(report):
+    tracker = Tracker(CONNECTIONS - SLOW, BASELINE_MESSAGES)
+    sockets = [BenchSocket(slow=i % (CONNECTIONS // SLOW) == 0, tracker=tracker) for i in range(CONNECTIONS)]
+
+    latencies = []
+    started = time.perf_counter()
+    for n in range(BASELINE_MESSAGES):
+        sent = time.perf_counter()
+        # Old behaviour: serialize per socket, await each send in turn
+        for websocket in sockets:
+            await websocket.send_text(json.dumps(message(n)))
+        latencies.append((time.perf_counter() - sent) * 1000)
+    elapsed = time.perf_counter() - started
+
+    report(
+        f"Serial send baseline, {CONNECTIONS} sockets ({SLOW} slow), {BASELINE_MESSAGES} broadcasts: "
+        f"{elapsed * 1000:.0f} ms, {tracker.healthy * BASELINE_MESSAGES / elapsed:.0f} deliveries/s, "
+        f"per-message p50 {statistics.median(latencies):.1f} ms / max {max(latencies):.1f} ms"
+    )
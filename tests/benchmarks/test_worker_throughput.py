@@ -0,0 +1,58 @@
+# tests/benchmarks/test_worker_throughput.py
+"""
+Email throughput of a worker on the thread pool (the "io" profile) versus
+the solo pool, against FakeSendGrid answering after LATENCY seconds. A
+burst of single-hop emails is published up front and timed until the last
+one reaches SendGrid.
+
+The in-memory broker runs the worker's blocking consume loop, which sits
+out a 2 s poll whenever the prefetch window is full (a Redis broker is
+woken as soon as a slot frees up), so the whole burst is prefetched.
+"""
+import threading
+import time
+
+import pytest
+from celery.contrib.testing.worker import start_worker
+
+from app.core.celery_config import celery_app
+from app.core.config import settings
+from app.tasks.email_tasks import send_application_confirmation_task
+
+pytestmark = pytest.mark.benchmark
+
+MESSAGES = 200
+LATENCY = 0.05
+
+
+@pytest.mark.parametrize("pool, concurrency", [("solo", 1), ("threads", 20)])
+def test_email_throughput(pool, concurrency, sendgrid, monkeypatch, report):
+    monkeypatch.setattr(settings, "EMAIL_DELIVERY_MODE", "single_hop")
+    monkeypatch.setitem(celery_app.conf, "broker_transport_options", {"polling_interval": 0.001})
+    monkeypatch.setitem(celery_app.conf, "worker_prefetch_multiplier", MESSAGES // concurrency)
+    sendgrid.latency = LATENCY
+    done = threading.Event()
+    handle = sendgrid.handle
+
+    def handle_and_count(payload):
+        status = handle(payload)
+        if len(sendgrid.requests) == MESSAGES:
+            done.set()
+        return status
+    sendgrid.handle = handle_and_count
+
+    with start_worker(
+        celery_app, pool=pool, concurrency=concurrency, perform_ping_check=False, shutdown_timeout=30
+    ):
+        started = time.perf_counter()
+        for i in range(MESSAGES):
+            send_application_confirmation_task.delay(
+                f"user{i}@example.com", f"User {i}", "Python Developer", "Acme", i
+            )
+        assert done.wait(timeout=60), f"only {len(sendgrid.requests)} emails reached SendGrid"
+        elapsed = time.perf_counter() - started
+
+    report(
+        f"Worker pool={pool} concurrency={concurrency}, {MESSAGES} emails at {LATENCY * 1000:.0f} ms "
+        f"SendGrid latency: {MESSAGES / elapsed:.0f} emails/s ({elapsed * 1000:.0f} ms)"
+    )
@@ -0,0 +1,295 @@
+# tests/conftest.py
+"""
+Shared fixtures
+
+Settings are read when app modules are imported, so the test environment
+is set here, before anything under app/ is imported.
+
+- Postgres: tests that use `database` run against TEST_DATABASE_URL (a
+  throwaway database: every table is dropped and recreated) and are
+  skipped when it is not set.
+- Redis: fakeredis in-process (Lua included), or a fakeredis TCP server
+  for tests that need a real socket across processes. TEST_REDIS_URL
+  points those at a real Redis instead.
+- SendGrid: a local HTTP server speaking just enough of /v3/mail/send.
+"""
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+import pytest
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+TEST_REDIS_URL = os.environ.get("TEST_REDIS_URL")
+
+os.environ["DATABASE_URL"] = TEST_DATABASE_URL or "postgresql://postgres@localhost/jobden_test"
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ["DB_CONNECTION_MODE"] = "transaction_pooler"  # no pooled connections across test event loops
+os.environ["CACHE_BACKEND"] = "none"
+os.environ["WEBSOCKET_BACKEND"] = "local"
+os.environ["OUTBOX_DISPATCHER_ENABLED"] = "false"
+os.environ["CELERY_BROKER_URL"] = "memory://"
+os.environ["CELERY_RESULT_BACKEND"] = "cache+memory://"
+os.environ.pop("REDIS_URL", None)
+
+
+# Postgres
+
+@pytest.fixture(scope="session")
+def database():
+    """Sync engine on a freshly created schema (models plus the DEFAULT notifications partition)"""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    from sqlalchemy import text
+    import app.models  # noqa: F401 (registers every table)
+    from app.db.database import Base, get_sync_engine
+
+    engine = get_sync_engine()
+    with engine.begin() as conn:
+        Base.metadata.drop_all(conn)
+        Base.metadata.create_all(conn)
+        conn.execute(text("CREATE TABLE notifications_default PARTITION OF notifications DEFAULT"))
+    return engine
+
+
+@pytest.fixture
+def clean_database(database):
+    """Empty every table before the test"""
+    from sqlalchemy import text
+    from app.db.database import Base
+
+    tables = ", ".join(table.name for table in Base.metadata.sorted_tables)
+    with database.begin() as conn:
+        conn.execute(text(f"TRUNCATE {tables} RESTART IDENTITY CASCADE"))
+    return database
+
+
+@pytest.fixture
+async def db(clean_database):
+    """Async session on the test database"""
+    from app.db.database import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+class Seed:
+    """Inserts fixture rows over the sync engine and returns their ids"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self._emails = 0
+
+    def _insert(self, model, **values) -> int:
+        from sqlalchemy import insert
+        with self.engine.begin() as conn:
+            return conn.execute(insert(model).values(**values).returning(model.id)).scalar_one()
+
+    def user(self, is_employer: bool = False, **values) -> int:
+        from app.models.user import User
+        self._emails += 1
+        values.setdefault("email", f"user{self._emails}@example.com")
+        values.setdefault("is_active", True)
+        return self._insert(User, hashed_password="x", is_employer=is_employer, **values)
+
+    def employer(self, company_name: str = "Acme") -> Dict[str, int]:
+        """An employer user and profile: {"user_id", "employer_id"}"""
+        from app.models.employer_profile import EmployerProfile
+        user_id = self.user(is_employer=True)
+        return {
+            "user_id": user_id,
+            "employer_id": self._insert(EmployerProfile, user_id=user_id, company_name=company_name),
+        }
+
+    def job_seeker(self, full_name: str = "Jane Doe", skills: str = "python", **values) -> int:
+        from app.models.job_seeker_profile import JobSeekerProfile
+        user_id = self.user(**values)
+        self._insert(JobSeekerProfile, user_id=user_id, full_name=full_name, skills=skills)
+        return user_id
+
+    def job(self, employer_id: int, title: str = "Python Developer", **values) -> int:
+        from app.models.job import Job
+        values.setdefault("description", "Build APIs")
+        values.setdefault("is_active", True)
+        return self._insert(Job, employer_id=employer_id, title=title, **values)
+
+    def notification(self, user_id: int, **values) -> int:
+        from app.models.notification import Notification
+        values.setdefault("title", "Application update")
+        values.setdefault("message", "Your application was reviewed")
+        values.setdefault("is_read", False)
+        values.setdefault("version", 1)
+        return self._insert(Notification, user_id=user_id, **values)
+
+    def jobs(self, employer_id: int, count: int):
+        """Many active jobs in one statement"""
+        from sqlalchemy import insert
+        from app.models.job import Job
+        with self.engine.begin() as conn:
+            conn.execute(insert(Job), [
+                {
+                    "employer_id": employer_id,
+                    "title": f"Python Developer {i}",
+                    "description": "Build APIs with FastAPI and Postgres",
+                    "location": "Remote",
+                    "job_type": "Full-time",
+                    "is_active": True,
+                }
+                for i in range(count)
+            ])
+
+
+@pytest.fixture
+def seed(clean_database) -> Seed:
+    return Seed(clean_database)
+
+
+@pytest.fixture
+async def client(clean_database):
+    """HTTP client calling the app in-process"""
+    import httpx
+    from app.core.deps import _user_auth_cache
+    from app.main import app
+
+    _user_auth_cache.clear()  # ids repeat after every TRUNCATE
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+@pytest.fixture
+def auth_headers():
+    """auth_headers(user_id, **claims): Authorization header with a fresh access token"""
+    from app.core.security import create_access_token
+
+    def make(user_id: int, **claims) -> Dict[str, str]:
+        token = create_access_token(str(user_id), claims={"tv": 0, **claims})
+        return {"Authorization": f"Bearer {token}"}
+    return make
+
+
+# Redis
+
+@pytest.fixture
+def fake_redis():
+    """In-process Redis (bytes responses, like redis.Redis defaults)"""
+    import fakeredis
+    return fakeredis.FakeRedis()
+
+
+@pytest.fixture(scope="session")
+def redis_url():
+    """URL of a Redis reachable from other processes"""
+    if TEST_REDIS_URL:
+        yield TEST_REDIS_URL
+        return
+    from fakeredis import TcpFakeServer
+
+    server = TcpFakeServer(("127.0.0.1", 0), server_type="redis")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    yield f"redis://{host}:{port}/0"
+    server.shutdown()
+
+
+# SendGrid
+
+class FakeSendGrid:
+    """
+    /v3/mail/send stand-in. Records each accepted request; `reject` holds
+    recipients SendGrid refuses (400 for any request that includes one) and
+    `responses` queues statuses to answer the next requests with; `latency`
+    is how long each request takes, in seconds.
+    """
+
+    def __init__(self):
+        self.requests: List[dict] = []
+        self.reject: set = set()
+        self.responses: List[int] = []
+        self.latency = 0.0
+        self.lock = threading.Lock()
+        self.url = None
+
+    @property
+    def recipients(self) -> List[str]:
+        with self.lock:
+            return [
+                entry["to"][0]["email"]
+                for payload in self.requests
+                for entry in payload["personalizations"]
+            ]
+
+    def handle(self, payload: dict) -> int:
+        with self.lock:
+            if self.responses:
+                status = self.responses.pop(0)
+                if status >= 300:
+                    return status
+            emails = {entry["to"][0]["email"] for entry in payload["personalizations"]}
+            if emails & self.reject:
+                return 400
+            self.requests.append(payload)
+            return 202
+
+
+@pytest.fixture
+def sendgrid(monkeypatch):
+    """A running FakeSendGrid that the app's SendGrid client points at"""
+    from app.core import sendgrid_client
+    from app.core.config import settings
+
+    fake = FakeSendGrid()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            if fake.latency:
+                time.sleep(fake.latency)
+            status = fake.handle(json.loads(body)) if self.path == "/v3/mail/send" else 404
+            reply = b"" if status == 202 else json.dumps({"errors": [{"message": "fake"}]}).encode()
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(reply)))
+            self.end_headers()
+            self.wfile.write(reply)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    fake.url = f"http://{host}:{port}"
+
+    monkeypatch.setattr(settings, "SENDGRID_API_URL", fake.url)
+    monkeypatch.setattr(settings, "SENDGRID_API_KEY", "test-key")
+    monkeypatch.setattr(settings, "SENDGRID_FROM_EMAIL", "noreply@example.com")
+    monkeypatch.setattr(sendgrid_client, "_client", None)
+    yield fake
+    server.shutdown()
+    server.server_close()
+
+
+# Benchmarks
+
+_benchmark_results: List[str] = []
+
+
+@pytest.fixture
+def report():
+    """report(line): add a line to the benchmark summary printed at the end of the run"""
+    return _benchmark_results.append
+
+
+def pytest_terminal_summary(terminalreporter):
+    if _benchmark_results:
+        terminalreporter.section("benchmarks")
+        for line in _benchmark_results:
+            terminalreporter.write_line(line)
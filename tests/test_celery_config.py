@@ -0,0 +1,31 @@
+# tests/test_celery_config.py
+import pytest
+
+from app.core.celery_config import celery_app
+
+
+def queue_of(task_name: str) -> str:
+    return celery_app.amqp.router.route({}, task_name)["queue"].name
+
+
+@pytest.mark.parametrize("task_name, queue", [
+    ("app.tasks.email_tasks.send_password_reset_email_task", "transactional"),
+    ("app.tasks.email_tasks.send_application_confirmation_task", "transactional"),
+    ("app.tasks.email_tasks.send_email_task", "transactional"),
+    ("app.tasks.email_tasks.flush_email_batch_task", "transactional"),
+    ("app.tasks.email_tasks.send_weekly_digest", "bulk"),
+    ("app.tasks.email_tasks.send_weekly_digest_batch", "bulk"),
+    ("app.tasks.maintenance_tasks.reconcile_unread_counts_task", "bulk"),
+])
+def test_tasks_are_routed_by_urgency(task_name, queue):
+    assert queue_of(task_name) == queue
+
+
+def test_results_are_not_kept():
+    assert celery_app.conf.task_ignore_result is True
+    assert celery_app.conf.result_expires == 60 * 60
+
+
+def test_the_io_profile_runs_tasks_on_threads():
+    assert celery_app.conf.worker_pool == "threads"
+    assert celery_app.conf.worker_concurrency > 1
@@ -0,0 +1,157 @@
+# tests/test_email_batching.py
+import json
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.tasks import email_tasks
+from app.tasks.email_tasks import (
+    CLAIM_EMAILS_LUA,
+    EMAIL_BATCH_KEY,
+    EMAIL_CLAIMS_KEY,
+    EMAIL_FLUSH_SCHEDULED_KEY,
+    REQUEUE_EXPIRED_CLAIMS_LUA,
+    flush_email_batch_task,
+    send_application_confirmation_task,
+    send_password_reset_email_task,
+    send_welcome_email_task,
+)
+
+
+@pytest.fixture
+def buffer(fake_redis, monkeypatch):
+    """Batched delivery into fakeredis; flushes are recorded, not queued"""
+    monkeypatch.setattr(settings, "EMAIL_DELIVERY_MODE", "batched")
+    monkeypatch.setattr(email_tasks, "_email_buffer", fake_redis)
+    fake_redis.flushes = []
+    monkeypatch.setattr(flush_email_batch_task, "delay", lambda: fake_redis.flushes.append(0))
+    monkeypatch.setattr(
+        flush_email_batch_task, "apply_async",
+        lambda countdown=None: fake_redis.flushes.append(countdown)
+    )
+    return fake_redis
+
+
+def buffered(buffer) -> list:
+    return [json.loads(item) for item in buffer.lrange(EMAIL_BATCH_KEY, 0, -1)]
+
+
+def confirm(email: str, name: str, job_title: str = "Python Developer", application_id: int = 1):
+    send_application_confirmation_task(email, name, job_title, "Acme", application_id)
+
+
+def test_messages_wait_in_the_buffer_for_one_scheduled_flush(buffer):
+    for i in range(3):
+        confirm(f"user{i}@example.com", f"User {i}", application_id=i)
+
+    assert [m["to"] for m in buffered(buffer)] == [f"user{i}@example.com" for i in range(3)]
+    assert buffered(buffer)[1]["personal"] == {"applicant_name": "User 1", "application_id": "1"}
+    assert buffer.flushes == [settings.EMAIL_BATCH_WINDOW]
+    assert buffer.ttl(EMAIL_FLUSH_SCHEDULED_KEY) > settings.EMAIL_BATCH_WINDOW
+
+
+def test_password_resets_are_never_buffered(buffer, sendgrid):
+    send_password_reset_email_task("user@example.com", "User", "token")
+
+    assert buffered(buffer) == []
+    assert sendgrid.recipients == ["user@example.com"]
+
+
+def test_a_flush_sends_each_group_as_one_request(buffer, sendgrid):
+    for i in range(3):
+        confirm(f"dev{i}@example.com", f"Dev {i}", application_id=i)
+    confirm("ops@example.com", "Ops", job_title="SRE", application_id=9)
+    send_welcome_email_task("new@example.com", "New")
+
+    result = flush_email_batch_task()
+
+    assert result == {"status": "success", "sent": 5, "retrying": 0}
+    assert [[e["to"][0]["email"] for e in r["personalizations"]] for r in sendgrid.requests] == [
+        ["dev0@example.com", "dev1@example.com", "dev2@example.com"],
+        ["ops@example.com"],
+        ["new@example.com"],
+    ]
+    # One body per group, the per-recipient values as substitutions
+    dev = sendgrid.requests[0]
+    assert "-applicant_name-" in dev["content"][0]["value"]
+    assert dev["personalizations"][1]["substitutions"] == {"-applicant_name-": "Dev 1", "-application_id-": "1"}
+    assert buffer.llen(EMAIL_BATCH_KEY) == 0
+    assert buffer.zcard(EMAIL_CLAIMS_KEY) == 0
+    assert buffer.keys("jobden:email_batch:processing:*") == []
+    # The marker is cleared: the next message schedules a new flush
+    assert not buffer.exists(EMAIL_FLUSH_SCHEDULED_KEY)
+
+
+def test_a_rejected_request_is_retried_one_recipient_at_a_time(buffer, sendgrid):
+    sendgrid.reject = {"bad@example.com"}
+    for i, email in enumerate(["a@example.com", "bad@example.com", "b@example.com"]):
+        confirm(email, "Someone", application_id=i)
+
+    result = flush_email_batch_task()
+
+    assert result["sent"] == 2 and result["retrying"] == 0
+    assert sendgrid.recipients == ["a@example.com", "b@example.com"]
+    assert buffered(buffer) == []
+
+
+def test_server_errors_are_requeued_with_backoff(buffer, sendgrid):
+    sendgrid.responses = [503]
+    confirm("a@example.com", "A")
+    confirm("b@example.com", "B", application_id=2)
+    buffer.flushes.clear()
+
+    assert flush_email_batch_task()["retrying"] == 2
+    assert [m["attempts"] for m in buffered(buffer)] == [1, 1]
+    assert buffer.flushes == [60]
+
+    assert flush_email_batch_task()["sent"] == 2
+    assert sendgrid.recipients == ["a@example.com", "b@example.com"]
+
+
+def test_a_message_is_dropped_after_max_attempts(buffer, sendgrid, monkeypatch):
+    monkeypatch.setattr(settings, "EMAIL_BATCH_MAX_ATTEMPTS", 2)
+    sendgrid.responses = [500, 500]
+    confirm("a@example.com", "A")
+
+    assert flush_email_batch_task()["retrying"] == 1
+    assert flush_email_batch_task()["retrying"] == 0
+    assert buffered(buffer) == []
+
+
+def test_claim_moves_messages_to_a_processing_list(buffer):
+    buffer.rpush(EMAIL_BATCH_KEY, "m1", "m2", "m3")
+    claim = buffer.register_script(CLAIM_EMAILS_LUA)
+
+    assert claim(keys=[EMAIL_BATCH_KEY, "processing:1", EMAIL_CLAIMS_KEY], args=[2, 1000]) == [b"m1", b"m2"]
+    assert buffer.lrange(EMAIL_BATCH_KEY, 0, -1) == [b"m3"]
+    assert buffer.lrange("processing:1", 0, -1) == [b"m1", b"m2"]
+    assert buffer.zscore(EMAIL_CLAIMS_KEY, "processing:1") == 1000
+
+    assert claim(keys=[EMAIL_BATCH_KEY, "processing:2", EMAIL_CLAIMS_KEY], args=[2, 1000]) == [b"m3"]
+    assert claim(keys=[EMAIL_BATCH_KEY, "processing:3", EMAIL_CLAIMS_KEY], args=[2, 1000]) == []
+    assert not buffer.exists("processing:3")
+
+
+def test_only_expired_claims_are_requeued(buffer):
+    claim = buffer.register_script(CLAIM_EMAILS_LUA)
+    requeue = buffer.register_script(REQUEUE_EXPIRED_CLAIMS_LUA)
+    buffer.rpush(EMAIL_BATCH_KEY, "m1", "m2", "m3")
+    claim(keys=[EMAIL_BATCH_KEY, "expired", EMAIL_CLAIMS_KEY], args=[2, 100])
+    claim(keys=[EMAIL_BATCH_KEY, "running", EMAIL_CLAIMS_KEY], args=[1, 300])
+
+    assert requeue(keys=[EMAIL_BATCH_KEY, EMAIL_CLAIMS_KEY], args=[200]) == 2
+    assert buffer.lrange(EMAIL_BATCH_KEY, 0, -1) == [b"m1", b"m2"]
+    assert not buffer.exists("expired")
+    assert buffer.zrange(EMAIL_CLAIMS_KEY, 0, -1) == [b"running"]
+
+
+def test_a_flush_picks_up_an_interrupted_flush(buffer, sendgrid):
+    confirm("a@example.com", "A")
+    claim = buffer.register_script(CLAIM_EMAILS_LUA)
+    # A flush that claimed the message and died; its claim ran out
+    claim(keys=[EMAIL_BATCH_KEY, "jobden:email_batch:processing:dead", EMAIL_CLAIMS_KEY], args=[10, time.time() - 1])
+
+    assert flush_email_batch_task()["sent"] == 1
+    assert sendgrid.recipients == ["a@example.com"]
+    assert buffer.zcard(EMAIL_CLAIMS_KEY) == 0
@@ -0,0 +1,86 @@
+# tests/test_email_delivery.py
+import pytest
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+from app.core.config import settings
+from app.tasks import email_tasks
+from app.tasks.email_tasks import (
+    precompile_email_templates,
+    send_application_confirmation_task,
+    send_email_task,
+    template_dir,
+)
+
+ARGS = ("a@example.com", "A", "Python Developer", "Acme", 1)
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    """Names of the templates rendered"""
+    rendered = []
+    render = email_tasks.render_email_template
+
+    def record(template_name, context):
+        rendered.append(template_name)
+        return render(template_name, context)
+    monkeypatch.setattr(email_tasks, "render_email_template", record)
+    return rendered
+
+
+def test_single_hop_renders_and_sends_in_the_task(sendgrid, renders, monkeypatch):
+    monkeypatch.setattr(settings, "EMAIL_DELIVERY_MODE", "single_hop")
+    monkeypatch.setattr(send_email_task, "delay", lambda **kwargs: pytest.fail("second hop"))
+
+    result = send_application_confirmation_task.apply(args=ARGS).get()
+
+    assert result["status"] == "success"
+    assert renders == ["application_confirmation"]
+    assert sendgrid.recipients == ["a@example.com"]
+
+
+def test_a_single_hop_retry_resends_the_first_render(sendgrid, renders, monkeypatch):
+    monkeypatch.setattr(settings, "EMAIL_DELIVERY_MODE", "single_hop")
+    sendgrid.responses = [503]
+
+    send_application_confirmation_task.apply(args=ARGS)
+
+    assert renders == ["application_confirmation"]
+    assert sendgrid.recipients == ["a@example.com"]
+    assert "Hello A!" in sendgrid.requests[0]["content"][0]["value"]
+
+
+def test_a_rejected_single_hop_email_is_not_retried(sendgrid, monkeypatch):
+    monkeypatch.setattr(settings, "EMAIL_DELIVERY_MODE", "single_hop")
+    sendgrid.reject = {"a@example.com"}
+
+    result = send_application_confirmation_task.apply(args=ARGS).get()
+
+    assert result == {"status": "failed", "status_code": 400, "to": "a@example.com"}
+
+
+def test_per_message_hands_the_render_to_send_email_task(sendgrid, renders, monkeypatch):
+    monkeypatch.setattr(settings, "EMAIL_DELIVERY_MODE", "per_message")
+    queued = []
+    monkeypatch.setattr(send_email_task, "delay", lambda **kwargs: queued.append(kwargs))
+
+    send_application_confirmation_task.apply(args=ARGS)
+
+    [kwargs] = queued
+    assert kwargs["to_email"] == "a@example.com"
+    assert "Hello A!" in kwargs["html_content"]
+    assert sendgrid.requests == []
+
+
+def test_worker_start_compiles_every_template(tmp_path, monkeypatch):
+    env = Environment(
+        loader=FileSystemLoader(str(template_dir)),
+        bytecode_cache=FileSystemBytecodeCache(str(tmp_path)),
+        auto_reload=False
+    )
+    monkeypatch.setattr(email_tasks, "jinja_env", env)
+
+    precompile_email_templates()
+
+    templates = env.list_templates(extensions=["html"])
+    assert len(env.cache) == len(templates)
+    assert len(list(tmp_path.iterdir())) == len(templates)
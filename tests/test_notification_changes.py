@@ -0,0 +1,73 @@
+# tests/test_notification_changes.py
+URL = "/api/v1/notifications/changes"
+
+
+async def changes(client, headers, since: int, **params) -> dict:
+    response = await client.get(URL, params={"since": since, **params}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+async def test_first_sync_and_unknown_versions_require_a_resync(client, seed, auth_headers):
+    user_id = seed.user(notification_version=4)
+    headers = auth_headers(user_id)
+
+    for since in (0, 5):
+        assert await changes(client, headers, since) == {
+            "version": 4, "notifications": [], "deleted_ids": [], "has_more": False, "resync_required": True
+        }
+
+
+async def test_an_up_to_date_client_gets_nothing(client, seed, auth_headers):
+    user_id = seed.user(notification_version=4)
+    seed.notification(user_id, version=4)
+
+    body = await changes(client, auth_headers(user_id), 4)
+    assert body["notifications"] == [] and body["deleted_ids"] == []
+    assert body["version"] == 4 and not body["resync_required"]
+
+
+async def test_reads_and_deletes_show_up_as_changes(client, seed, auth_headers):
+    user_id = seed.user(notification_version=3, unread_notifications=3)
+    headers = auth_headers(user_id)
+    first, second, third = (seed.notification(user_id, version=v) for v in (1, 2, 3))
+
+    assert [n["id"] for n in (await changes(client, headers, 1))["notifications"]] == [second, third]
+
+    assert (await client.put(f"/api/v1/notifications/{first}/read", headers=headers)).status_code == 200
+    assert (await client.delete(f"/api/v1/notifications/{second}", headers=headers)).status_code == 204
+
+    body = await changes(client, headers, 3)
+    assert body["version"] == 5
+    assert [(n["id"], n["is_read"], n["version"]) for n in body["notifications"]] == [(first, True, 4)]
+    assert body["deleted_ids"] == [second]
+    # Each change is reported once
+    assert (await changes(client, headers, 5))["deleted_ids"] == []
+
+
+async def test_pages_end_on_a_whole_version(client, seed, auth_headers):
+    user_id = seed.user(notification_version=4)
+    headers = auth_headers(user_id)
+    # A bulk change: three rows written at version 2
+    bulk = [seed.notification(user_id, version=2) for _ in range(3)]
+    later = [seed.notification(user_id, version=v) for v in (3, 4)]
+
+    page = await changes(client, headers, 1, limit=4)
+    assert [n["id"] for n in page["notifications"]] == bulk + later[:1]
+    assert page["has_more"] and page["version"] == 3
+
+    page = await changes(client, headers, page["version"], limit=4)
+    assert [n["id"] for n in page["notifications"]] == later[1:]
+    assert not page["has_more"] and page["version"] == 4
+
+    # A single version bigger than the page can't be split
+    assert (await changes(client, headers, 1, limit=2))["resync_required"]
+
+
+async def test_clients_below_the_sync_floor_must_resync(client, seed, auth_headers):
+    user_id = seed.user(notification_version=9, notification_sync_floor=6)
+    seed.notification(user_id, version=9)
+    headers = auth_headers(user_id)
+
+    assert (await changes(client, headers, 5))["resync_required"]
+    assert [n["version"] for n in (await changes(client, headers, 6))["notifications"]] == [9]
@@ -0,0 +1,95 @@
+# tests/test_notification_coalescing.py
+import pytest
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.models.notification import Notification
+from app.models.outbox import OutboxEvent
+from app.models.user import User
+from app.services.outbox_service import NOTIFICATION_TOPIC, TASK_TOPIC
+from app.tasks.email_tasks import send_new_application_notification_task
+
+
+@pytest.fixture
+def hiring(seed):
+    """An employer with one job: {"user_id", "employer_id", "job_id"}"""
+    employer = seed.employer()
+    return {**employer, "job_id": seed.job(employer["employer_id"])}
+
+
+async def apply(client, auth_headers, seeker_id: int, job_id: int) -> int:
+    response = await client.post(
+        "/api/v1/applications/", json={"job_id": job_id}, headers=auth_headers(seeker_id)
+    )
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+async def employer_state(db, user_id: int):
+    notifications = (await db.execute(
+        select(Notification).where(Notification.user_id == user_id).order_by(Notification.id)
+        .execution_options(populate_existing=True)
+    )).scalars().all()
+    user = (await db.execute(
+        select(User).where(User.id == user_id).execution_options(populate_existing=True)
+    )).scalar_one()
+    events = (await db.execute(select(OutboxEvent).order_by(OutboxEvent.id))).scalars().all()
+    await db.commit()
+    pushes = [
+        e.payload["notification"] for e in events
+        if e.topic == NOTIFICATION_TOPIC and e.payload["user_id"] == user_id
+    ]
+    emails = [
+        e.payload["args"] for e in events
+        if e.topic == TASK_TOPIC and e.payload["task"] == send_new_application_notification_task.name
+    ]
+    return notifications, user, pushes, emails
+
+
+async def test_applications_in_the_window_coalesce(client, db, seed, auth_headers, hiring):
+    seekers = [seed.job_seeker(full_name=f"Applicant {i}") for i in range(3)]
+    application_ids = [await apply(client, auth_headers, seeker, hiring["job_id"]) for seeker in seekers]
+
+    notifications, user, pushes, emails = await employer_state(db, hiring["user_id"])
+    [notification] = notifications
+    assert notification.event_count == 3
+    assert notification.message == "3 new applicants for 'Python Developer'"
+    assert notification.related_id == application_ids[-1]
+    assert notification.version == user.notification_version
+    assert user.unread_notifications == 1
+
+    # Every update is pushed, as a new version of the same notification
+    assert [p["id"] for p in pushes] == [notification.id] * 3
+    assert [p["version"] for p in pushes] == sorted({p["version"] for p in pushes})
+    # Only the application that opened the group emails the employer
+    assert len(emails) == 1
+    assert emails[0][2] == "Applicant 0"
+
+
+async def test_a_read_group_comes_back_unread(client, db, seed, auth_headers, hiring):
+    await apply(client, auth_headers, seed.job_seeker(), hiring["job_id"])
+    [notification], _, _, _ = await employer_state(db, hiring["user_id"])
+    response = await client.put(
+        f"/api/v1/notifications/{notification.id}/read", headers=auth_headers(hiring["user_id"])
+    )
+    assert response.status_code == 200
+
+    await apply(client, auth_headers, seed.job_seeker(), hiring["job_id"])
+
+    [notification], user, _, emails = await employer_state(db, hiring["user_id"])
+    assert notification.event_count == 2
+    assert notification.is_read is False
+    assert user.unread_notifications == 1
+    assert len(emails) == 1
+
+
+async def test_a_zero_window_turns_coalescing_off(client, db, seed, auth_headers, hiring, monkeypatch):
+    monkeypatch.setattr(settings, "NOTIFICATION_COALESCE_WINDOW_SECONDS", 0)
+    for _ in range(2):
+        await apply(client, auth_headers, seed.job_seeker(), hiring["job_id"])
+
+    notifications, user, pushes, emails = await employer_state(db, hiring["user_id"])
+    assert [n.event_count for n in notifications] == [1, 1]
+    assert user.unread_notifications == 2
+    assert len({p["id"] for p in pushes}) == 2
+    assert len(emails) == 2
@@ -0,0 +1,127 @@
+# tests/test_notification_partitions.py
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.tasks.maintenance_tasks import (
+    DEFAULT_NOTIFICATION_PARTITION,
+    add_months,
+    create_notification_partition,
+    maintain_notification_partitions_task,
+    notification_partition_name,
+)
+
+THIS_MONTH = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+@pytest.fixture
+def partitions(clean_database):
+    """No monthly partitions (attached or detached) before the test; returns the engine"""
+    with clean_database.begin() as conn:
+        names = conn.execute(text(
+            r"SELECT relname FROM pg_class WHERE relname ~ '^notifications_p\d{4}_\d{2}$' AND relkind IN ('r', 'p')"
+        )).scalars().all()
+        for name in names:
+            conn.execute(text(f"DROP TABLE {name}"))
+    return clean_database
+
+
+def attached_partitions(engine):
+    with engine.connect() as conn:
+        return set(conn.execute(text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = 'notifications'::regclass"
+        )).scalars())
+
+
+def partition_of(engine, notification_id: int) -> str:
+    with engine.connect() as conn:
+        return conn.execute(text(
+            "SELECT tableoid::regclass::text FROM notifications WHERE id = :id"
+        ), {"id": notification_id}).scalar_one()
+
+
+def add_old_partition(engine, months_ago: int) -> datetime:
+    month_start = add_months(THIS_MONTH, -months_ago)
+    with engine.begin() as conn:
+        create_notification_partition(
+            conn, notification_partition_name(month_start), month_start, add_months(month_start, 1)
+        )
+    return month_start
+
+
+def test_partitions_are_created_ahead(partitions, monkeypatch):
+    monkeypatch.setattr(settings, "NOTIFICATION_PARTITIONS_AHEAD", 2)
+    expected = [notification_partition_name(add_months(THIS_MONTH, offset)) for offset in range(3)]
+
+    assert maintain_notification_partitions_task()["created"] == expected
+    assert attached_partitions(partitions) == {DEFAULT_NOTIFICATION_PARTITION, *expected}
+    assert maintain_notification_partitions_task()["created"] == []
+
+
+def test_expired_partitions_are_dropped_and_counted_off(partitions, seed, monkeypatch):
+    monkeypatch.setattr(settings, "NOTIFICATION_RETENTION_MONTHS", 12)
+    monkeypatch.setattr(settings, "NOTIFICATION_RETENTION_MODE", "drop")
+    old_month = add_old_partition(partitions, 14)
+    kept_month = add_old_partition(partitions, 6)
+
+    user_id = seed.user(unread_notifications=3, notification_version=9)
+    seed.notification(user_id, created_at=old_month + timedelta(days=3), version=4)
+    seed.notification(user_id, created_at=old_month + timedelta(days=4), version=5)
+    seed.notification(user_id, created_at=old_month + timedelta(days=5), is_read=True, version=6)
+    kept = seed.notification(user_id, created_at=kept_month + timedelta(days=1), version=9)
+
+    result = maintain_notification_partitions_task()
+
+    assert result["removed"] == [notification_partition_name(old_month)]
+    assert notification_partition_name(old_month) not in attached_partitions(partitions)
+    assert partition_of(partitions, kept) == notification_partition_name(kept_month)
+    with partitions.connect() as conn:
+        user = conn.execute(text(
+            "SELECT unread_notifications, notification_sync_floor FROM users WHERE id = :id"
+        ), {"id": user_id}).one()
+        assert not conn.execute(text("SELECT to_regclass(:name)"), {"name": notification_partition_name(old_month)}).scalar()
+    # Two unread rows left with the partition; clients below version 6 must reload
+    assert user.unread_notifications == 1
+    assert user.notification_sync_floor == 6
+
+
+def test_detach_mode_keeps_the_partition_as_a_table(partitions, seed, monkeypatch):
+    monkeypatch.setattr(settings, "NOTIFICATION_RETENTION_MONTHS", 12)
+    monkeypatch.setattr(settings, "NOTIFICATION_RETENTION_MODE", "detach")
+    old_month = add_old_partition(partitions, 13)
+    user_id = seed.user(unread_notifications=1)
+    seed.notification(user_id, created_at=old_month + timedelta(days=1))
+
+    maintain_notification_partitions_task()
+
+    name = notification_partition_name(old_month)
+    assert name not in attached_partitions(partitions)
+    with partitions.connect() as conn:
+        assert conn.execute(text(f"SELECT count(*) FROM {name}")).scalar() == 1
+
+
+def test_rows_in_the_default_partition_move_into_a_new_partition(partitions, seed):
+    user_id = seed.user()
+    notification_id = seed.notification(user_id, created_at=datetime.utcnow())
+    assert partition_of(partitions, notification_id) == DEFAULT_NOTIFICATION_PARTITION
+
+    result = maintain_notification_partitions_task()
+
+    assert result["default_rows"] == 0
+    assert partition_of(partitions, notification_id) == notification_partition_name(THIS_MONTH)
+
+
+async def test_lists_stay_in_the_read_window_but_lookups_by_id_do_not(client, seed, auth_headers):
+    user_id = seed.user()
+    old = seed.notification(user_id, created_at=datetime.utcnow() - timedelta(days=settings.NOTIFICATION_READ_WINDOW_DAYS + 10))
+    recent = seed.notification(user_id, created_at=datetime.utcnow())
+
+    response = await client.get("/api/v1/notifications/", headers=auth_headers(user_id))
+    assert [n["id"] for n in response.json()] == [recent]
+
+    response = await client.put(f"/api/v1/notifications/{old}/read", headers=auth_headers(user_id))
+    assert response.status_code == 200
+    assert response.json()["is_read"] is True
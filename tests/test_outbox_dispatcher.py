@@ -0,0 +1,139 @@
+# tests/test_outbox_dispatcher.py
+import asyncio
+from datetime import datetime
+
+import pytest
+from celery.signals import before_task_publish
+from sqlalchemy import select, update
+
+from app.core import outbox_dispatcher as dispatcher_module
+from app.core import task_queue as task_queue_module
+from app.core.outbox_dispatcher import OutboxDispatcher
+from app.models.outbox import OutboxEvent
+from app.services.outbox_service import enqueue_notification, enqueue_task
+
+TASK = "app.tasks.email_tasks.send_welcome_email_task"
+
+
+def make_dispatcher(batch_size: int = 10, lease_seconds: float = 30.0) -> OutboxDispatcher:
+    return OutboxDispatcher(batch_size=batch_size, poll_interval=0.1, max_attempts=3, lease_seconds=lease_seconds)
+
+
+async def outbox_rows(db):
+    result = await db.execute(
+        select(OutboxEvent.id, OutboxEvent.attempts, OutboxEvent.last_error, OutboxEvent.available_at)
+        .order_by(OutboxEvent.id)
+    )
+    await db.commit()
+    return result.all()
+
+
+@pytest.fixture
+def published():
+    """(task name, args) of every task published to the (in-memory) broker"""
+    tasks = []
+
+    def record(sender=None, body=None, **kwargs):
+        tasks.append((sender, list(body[0])))
+
+    before_task_publish.connect(record, weak=False)
+    yield tasks
+    before_task_publish.disconnect(record)
+
+
+@pytest.fixture
+def pushed(monkeypatch):
+    """Payloads of every notification push"""
+    pushes = []
+
+    async def push(payload):
+        pushes.append(payload)
+    monkeypatch.setattr(dispatcher_module, "_push", push)
+    return pushes
+
+
+async def test_delivered_events_are_deleted(db, published):
+    enqueue_task(db, TASK, "a@example.com", "A")
+    enqueue_task(db, TASK, "b@example.com", "B")
+    await db.commit()
+
+    assert await make_dispatcher().dispatch_batch() == 2
+    assert published == [(TASK, ["a@example.com", "A"]), (TASK, ["b@example.com", "B"])]
+    assert await outbox_rows(db) == []
+
+
+async def test_failed_events_back_off(db, monkeypatch):
+    monkeypatch.setattr(
+        task_queue_module, "_publish_batch",
+        lambda tasks: [RuntimeError("broker down")] * len(tasks)
+    )
+    enqueue_task(db, TASK, "a@example.com", "A")
+    await db.commit()
+    dispatcher = make_dispatcher()
+
+    before = datetime.utcnow()
+    assert await dispatcher.dispatch_batch() == 1
+    [row] = await outbox_rows(db)
+    assert row.attempts == 1
+    assert row.last_error == "broker down"
+    assert row.available_at > before
+
+    # Not due again until the backoff has passed
+    assert await dispatcher.dispatch_batch() == 0
+
+
+async def test_events_past_max_attempts_are_kept_but_not_claimed(db, published):
+    event = enqueue_task(db, TASK, "a@example.com", "A")
+    await db.commit()
+    await db.execute(update(OutboxEvent).where(OutboxEvent.id == event.id).values(attempts=3))
+    await db.commit()
+
+    assert await make_dispatcher().dispatch_batch() == 0
+    assert published == []
+    assert len(await outbox_rows(db)) == 1
+
+
+async def test_a_lease_hides_the_batch_until_it_expires(db, published, monkeypatch):
+    for i in range(3):
+        enqueue_task(db, TASK, f"user{i}@example.com", "A")
+    await db.commit()
+
+    crashing = make_dispatcher(lease_seconds=0.5)
+
+    async def crash(events):
+        raise RuntimeError("worker died")
+    monkeypatch.setattr(crashing, "_deliver", crash)
+    with pytest.raises(RuntimeError):
+        await crashing.dispatch_batch()
+
+    # Claimed but never settled: nobody else takes it while the lease runs
+    other = make_dispatcher()
+    assert await other.dispatch_batch() == 0
+    assert published == []
+
+    await asyncio.sleep(0.6)
+    assert await other.dispatch_batch() == 3
+    assert len(published) == 3
+    assert await outbox_rows(db) == []
+
+
+async def test_concurrent_dispatchers_split_the_rows(db, published):
+    for i in range(20):
+        enqueue_task(db, TASK, f"user{i}@example.com", "A")
+    await db.commit()
+
+    claimed = await asyncio.gather(*(make_dispatcher(batch_size=5).dispatch_batch() for _ in range(4)))
+    assert sum(claimed) == 20
+    assert sorted(args[0] for _, args in published) == sorted(f"user{i}@example.com" for i in range(20))
+    assert await outbox_rows(db) == []
+
+
+async def test_a_notification_updated_twice_in_a_batch_is_pushed_once(db, pushed):
+    enqueue_notification(db, 7, {"id": 1, "version": 2, "message": "2 new applicants"})
+    enqueue_notification(db, 7, {"id": 1, "version": 3, "message": "3 new applicants"})
+    enqueue_notification(db, 7, {"id": 2, "version": 4, "message": "Application accepted"})
+    await db.commit()
+
+    assert await make_dispatcher().dispatch_batch() == 3
+    assert [p["notification"]["version"] for p in pushed] == [3, 4]
+    assert await outbox_rows(db) == []
@@ -0,0 +1,74 @@
+# tests/test_pagination.py
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.pagination import (
+    NEXT_CURSOR_HEADER,
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+    get_next_cursor,
+)
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2026, 10, 17, 12, 30, 5, 123456)
+    cursor = encode_cursor(created_at, 42, scope="abc")
+    assert decode_cursor(cursor, scope="abc") == (created_at, 42)
+
+
+def test_tampered_cursor_is_rejected():
+    body, signature = encode_cursor(datetime(2026, 10, 17), 42).split(".")
+    forged = encode_cursor(datetime(2026, 10, 17), 43).split(".")[0]
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(f"{forged}.{signature}")
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(body)
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("not a cursor")
+
+
+def test_cursor_only_pages_its_own_list():
+    cursor = encode_cursor(datetime(2026, 10, 17), 42, scope="jobs?location=Remote")
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, scope="jobs?location=Berlin")
+
+
+def test_no_next_cursor_on_the_last_page():
+    rows = [SimpleNamespace(id=i, created_at=datetime(2026, 10, 17)) for i in range(3)]
+    assert get_next_cursor(rows, limit=5) is None
+    assert get_next_cursor([], limit=5) is None
+    assert decode_cursor(get_next_cursor(rows, limit=3))[1] == 2
+
+
+async def test_job_list_pages_through_every_job_once(client, seed):
+    employer = seed.employer()
+    seed.jobs(employer["employer_id"], 25)
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 10, **({"cursor": cursor} if cursor else {})}
+        response = await client.get("/api/v1/jobs/", params=params)
+        assert response.status_code == 200
+        seen.extend(job["id"] for job in response.json())
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            break
+
+    assert sorted(seen) == list(range(1, 26))
+    assert len(seen) == len(set(seen))
+
+
+async def test_job_list_rejects_a_cursor_from_other_filters(client, seed):
+    employer = seed.employer()
+    seed.jobs(employer["employer_id"], 5)
+
+    response = await client.get("/api/v1/jobs/", params={"limit": 2, "location": "Remote"})
+    cursor = response.headers[NEXT_CURSOR_HEADER]
+
+    response = await client.get("/api/v1/jobs/", params={"limit": 2, "location": "Berlin", "cursor": cursor})
+    assert response.status_code == 400
+    response = await client.get("/api/v1/jobs/", params={"limit": 2, "location": "Remote", "cursor": cursor + "x"})
+    assert response.status_code == 400
@@ -0,0 +1,150 @@
+# tests/test_websocket_fanout.py
+"""
+Cross-process fan-out: two worker processes, each with its own
+ConnectionManager on the Redis backend, and a publisher in this process.
+A message must reach the user's sockets on whichever worker holds them,
+and only there.
+"""
+import asyncio
+import json
+import multiprocessing
+import time
+
+import fakeredis
+import redis
+
+from app.core.config import settings
+from app.core.websocket_manager import ConnectionManager
+from app.core.websocket_pubsub import CHANNEL_PREFIX, RedisPubSubBackend, shard_for_user
+
+SHARDS = 4
+MESSAGES_PER_USER = 20
+# Users 1 and 5 share a shard, so worker B also receives user 1's messages
+WORKER_USERS = {"a": [1, 2], "b": [3, 5]}
+OFFLINE_USER = 4
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        self.sent.append(text)
+
+    async def close(self, code: int = 1000):
+        pass
+
+
+def run_worker(redis_url: str, user_ids: list, ready, results):
+    asyncio.run(_worker(redis_url, user_ids, ready, results))
+
+
+async def _worker(redis_url: str, user_ids: list, ready, results):
+    settings.WEBSOCKET_BACKEND = "redis"
+    settings.WEBSOCKET_REDIS_URL = redis_url
+    settings.WEBSOCKET_SHARDS = SHARDS
+    manager = ConnectionManager()
+    sockets = {user_id: FakeWebSocket() for user_id in user_ids}
+    for user_id, websocket in sockets.items():
+        await manager.connect(websocket, user_id)
+    ready.put(user_ids)
+
+    expected = MESSAGES_PER_USER * len(user_ids)
+    deadline = time.monotonic() + 10
+    while sum(len(ws.sent) for ws in sockets.values()) < expected and time.monotonic() < deadline:
+        await asyncio.sleep(0.02)
+    await asyncio.sleep(0.3)  # anything misrouted would arrive by now
+
+    results.put({
+        user_id: [json.loads(text)["data"]["id"] for text in websocket.sent]
+        for user_id, websocket in sockets.items()
+    })
+    await manager.close()
+
+
+def wait_for_subscribers(redis_url: str):
+    """Until every worker's SUBSCRIBE has reached Redis"""
+    expected = {}
+    for user_ids in WORKER_USERS.values():
+        for shard in {shard_for_user(user_id, SHARDS) for user_id in user_ids}:
+            channel = f"{CHANNEL_PREFIX}{shard}"
+            expected[channel] = expected.get(channel, 0) + 1
+    client = redis.Redis.from_url(redis_url, decode_responses=True)
+    deadline = time.monotonic() + 10
+    while dict(client.pubsub_numsub(*expected)) != expected:
+        assert time.monotonic() < deadline, "workers never subscribed"
+        time.sleep(0.02)
+    client.close()
+
+
+async def test_messages_reach_the_worker_holding_the_socket(redis_url):
+    context = multiprocessing.get_context("spawn")
+    ready, results = context.Queue(), context.Queue()
+    workers = [
+        context.Process(target=run_worker, args=(redis_url, user_ids, ready, results))
+        for user_ids in WORKER_USERS.values()
+    ]
+    for worker in workers:
+        worker.start()
+    try:
+        for _ in workers:
+            ready.get(timeout=30)
+        wait_for_subscribers(redis_url)
+
+        async def deliver(message, user_id):
+            pass
+        publisher = RedisPubSubBackend(redis_url, deliver, shards=SHARDS, flush_interval=0.01, max_batch=100)
+        user_ids = [user_id for ids in WORKER_USERS.values() for user_id in ids] + [OFFLINE_USER]
+        await asyncio.gather(*(
+            publisher.publish(
+                {"type": "notification", "data": {"id": user_id * 1000 + i, "version": i + 1}},
+                user_id
+            )
+            for i in range(MESSAGES_PER_USER)
+            for user_id in user_ids
+        ))
+        assert publisher.published == MESSAGES_PER_USER * len(user_ids)
+        await publisher.close()
+
+        received = {}
+        for _ in workers:
+            received.update(results.get(timeout=30))
+    finally:
+        for worker in workers:
+            worker.join(timeout=10)
+            if worker.is_alive():
+                worker.terminate()
+
+    # Every message exactly once, in order, on the worker holding the socket only
+    assert received == {
+        user_id: [user_id * 1000 + i for i in range(MESSAGES_PER_USER)]
+        for ids in WORKER_USERS.values()
+        for user_id in ids
+    }
+
+
+async def test_a_bad_message_does_not_stop_the_listener():
+    delivered = []
+
+    async def deliver(message, user_id):
+        if message.get("fail"):
+            raise RuntimeError("socket gone")
+        delivered.append((user_id, message["n"]))
+
+    backend = RedisPubSubBackend("redis://localhost", deliver, shards=1, flush_interval=0.01, max_batch=100)
+    backend.client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    await backend.watch_user(1)
+
+    await backend.client.publish(backend.channel(0), "not json")
+    await backend.publish({"fail": True}, 1)
+    await backend.publish({"n": 1}, 1)
+    deadline = time.monotonic() + 5
+    while not delivered and time.monotonic() < deadline:
+        await asyncio.sleep(0.01)
+
+    assert delivered == [(1, 1)]
+    assert backend.errors == 2
+    await backend.close()
@@ -0,0 +1,116 @@
+# tests/test_websocket_manager.py
+import asyncio
+import json
+from types import SimpleNamespace
+
+from app.core import websocket_manager as websocket_manager_module
+from app.core.config import settings
+from app.core.websocket_manager import ConnectionManager
+
+
+class FakeWebSocket:
+    """Records what it is sent; a `stuck` socket never finishes a send"""
+
+    def __init__(self, stuck: bool = False):
+        self.stuck = stuck
+        self.sent = []
+        self.closed_with = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        if self.stuck:
+            await asyncio.Event().wait()
+        self.sent.append(json.loads(text))
+
+    async def close(self, code: int = 1000):
+        self.closed_with = code
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def test_a_stuck_socket_does_not_delay_the_others():
+    manager = ConnectionManager()
+    stuck, fast = FakeWebSocket(stuck=True), FakeWebSocket()
+    await manager.connect(stuck, 1)
+    await manager.connect(fast, 2)
+
+    await manager.broadcast_to_all({"type": "announcement", "n": 1})
+    await asyncio.wait_for(settle(), timeout=1)
+    assert fast.sent == [{"type": "announcement", "n": 1}]
+    await manager.close()
+
+
+async def test_a_slow_consumer_is_disconnected(monkeypatch):
+    monkeypatch.setattr(settings, "WEBSOCKET_SEND_QUEUE_SIZE", 2)
+    monkeypatch.setattr(settings, "WEBSOCKET_SLOW_CONSUMER", "disconnect")
+    manager = ConnectionManager()
+    stuck, fast = FakeWebSocket(stuck=True), FakeWebSocket()
+    await manager.connect(stuck, 1)
+    await manager.connect(fast, 1)
+
+    # One send in flight plus two queued, then the queue is full
+    for n in range(5):
+        await manager.send_personal_message({"type": "ping", "n": n}, 1)
+        await settle()
+
+    assert stuck.closed_with == 1013
+    assert manager.stats()["slow_consumers_closed"] == 1
+    assert list(manager.active_connections[1]) == [fast]
+    assert [m["n"] for m in fast.sent] == [0, 1, 2, 3, 4]
+    await manager.close()
+
+
+async def test_drop_mode_keeps_the_socket(monkeypatch):
+    monkeypatch.setattr(settings, "WEBSOCKET_SEND_QUEUE_SIZE", 2)
+    monkeypatch.setattr(settings, "WEBSOCKET_SLOW_CONSUMER", "drop")
+    manager = ConnectionManager()
+    stuck = FakeWebSocket(stuck=True)
+    await manager.connect(stuck, 1)
+
+    for n in range(5):
+        await manager.send_personal_message({"type": "ping", "n": n}, 1)
+        await settle()
+
+    assert stuck.closed_with is None
+    assert manager.is_user_online(1)
+    assert manager.stats()["dropped_messages"] == 2
+    await manager.close()
+
+
+async def test_a_message_is_serialized_once_per_fan_out(monkeypatch):
+    calls = []
+
+    def dumps(value, **kwargs):
+        calls.append(value)
+        return json.dumps(value, **kwargs)
+    monkeypatch.setattr(websocket_manager_module, "json", SimpleNamespace(dumps=dumps))
+
+    manager = ConnectionManager()
+    sockets = [FakeWebSocket() for _ in range(50)]
+    for websocket in sockets:
+        await manager.connect(websocket, 1)
+
+    await manager.send_personal_message({"type": "ping"}, 1)
+    await settle()
+    assert len(calls) == 1
+    assert all(websocket.sent == [{"type": "ping"}] for websocket in sockets)
+    await manager.close()
+
+
+async def test_disconnect_forgets_the_user_with_the_last_socket():
+    manager = ConnectionManager()
+    first, second = FakeWebSocket(), FakeWebSocket()
+    await manager.connect(first, 1)
+    await manager.connect(second, 1)
+
+    await manager.disconnect(first, 1)
+    assert manager.is_user_online(1)
+    await manager.disconnect(second, 1)
+    assert not manager.is_user_online(1)
+    assert manager._user_locks == {}
+    await manager.close()
@@ -0,0 +1,101 @@
+# tests/test_weekly_digest.py
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.config import settings
+from app.tasks.email_tasks import (
+    DIGEST_MAX_SKILLS,
+    send_weekly_digest,
+    send_weekly_digest_batch,
+    skills_tsquery,
+)
+
+
+@pytest.mark.parametrize("skills, query", [
+    ("Python, machine learning", "python | (machine & learning)"),
+    ("C++; Node.js\nSQL", "c | (node & js) | sql"),
+    ("Go (golang)", "(go & golang)"),
+    ("", None),
+    (" ,;, ", None),
+])
+def test_skills_become_a_tsquery(skills, query):
+    assert skills_tsquery(skills) == query
+
+
+def test_only_the_first_skills_are_searched():
+    skills = ", ".join(f"skill{i}" for i in range(DIGEST_MAX_SKILLS + 5))
+    assert skills_tsquery(skills).count("|") == DIGEST_MAX_SKILLS - 1
+
+
+@pytest.fixture
+def queued(monkeypatch):
+    """Entries of each send_weekly_digest_batch queued"""
+    batches = []
+    monkeypatch.setattr(send_weekly_digest_batch, "delay", batches.append)
+    return batches
+
+
+def test_digests_are_queued_per_chunk_with_new_matching_jobs(seed, queued, monkeypatch):
+    monkeypatch.setattr(settings, "DIGEST_CHUNK_SIZE", 1)
+    employer = seed.employer("Acme")
+    python_job = seed.job(employer["employer_id"], "Senior Python Developer", description="Django and Postgres")
+    rust_job = seed.job(employer["employer_id"], "Rust Engineer", description="Systems programming")
+    seed.job(employer["employer_id"], "Python Developer", created_at=datetime.utcnow() - timedelta(days=30))
+    seed.job(employer["employer_id"], "Python Lead", is_active=False)
+
+    seed.job_seeker("Py Dev", skills="Python")
+    seed.job_seeker("Rusty", skills="rust, go", email="rusty@example.com")
+    seed.job_seeker("Cobol Dev", skills="COBOL")
+    seed.job_seeker("No Skills", skills="")
+    seed.job_seeker("Gone", skills="python", is_active=False)
+
+    result = send_weekly_digest()
+
+    assert result == {"status": "success", "users": 3, "recipients": 2, "batches": 2}
+    assert [[(e["name"], [job["id"] for job in e["jobs"]]) for e in entries] for entries in queued] == [
+        [("Py Dev", [python_job])],
+        [("Rusty", [rust_job])],
+    ]
+    [rusty] = queued[1]
+    assert rusty["email"] == "rusty@example.com"
+    assert rusty["jobs"][0]["company_name"] == "Acme"
+
+
+def test_each_digest_is_limited_to_the_best_matches(seed, queued, monkeypatch):
+    monkeypatch.setattr(settings, "DIGEST_JOBS_PER_USER", 3)
+    employer = seed.employer()
+    seed.jobs(employer["employer_id"], 10)
+    seed.job_seeker(skills="python")
+
+    send_weekly_digest()
+
+    [[entry]] = queued
+    assert len(entry["jobs"]) == 3
+
+
+def entry(email: str) -> dict:
+    return {
+        "email": email,
+        "name": email.split("@")[0],
+        "jobs": [{"id": 7, "title": "Rust Engineer", "company_name": "Acme", "location": "Remote", "job_type": None}],
+    }
+
+
+def test_a_batch_renders_and_sends_each_digest(sendgrid):
+    sendgrid.reject = {"bad@example.com"}
+
+    result = send_weekly_digest_batch.apply(args=[[entry("a@example.com"), entry("bad@example.com")]]).get()
+
+    assert result == {"status": "success", "sent": 1, "failed": 1}
+    assert sendgrid.recipients == ["a@example.com"]
+    body = sendgrid.requests[0]["content"][0]["value"]
+    assert "/jobs/7" in body and "Rust Engineer" in body
+
+
+def test_only_failed_digests_are_retried(sendgrid):
+    sendgrid.responses = [503]
+
+    send_weekly_digest_batch.apply(args=[[entry("a@example.com"), entry("b@example.com")]])
+
+    assert sorted(sendgrid.recipients) == ["a@example.com", "b@example.com"]